@@ -0,0 +1,106 @@
+"""
+Benchmark for the pooled async N8nClient.
+
+Starts a local fake n8n API and compares one-connection-per-call
+`requests.request` (the previous client) with the pooled httpx client
+issuing the same calls sequentially and concurrently.
+
+Usage: python benchmarks/n8n_client_bench.py [--calls 500] [--concurrency 20] [--latency-ms 5]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+WORKFLOWS = json.dumps({
+    "data": [{"id": str(i), "name": f"Workflow {i}", "active": i % 2 == 0, "nodes": [], "connections": {}}
+             for i in range(20)],
+    "nextCursor": None
+}).encode()
+
+
+class FakeN8nHandler(BaseHTTPRequestHandler):
+    """Serves a canned workflow list with keep-alive and simulated latency."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(WORKFLOWS)))
+        self.end_headers()
+        self.wfile.write(WORKFLOWS)
+
+    def log_message(self, *args):
+        pass
+
+
+def report(label, calls, elapsed):
+    print(f"{label:<36} {elapsed:8.3f}s {calls / elapsed:10.1f} calls/s {elapsed / calls * 1000:8.2f} ms/call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=5)
+    args = parser.parse_args()
+
+    FakeN8nHandler.latency = args.latency_ms / 1000
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeN8nHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    os.environ["N8N_API_URL"] = base_url
+    os.environ.setdefault("N8N_API_KEY", "bench")
+    os.environ["N8N_HTTP_MAX_CONNECTIONS"] = str(args.concurrency)
+    os.environ["N8N_HTTP_MAX_KEEPALIVE"] = str(args.concurrency)
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.servers.n8n.server import n8n_client
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    print(f"{args.calls} GET /workflows calls, {args.latency_ms} ms server latency")
+
+    started = time.monotonic()
+    for _ in range(args.calls):
+        requests.request("GET", f"{base_url}/api/v1/workflows?limit=20",
+                         headers=n8n_client.headers).json()
+    report("requests, new connection per call", args.calls, time.monotonic() - started)
+
+    async def pooled_sequential():
+        for _ in range(args.calls):
+            await n8n_client.request("GET", "workflows?limit=20")
+
+    async def pooled_concurrent():
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def call():
+            async with semaphore:
+                return await n8n_client.request("GET", "workflows?limit=20")
+        results = await asyncio.gather(*(call() for _ in range(args.calls)))
+        assert all(r["success"] for r in results)
+
+    async def run():
+        started = time.monotonic()
+        await pooled_sequential()
+        report("httpx pool, sequential", args.calls, time.monotonic() - started)
+        started = time.monotonic()
+        await pooled_concurrent()
+        report(f"httpx pool, {args.concurrency} concurrent", args.calls, time.monotonic() - started)
+        await n8n_client.aclose()
+
+    asyncio.run(run())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
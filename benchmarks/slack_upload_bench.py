@@ -0,0 +1,110 @@
+"""
+Benchmark for concurrent streaming Slack uploads.
+
+Runs the external upload flow from src/servers/slack/uploads.py against a
+local stand-in upload endpoint and compares sequential whole-file uploads
+(what files_upload_v2 does) with concurrent streaming uploads.
+
+Usage: python benchmarks/slack_upload_bench.py [--files 4] [--size-mb 100] [--concurrency 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+# Import the module directly: the slack package __init__ starts the server and needs a bot token
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/servers/slack')))
+from uploads import stream_upload
+
+
+class DiscardHandler(BaseHTTPRequestHandler):
+    """Accepts an upload body and throws it away."""
+    def do_POST(self):
+        remaining = int(self.headers.get('Content-Length', 0))
+        while remaining:
+            remaining -= len(self.rfile.read(min(remaining, 1024 * 1024)))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'OK')
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeSlackClient:
+    """Answers the two Web API calls of the external upload flow."""
+    def __init__(self, upload_url):
+        self.upload_url = upload_url
+        self.counter = 0
+        self.lock = threading.Lock()
+
+    def files_getUploadURLExternal(self, filename, length):
+        with self.lock:
+            self.counter += 1
+            return {"upload_url": self.upload_url, "file_id": f"F{self.counter}"}
+
+    def files_completeUploadExternal(self, **kwargs):
+        return {"ok": True}
+
+
+def whole_file_upload(http, url, path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    http.post(url, content=data).raise_for_status()
+
+
+def measure(label, fn, total_bytes):
+    tracemalloc.start()
+    started = time.monotonic()
+    fn()
+    elapsed = time.monotonic() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    mib = total_bytes / (1024 * 1024)
+    print(f"{label:<32} {elapsed:8.2f}s {mib / elapsed:10.1f} MiB/s   peak python memory {peak / (1024 * 1024):8.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=4)
+    parser.add_argument('--size-mb', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=4)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), DiscardHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/upload"
+    client = FakeSlackClient(url)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f"report_{i}.bin")
+            with open(path, 'wb') as f:
+                for _ in range(args.size_mb):
+                    f.write(os.urandom(1024 * 1024))
+            paths.append(path)
+        total = args.files * args.size_mb * 1024 * 1024
+        print(f"{args.files} files x {args.size_mb} MB, concurrency {args.concurrency}")
+
+        with httpx.Client(timeout=None) as http:
+            measure("sequential whole-file", lambda: [whole_file_upload(http, url, p) for p in paths], total)
+
+            def streamed():
+                with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                    list(pool.map(lambda p: stream_upload(client, http, p, "C0"), paths))
+            measure("concurrent streaming", streamed, total)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
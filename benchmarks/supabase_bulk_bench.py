@@ -0,0 +1,73 @@
+"""
+Throughput benchmark for chunked bulk inserts into Supabase/PostgREST.
+
+Compares one INSERT request per row (what supabase_insert does) with
+bulk_write at several chunk sizes and worker counts, in rows/second.
+
+Run it against a local stack (`supabase start`, or Postgres + PostgREST)
+with SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY set, after creating:
+
+    CREATE TABLE bench_rows (id bigint PRIMARY KEY, name text, value double precision, payload jsonb);
+
+Rows inserted by the benchmark are deleted after each run.
+
+Usage: python benchmarks/supabase_bulk_bench.py [--rows 100000] [--single-rows 1000]
+       [--chunk-sizes 100,500,1000] [--concurrency 1,4,8] [--table bench_rows]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+from supabase import create_client
+
+
+def generate(start, count):
+    for i in range(start, start + count):
+        yield {"id": i, "name": f"row {i}", "value": i * 0.5, "payload": {"n": i, "tags": ["bench"]}}
+
+
+def cleanup(client, table, start, count):
+    client.table(table).delete().gte("id", start).lt("id", start + count).execute()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--table', default='bench_rows')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--single-rows', type=int, default=1000)
+    parser.add_argument('--chunk-sizes', default='100,500,1000')
+    parser.add_argument('--concurrency', default='1,4,8')
+    args = parser.parse_args()
+
+    url, key = os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key:
+        sys.exit("Set SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY")
+    # Imported after the check: the supabase package reads the same variables on import
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.servers.supabase.bulk import bulk_write
+    client = create_client(url, key)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    base = 1_000_000_000
+
+    started = time.monotonic()
+    for row in generate(base, args.single_rows):
+        client.table(args.table).insert(row).execute()
+    elapsed = time.monotonic() - started
+    cleanup(client, args.table, base, args.single_rows)
+    print(f"{'one request per row':<32} {args.single_rows:>8} rows {elapsed:8.2f}s {args.single_rows / elapsed:10.0f} rows/s")
+
+    for chunk_size in (int(c) for c in args.chunk_sizes.split(',')):
+        for concurrency in (int(c) for c in args.concurrency.split(',')):
+            result = bulk_write(client, args.table, generate(base, args.rows),
+                                chunk_size=chunk_size, concurrency=concurrency)
+            cleanup(client, args.table, base, args.rows)
+            label = f"chunk {chunk_size}, {concurrency} worker(s)"
+            failed = f"  ({len(result['failed_chunks'])} failed chunks)" if result["failed_chunks"] else ""
+            print(f"{label:<32} {result['rows_written']:>8} rows {result['seconds']:8.2f}s "
+                  f"{result['rows_per_second'] or 0:10.0f} rows/s{failed}")
+
+
+if __name__ == "__main__":
+    main()
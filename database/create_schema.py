@@ -228,6 +228,112 @@ BEGIN
     WHERE tm.user_id = user_uuid;
 END;
 $$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Runs an ordered list of writes in one transaction for the supabase_batch
+-- MCP tool. Each operation is {"op": insert|upsert|update|delete,
+-- "table", "schema"?, "data"?, "filters"?, "on_conflict"?, "returning"?}.
+-- Filters are equality matches. In a multi-row insert, columns missing from
+-- some rows are inserted as NULL. Any failure aborts the whole batch.
+CREATE OR REPLACE FUNCTION mcp_batch(operations JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    op JSONB;
+    idx INTEGER := 0;
+    target TEXT;
+    payload JSONB;
+    cols TEXT;
+    sets TEXT;
+    cond TEXT;
+    conflict TEXT;
+    affected JSONB;
+    results JSONB := '[]'::JSONB;
+BEGIN
+    FOR op IN SELECT value FROM jsonb_array_elements(operations) LOOP
+        BEGIN
+            target := format('%I.%I', COALESCE(op->>'schema', 'public'), op->>'table');
+            IF op->>'op' IN ('insert', 'upsert') THEN
+                payload := CASE jsonb_typeof(op->'data') WHEN 'array' THEN op->'data' ELSE jsonb_build_array(op->'data') END;
+                SELECT string_agg(format('%I', k), ', ') INTO cols
+                FROM (SELECT DISTINCT jsonb_object_keys(value) AS k FROM jsonb_array_elements(payload)) keys;
+                conflict := '';
+                IF op->>'op' = 'upsert' THEN
+                    SELECT string_agg(format('%1$I = EXCLUDED.%1$I', k), ', ') INTO sets
+                    FROM (SELECT DISTINCT jsonb_object_keys(value) AS k FROM jsonb_array_elements(payload)) keys;
+                    SELECT format(' ON CONFLICT (%s) DO UPDATE SET %s', string_agg(format('%I', c), ', '), sets) INTO conflict
+                    FROM jsonb_array_elements_text(op->'on_conflict') c;
+                END IF;
+                EXECUTE format(
+                    'WITH w AS (INSERT INTO %1$s (%2$s) SELECT %2$s FROM jsonb_populate_recordset(NULL::%1$s, $1)%3$s RETURNING *) '
+                    'SELECT COALESCE(jsonb_agg(to_jsonb(w)), ''[]'') FROM w', target, cols, conflict
+                ) INTO affected USING payload;
+            ELSIF op->>'op' IN ('update', 'delete') THEN
+                IF COALESCE(op->'filters', '{}'::JSONB) = '{}'::JSONB THEN
+                    RAISE EXCEPTION '% requires filters', op->>'op';
+                END IF;
+                SELECT string_agg(format('t.%1$I IS NOT DISTINCT FROM f.%1$I', k), ' AND ') INTO cond
+                FROM jsonb_object_keys(op->'filters') k;
+                IF op->>'op' = 'update' THEN
+                    SELECT string_agg(format('%1$I = d.%1$I', k), ', ') INTO sets FROM jsonb_object_keys(op->'data') k;
+                    EXECUTE format(
+                        'WITH w AS (UPDATE %1$s t SET %2$s FROM jsonb_populate_record(NULL::%1$s, $1) d, '
+                        'jsonb_populate_record(NULL::%1$s, $2) f WHERE %3$s RETURNING t.*) '
+                        'SELECT COALESCE(jsonb_agg(to_jsonb(w)), ''[]'') FROM w', target, sets, cond
+                    ) INTO affected USING op->'data', op->'filters';
+                ELSE
+                    EXECUTE format(
+                        'WITH w AS (DELETE FROM %1$s t USING jsonb_populate_record(NULL::%1$s, $1) f WHERE %2$s RETURNING t.*) '
+                        'SELECT COALESCE(jsonb_agg(to_jsonb(w)), ''[]'') FROM w', target, cond
+                    ) INTO affected USING op->'filters';
+                END IF;
+            ELSE
+                RAISE EXCEPTION 'unknown op %', op->>'op';
+            END IF;
+        EXCEPTION WHEN OTHERS THEN
+            RAISE EXCEPTION 'operation % (% %) failed: %', idx, op->>'op', op->>'table', SQLERRM
+                USING ERRCODE = SQLSTATE;
+        END;
+        results := results || jsonb_build_array(jsonb_build_object(
+            'index', idx,
+            'op', op->>'op',
+            'table', op->>'table',
+            'count', jsonb_array_length(affected),
+            'rows', CASE WHEN COALESCE((op->>'returning')::BOOLEAN, TRUE) THEN affected END
+        ));
+        idx := idx + 1;
+    END LOOP;
+    RETURN results;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION mcp_batch(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION mcp_batch(JSONB) TO service_role;
+
+-- ============================================================================
+-- QUERY PROFILING
+-- ============================================================================
+
+-- Returns the JSON plan of a single statement. With run_analyze the statement is
+-- executed, then its subtransaction is aborted so any writes are rolled back
+-- (the plan survives in a local variable).
+CREATE OR REPLACE FUNCTION mcp_explain(query TEXT, run_analyze BOOLEAN DEFAULT TRUE)
+RETURNS JSONB AS $$
+DECLARE
+    plan JSON;
+BEGIN
+    BEGIN
+        EXECUTE format('EXPLAIN (%s FORMAT JSON) %s',
+                       CASE WHEN run_analyze THEN 'ANALYZE, BUFFERS,' ELSE '' END, query)
+            INTO plan;
+        RAISE EXCEPTION USING ERRCODE = 'P0099', MESSAGE = 'mcp_explain rollback';
+    EXCEPTION WHEN SQLSTATE 'P0099' THEN
+        NULL;
+    END;
+    RETURN plan::jsonb;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION mcp_explain(TEXT, BOOLEAN) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION mcp_explain(TEXT, BOOLEAN) TO service_role;
 """
 
 print("=" * 80)
@@ -243,6 +349,8 @@ print("  ✓ Marketplace (marketplace_listings)")
 print("  ✓ Feature Flags (system_flags)")
 print("  ✓ Row Level Security (RLS policies)")
 print("  ✓ Performance Indexes")
+print("  ✓ Transactional batch writes (mcp_batch)")
+print("  ✓ Query profiling (mcp_explain)")
 print()
 print("Ready to execute on your Supabase instance!")
 print()
@@ -0,0 +1,238 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS workflow_stats (
+    workflow_id TEXT PRIMARY KEY,
+    counts TEXT NOT NULL,
+    durations TEXT NOT NULL,
+    last_started TEXT,
+    last_error_at TEXT
+);
+
+-- Single-row sync state: every execution with id <= watermark has been
+-- counted, plus the ids in pending (counted while an older one was running)
+CREATE TABLE IF NOT EXISTS sync_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    watermark INTEGER NOT NULL,
+    pending TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+FAILED_STATUSES = {"error", "crashed"}
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch with bounded relative error (DDSketch-style).
+
+    Any quantile is returned within `alpha` relative error of the true value
+    while storing one counter per occupied bucket. Once max_bins is exceeded
+    the lowest buckets are merged, so the error bound still holds for the
+    high quantiles that matter for latency.
+    """
+    def __init__(self, alpha: float = 0.01, max_bins: int = 512):
+        self.alpha = alpha
+        self.max_bins = max_bins
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zero += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + 1
+        if len(self.bins) > self.max_bins:
+            low, second = sorted(self.bins)[:2]
+            self.bins[second] += self.bins.pop(low)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return min(2 * self.gamma ** index / (self.gamma + 1), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"alpha": self.alpha, "zero": self.zero, "count": self.count, "max": self.max,
+                "bins": {str(k): v for k, v in self.bins.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(data["alpha"])
+        sketch.zero, sketch.count, sketch.max = data["zero"], data["count"], data["max"]
+        sketch.bins = {int(k): v for k, v in data["bins"].items()}
+        return sketch
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+class WorkflowStats:
+    def __init__(self, counts: Optional[Dict[str, int]] = None, durations: Optional[QuantileSketch] = None,
+                 last_started: Optional[str] = None, last_error_at: Optional[str] = None):
+        self.counts = counts or {}
+        self.durations = durations or QuantileSketch()
+        self.last_started = last_started
+        self.last_error_at = last_error_at
+
+    def add(self, execution: Dict[str, Any]) -> None:
+        status = execution.get("status") or "unknown"
+        self.counts[status] = self.counts.get(status, 0) + 1
+        started, stopped = _parse_time(execution.get("startedAt")), _parse_time(execution.get("stoppedAt"))
+        if started and stopped:
+            self.durations.add((stopped - started).total_seconds() * 1000)
+        started_at = execution.get("startedAt")
+        if started_at:
+            if self.last_started is None or started_at > self.last_started:
+                self.last_started = started_at
+            if status in FAILED_STATUSES and (self.last_error_at is None or started_at > self.last_error_at):
+                self.last_error_at = started_at
+
+    def summary(self, workflow_id: str) -> Dict[str, Any]:
+        total = sum(self.counts.values())
+        failures = sum(self.counts.get(s, 0) for s in FAILED_STATUSES)
+
+        def quantile(q):
+            return round(self.durations.quantile(q), 1) if self.durations.count else None
+
+        return {
+            "workflow_id": workflow_id,
+            "total": total,
+            "by_status": self.counts,
+            "failures": failures,
+            "failure_rate": round(failures / total, 4) if total else None,
+            "duration_ms": {
+                "p50": quantile(0.5), "p90": quantile(0.9), "p95": quantile(0.95), "p99": quantile(0.99),
+                "max": round(self.durations.max, 1) if self.durations.count else None
+            },
+            "last_started": self.last_started,
+            "last_error_at": self.last_error_at
+        }
+
+
+class ExecutionAnalytics:
+    """Per-workflow execution counts and duration sketches, persisted in SQLite.
+
+    Stats are held in memory for instant answers and written back for the
+    workflows touched by each sync.
+    """
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA_SQL)
+            self.stats: Dict[str, WorkflowStats] = {
+                r['workflow_id']: WorkflowStats(json.loads(r['counts']),
+                                                QuantileSketch.from_dict(json.loads(r['durations'])),
+                                                r['last_started'], r['last_error_at'])
+                for r in self.conn.execute("SELECT * FROM workflow_stats")
+            }
+
+    def state(self) -> Tuple[Optional[int], Set[int], Optional[float]]:
+        """Returns (watermark, pending ids, synced_at); watermark is None before the first sync."""
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM sync_state WHERE id = 1").fetchone()
+        if row is None:
+            return None, set(), None
+        return row['watermark'], set(json.loads(row['pending'])), row['synced_at']
+
+    def ingest(self, executions: List[Dict[str, Any]], watermark: int, pending: Set[int]) -> None:
+        """Adds finished executions and moves the watermark in one transaction."""
+        with self.lock:
+            touched = set()
+            for execution in executions:
+                workflow_id = str(execution.get("workflowId"))
+                self.stats.setdefault(workflow_id, WorkflowStats()).add(execution)
+                touched.add(workflow_id)
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO workflow_stats (workflow_id, counts, durations, last_started, last_error_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(w, json.dumps(self.stats[w].counts), json.dumps(self.stats[w].durations.to_dict()),
+                      self.stats[w].last_started, self.stats[w].last_error_at) for w in touched]
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (id, watermark, pending, synced_at) VALUES (1, ?, ?, ?)",
+                    (watermark, json.dumps(sorted(pending)), time.time())
+                )
+
+    def summaries(self, workflow_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self.lock:
+            if workflow_id is not None:
+                stats = self.stats.get(str(workflow_id))
+                return [stats.summary(str(workflow_id))] if stats else []
+            return [stats.summary(w) for w, stats in self.stats.items()]
+
+
+async def sync_executions(analytics: ExecutionAnalytics,
+                          pages: AsyncIterator[Tuple[List[Dict[str, Any]], Optional[str]]],
+                          active_statuses: Set[str], max_backfill: int,
+                          max_pin_seconds: float = 3600, max_pending: int = 10000) -> int:
+    """Counts executions newer than the watermark from a newest-first listing.
+
+    Executions in active_statuses (new/running) are not counted yet: the
+    watermark stays below the oldest of them, and executions above it that
+    were counted are kept in pending so they aren't counted twice. Only
+    executions started within max_pin_seconds hold the watermark back, and
+    never for more than max_pending counted executions; older ones are
+    treated as stuck and skipped. Anything else, including long-lived
+    "waiting" executions, is counted under its current status. The first
+    sync reads at most max_backfill executions. Returns the number of
+    executions added.
+    """
+    watermark, pending, _ = analytics.state()
+    batch = []
+    newest = watermark or 0
+    oldest_running = None
+    scanned = 0
+    now = time.time()
+    async for page, _ in pages:
+        reached = False
+        for execution in page:
+            execution_id = int(execution["id"])
+            if watermark is not None and execution_id <= watermark:
+                reached = True
+                break
+            scanned += 1
+            newest = max(newest, execution_id)
+            if execution.get("status") in active_statuses and not execution.get("finished"):
+                started = _parse_time(execution.get("startedAt"))
+                if started is None or now - started.timestamp() <= max_pin_seconds:
+                    oldest_running = execution_id if oldest_running is None else min(oldest_running, execution_id)
+            elif execution_id not in pending:
+                batch.append(execution)
+        if reached or (watermark is None and scanned >= max_backfill):
+            break
+
+    new_watermark, new_pending = newest, set()
+    if oldest_running is not None:
+        held = {i for i in pending | {int(e["id"]) for e in batch} if i >= oldest_running}
+        if len(held) <= max_pending:
+            new_watermark, new_pending = oldest_running - 1, held
+    analytics.ingest(batch, new_watermark, new_pending)
+    return len(batch)
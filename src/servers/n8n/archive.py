@@ -0,0 +1,118 @@
+import json
+import os
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Workflow archives for bulk export/import.
+#
+# A directory archive holds tags.json plus workflows/<id>.json. An NDJSON
+# archive holds one {"type": "tag" | "workflow", "data": {...}} record per
+# line. Both are written and read one workflow at a time.
+
+# Fields n8n accepts when creating a workflow
+CREATE_FIELDS = ("name", "nodes", "connections", "settings")
+
+
+def archive_format(path: str, fmt: Optional[str] = None) -> str:
+    """Resolves the archive format, inferring it from the path when not given."""
+    if fmt:
+        return fmt
+    if os.path.isdir(path):
+        return "directory"
+    return "ndjson" if path.endswith((".ndjson", ".jsonl")) else "directory"
+
+
+def create_payload(workflow: Dict[str, Any]) -> Dict[str, Any]:
+    """Strips an exported workflow down to what the create endpoint accepts."""
+    payload = {k: workflow[k] for k in CREATE_FIELDS if k in workflow}
+    payload.setdefault("settings", {})
+    return payload
+
+
+class ArchiveWriter:
+    def __init__(self, path: str, fmt: str, append: bool = False):
+        self.path = path
+        self.fmt = fmt
+        self.file = None
+        if fmt == "directory":
+            os.makedirs(os.path.join(path, "workflows"), exist_ok=True)
+        else:
+            parent = os.path.dirname(os.path.abspath(path))
+            os.makedirs(parent, exist_ok=True)
+            self.file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write_tags(self, tags: list) -> None:
+        if self.file is None:
+            with open(os.path.join(self.path, "tags.json"), "w", encoding="utf-8") as f:
+                json.dump(tags, f, indent=2)
+            return
+        for tag in tags:
+            self.file.write(json.dumps({"type": "tag", "data": tag}) + "\n")
+
+    def write_workflow(self, workflow: Dict[str, Any]) -> None:
+        if self.file is None:
+            name = os.path.join(self.path, "workflows", f"{workflow['id']}.json")
+            with open(name, "w", encoding="utf-8") as f:
+                json.dump(workflow, f, indent=2)
+            return
+        self.file.write(json.dumps({"type": "workflow", "data": workflow}) + "\n")
+
+    def flush(self) -> None:
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+
+
+def read_archive(path: str, fmt: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yields ("tag", tag) and ("workflow", workflow) records lazily."""
+    if fmt == "directory":
+        tags_path = os.path.join(path, "tags.json")
+        if os.path.exists(tags_path):
+            with open(tags_path, encoding="utf-8") as f:
+                for tag in json.load(f):
+                    yield "tag", tag
+        workflows_dir = os.path.join(path, "workflows")
+        for name in sorted(os.listdir(workflows_dir)):
+            if name.endswith(".json"):
+                with open(os.path.join(workflows_dir, name), encoding="utf-8") as f:
+                    yield "workflow", json.load(f)
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["type"], record["data"]
+
+
+class Checkpoint:
+    """Append-only progress log, so an interrupted transfer can resume.
+
+    Each line is one JSON object; a torn last line from a crash is ignored.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = []
+        torn = False
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    torn = not line.endswith("\n")
+                    try:
+                        self.entries.append(json.loads(line))
+                    except ValueError:
+                        break
+        self.file = open(path, "a", encoding="utf-8")
+        if torn:
+            self.file.write("\n")
+
+    def record(self, **entry) -> None:
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        self.entries.append(entry)
+
+    def close(self, completed: bool = False) -> None:
+        self.file.close()
+        if completed:
+            os.remove(self.path)
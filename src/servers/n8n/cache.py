@@ -0,0 +1,71 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+
+class WorkflowCache:
+    """LRU cache of workflow definitions validated against n8n's updatedAt.
+
+    An entry is served without a request while it was validated within ttl
+    seconds. Any listing that includes a workflow revalidates it: a matching
+    updatedAt just renews the entry, a newer one replaces it.
+    """
+    def __init__(self, ttl: float = 60, max_entries: int = 500):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached workflow if it is still fresh."""
+        entry = self.entries.get(workflow_id)
+        if entry is None or time.monotonic() - entry["validated_at"] > self.ttl:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(workflow_id)
+        self.hits += 1
+        return entry["workflow"]
+
+    def peek(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached workflow regardless of freshness."""
+        entry = self.entries.get(workflow_id)
+        return entry["workflow"] if entry else None
+
+    def put(self, workflow: Dict[str, Any]) -> None:
+        workflow_id = str(workflow["id"])
+        self.entries[workflow_id] = {"workflow": workflow, "validated_at": time.monotonic()}
+        self.entries.move_to_end(workflow_id)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def revalidate(self, workflows: Iterable[Dict[str, Any]]) -> int:
+        """Refreshes entries from listed workflows. Returns how many were replaced."""
+        replaced = 0
+        now = time.monotonic()
+        for workflow in workflows:
+            if "id" not in workflow:
+                continue
+            entry = self.entries.get(str(workflow["id"]))
+            if entry is None:
+                continue
+            if entry["workflow"].get("updatedAt") == workflow.get("updatedAt"):
+                entry["validated_at"] = now
+            elif "nodes" in workflow and "connections" in workflow:
+                entry["workflow"], entry["validated_at"] = workflow, now
+                replaced += 1
+            else:
+                del self.entries[str(workflow["id"])]
+        return replaced
+
+    def invalidate(self, workflow_id: str) -> None:
+        self.entries.pop(str(workflow_id), None)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else None
+        }
@@ -0,0 +1,213 @@
+import copy
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Structural patching and diffing of n8n workflow JSON.
+#
+# Connections in n8n are keyed by source node name:
+#   {"Source": {"main": [[{"node": "Target", "type": "main", "index": 0}], ...]}}
+# where the outer list is indexed by the source's output index.
+
+Edge = Tuple[str, str, int, str, int]  # (source, output type, output index, target, input index)
+
+
+class WorkflowPatchError(ValueError):
+    """Raised when a patch cannot be applied or leaves the workflow invalid."""
+
+
+def _deep_merge(target: Dict[str, Any], changes: Dict[str, Any]) -> None:
+    for key, value in changes.items():
+        if value is None:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+
+
+def edges(connections: Dict[str, Any]) -> Set[Edge]:
+    """Flattens n8n connections into a set of edges."""
+    result = set()
+    for source, outputs in connections.items():
+        for output_type, slots in outputs.items():
+            for output_index, targets in enumerate(slots or []):
+                for target in targets or []:
+                    result.add((source, output_type, output_index, target["node"], target.get("index", 0)))
+    return result
+
+
+def _connections(edge_set: Set[Edge], input_types: Dict[Tuple[str, str, int, str, int], str]) -> Dict[str, Any]:
+    """Rebuilds n8n connections from edges."""
+    result: Dict[str, Any] = {}
+    for source, output_type, output_index, target, target_index in sorted(edge_set):
+        slots = result.setdefault(source, {}).setdefault(output_type, [])
+        while len(slots) <= output_index:
+            slots.append([])
+        slots[output_index].append({
+            "node": target,
+            "type": input_types.get((source, output_type, output_index, target, target_index), output_type),
+            "index": target_index
+        })
+    return result
+
+
+class _Editor:
+    def __init__(self, workflow: Dict[str, Any]):
+        self.workflow = copy.deepcopy(workflow)
+        self.nodes = {n["name"]: n for n in self.workflow.get("nodes", [])}
+        self.order = [n["name"] for n in self.workflow.get("nodes", [])]
+        self.edges = edges(self.workflow.get("connections", {}))
+        self.input_types: Dict[Edge, str] = {}
+        for source, outputs in self.workflow.get("connections", {}).items():
+            for output_type, slots in outputs.items():
+                for output_index, targets in enumerate(slots or []):
+                    for target in targets or []:
+                        edge = (source, output_type, output_index, target["node"], target.get("index", 0))
+                        self.input_types[edge] = target.get("type", output_type)
+
+    def node(self, name: Optional[str]) -> Dict[str, Any]:
+        if name not in self.nodes:
+            raise WorkflowPatchError(f"Node '{name}' not found")
+        return self.nodes[name]
+
+    def apply(self, op: Dict[str, Any]) -> None:
+        kind = op["op"]
+        if kind == "add_node":
+            node = copy.deepcopy(op.get("node") or {})
+            if not node.get("name") or not node.get("type"):
+                raise WorkflowPatchError("add_node requires node.name and node.type")
+            if node["name"] in self.nodes:
+                raise WorkflowPatchError(f"Node '{node['name']}' already exists")
+            node.setdefault("parameters", {})
+            node.setdefault("position", [0, 0])
+            node.setdefault("typeVersion", 1)
+            self.nodes[node["name"]] = node
+            self.order.append(node["name"])
+        elif kind == "update_node":
+            node = self.node(op.get("name"))
+            changes = op.get("changes") or {}
+            if "name" in changes:
+                raise WorkflowPatchError("Use rename_node to change a node's name")
+            _deep_merge(node, changes)
+        elif kind == "rename_node":
+            old, new = op.get("name"), op.get("new_name")
+            node = self.node(old)
+            if not new or new in self.nodes:
+                raise WorkflowPatchError(f"Invalid or duplicate new_name '{new}'")
+            node["name"] = new
+            self.nodes[new] = self.nodes.pop(old)
+            self.order[self.order.index(old)] = new
+            renamed = lambda n: new if n == old else n
+            self.input_types = {(renamed(s), t, i, renamed(d), j): v for (s, t, i, d, j), v in self.input_types.items()}
+            self.edges = {(renamed(s), t, i, renamed(d), j) for s, t, i, d, j in self.edges}
+        elif kind == "remove_node":
+            name = op.get("name")
+            self.node(name)
+            del self.nodes[name]
+            self.order.remove(name)
+            self.edges = {e for e in self.edges if e[0] != name and e[3] != name}
+        elif kind in ("connect", "disconnect"):
+            self.node(op.get("source"))
+            self.node(op.get("target"))
+            edge = (op["source"], op.get("output_type") or "main", op.get("output_index") or 0,
+                    op["target"], op.get("input_index") or 0)
+            if kind == "connect":
+                self.edges.add(edge)
+            elif edge in self.edges:
+                self.edges.remove(edge)
+            else:
+                raise WorkflowPatchError(f"Connection {op['source']} -> {op['target']} not found")
+        elif kind == "set_name":
+            if not op.get("value"):
+                raise WorkflowPatchError("set_name requires value")
+            self.workflow["name"] = op["value"]
+        elif kind == "update_settings":
+            settings = self.workflow.setdefault("settings", {})
+            _deep_merge(settings, op.get("changes") or {})
+        else:
+            raise WorkflowPatchError(f"Unknown op '{kind}'")
+
+    def result(self) -> Dict[str, Any]:
+        self.workflow["nodes"] = [self.nodes[name] for name in self.order]
+        self.workflow["connections"] = _connections(self.edges, self.input_types)
+        return self.workflow
+
+
+def apply_patches(workflow: Dict[str, Any], operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Returns a patched copy of workflow; the input is left untouched."""
+    editor = _Editor(workflow)
+    for index, op in enumerate(operations):
+        try:
+            editor.apply(op)
+        except WorkflowPatchError as e:
+            raise WorkflowPatchError(f"Operation {index} ({op.get('op')}): {e}")
+    patched = editor.result()
+    validate(patched)
+    return patched
+
+
+def validate(workflow: Dict[str, Any]) -> None:
+    """Checks node names are unique and every connection joins existing nodes."""
+    names = [n.get("name") for n in workflow.get("nodes", [])]
+    duplicates = {n for n in names if names.count(n) > 1}
+    if duplicates:
+        raise WorkflowPatchError(f"Duplicate node names: {sorted(duplicates)}")
+    known = set(names)
+    for source, _, _, target, _ in edges(workflow.get("connections", {})):
+        if source not in known or target not in known:
+            raise WorkflowPatchError(f"Connection {source} -> {target} references a missing node")
+
+
+def _changed_paths(old: Any, new: Any, prefix: str = "") -> List[str]:
+    if isinstance(old, dict) and isinstance(new, dict):
+        paths = []
+        for key in sorted(set(old) | set(new), key=str):
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if key not in old or key not in new:
+                paths.append(path)
+            else:
+                paths.extend(_changed_paths(old[key], new[key], path))
+        return paths
+    return [] if old == new else [prefix]
+
+
+def diff_workflows(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarises node, connection and top-level changes between two workflow versions.
+
+    Nodes are matched by id where present, falling back to name.
+    """
+    def keyed(workflow):
+        return {n.get("id") or n["name"]: n for n in workflow.get("nodes", [])}
+
+    old_nodes, new_nodes = keyed(old), keyed(new)
+    old_edges, new_edges = edges(old.get("connections", {})), edges(new.get("connections", {}))
+    modified = []
+    for key in old_nodes.keys() & new_nodes.keys():
+        paths = _changed_paths(old_nodes[key], new_nodes[key])
+        if paths:
+            modified.append({"name": new_nodes[key]["name"], "changed": paths})
+
+    def edge_dict(e):
+        return {"source": e[0], "output_type": e[1], "output_index": e[2], "target": e[3], "input_index": e[4]}
+
+    return {
+        "workflow_changed": [k for k in ("name", "settings") if old.get(k) != new.get(k)],
+        "nodes_added": sorted(new_nodes[k]["name"] for k in new_nodes.keys() - old_nodes.keys()),
+        "nodes_removed": sorted(old_nodes[k]["name"] for k in old_nodes.keys() - new_nodes.keys()),
+        "nodes_modified": sorted(modified, key=lambda m: m["name"]),
+        "connections_added": [edge_dict(e) for e in sorted(new_edges - old_edges)],
+        "connections_removed": [edge_dict(e) for e in sorted(old_edges - new_edges)],
+    }
+
+
+def update_payload(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns only the top-level workflow fields that changed."""
+    payload = {}
+    if old.get("name") != new.get("name"):
+        payload["name"] = new["name"]
+    if old.get("nodes") != new.get("nodes"):
+        payload["nodes"] = new["nodes"]
+    if edges(old.get("connections", {})) != edges(new.get("connections", {})):
+        payload["connections"] = new["connections"]
+    if old.get("settings") != new.get("settings"):
+        payload["settings"] = new.get("settings") or {}
+    return payload
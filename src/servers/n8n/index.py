@@ -0,0 +1,111 @@
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def name_tokens(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class WorkflowIndex:
+    """Inverted index from node types, credentials, tags and name tokens to workflow ids.
+
+    Workflows are re-indexed only when their updatedAt changes, so feeding
+    every listing and fetch through update() keeps the index current cheaply.
+    """
+    FACETS = ("node_type", "credential", "tag", "token")
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, Set[str]]] = {facet: {} for facet in self.FACETS}
+        self.keys: Dict[str, Dict[str, Set[str]]] = {}
+        self.meta: Dict[str, Dict[str, Any]] = {}
+        self.refreshed_at: Optional[float] = None
+
+    @staticmethod
+    def _keys(workflow: Dict[str, Any]) -> Dict[str, Set[str]]:
+        keys: Dict[str, Set[str]] = {facet: set() for facet in WorkflowIndex.FACETS}
+        for node in workflow.get("nodes") or []:
+            node_type = (node.get("type") or "").lower()
+            if node_type:
+                keys["node_type"].update({node_type, node_type.rsplit(".", 1)[-1]})
+            for cred_type, cred in (node.get("credentials") or {}).items():
+                keys["credential"].add(cred_type.lower())
+                if isinstance(cred, dict):
+                    keys["credential"].update(str(v).lower() for k, v in cred.items() if k in ("id", "name") and v)
+        for tag in workflow.get("tags") or []:
+            keys["tag"].update(str(tag[k]).lower() for k in ("id", "name") if tag.get(k))
+        keys["token"].update(name_tokens(workflow.get("name") or ""))
+        return keys
+
+    def add(self, workflow: Dict[str, Any]) -> bool:
+        """Indexes a full workflow definition. Returns False if it was already current."""
+        workflow_id = str(workflow["id"])
+        meta = self.meta.get(workflow_id)
+        if meta is not None and meta["updatedAt"] and meta["updatedAt"] == workflow.get("updatedAt"):
+            return False
+        self.remove(workflow_id)
+        keys = self._keys(workflow)
+        for facet, values in keys.items():
+            for value in values:
+                self.postings[facet].setdefault(value, set()).add(workflow_id)
+        self.keys[workflow_id] = keys
+        self.meta[workflow_id] = {
+            "id": workflow_id,
+            "name": workflow.get("name"),
+            "active": workflow.get("active"),
+            "updatedAt": workflow.get("updatedAt")
+        }
+        return True
+
+    def update(self, workflows: Iterable[Dict[str, Any]]) -> int:
+        """Indexes every full definition in a listing. Returns how many were (re)indexed."""
+        return sum(self.add(w) for w in workflows if "id" in w and "nodes" in w)
+
+    def remove(self, workflow_id: str) -> None:
+        workflow_id = str(workflow_id)
+        for facet, values in self.keys.pop(workflow_id, {}).items():
+            for value in values:
+                ids = self.postings[facet].get(value)
+                if ids is not None:
+                    ids.discard(workflow_id)
+                    if not ids:
+                        del self.postings[facet][value]
+        self.meta.pop(workflow_id, None)
+
+    def retain(self, workflow_ids: Set[str]) -> int:
+        """Drops workflows not in workflow_ids, e.g. after a full listing. Returns how many."""
+        stale = [w for w in self.meta if w not in workflow_ids]
+        for workflow_id in stale:
+            self.remove(workflow_id)
+        self.refreshed_at = time.time()
+        return len(stale)
+
+    def search(self, query: Optional[str] = None, node_type: Optional[str] = None,
+               credential: Optional[str] = None, tag: Optional[str] = None,
+               active: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """Returns workflows matching every given criterion.
+
+        Each query token matches name tokens it is a prefix of; node types
+        match either the full type or its last segment (e.g. httpRequest).
+        """
+        sets: List[Set[str]] = []
+        for facet, value in (("node_type", node_type), ("credential", credential), ("tag", tag)):
+            if value:
+                sets.append(self.postings[facet].get(value.lower(), set()))
+        for token in name_tokens(query or ""):
+            matches: Set[str] = set()
+            for indexed, ids in self.postings["token"].items():
+                if indexed.startswith(token):
+                    matches |= ids
+            sets.append(matches)
+        if sets:
+            sets.sort(key=len)
+            ids = set(sets[0]).intersection(*sets[1:])
+        else:
+            ids = set(self.meta)
+        results = [self.meta[w] for w in ids]
+        if active is not None:
+            results = [m for m in results if m["active"] == active]
+        return sorted(results, key=lambda m: (m["name"] or "", m["id"]))
@@ -10,12 +10,44 @@ class N8nListWorkflowsSchema(BaseModel):
     model_config = ConfigDict(extra='forbid')
     
     limit: int = Field(default=20, ge=1, le=100, description="Number of workflows to return.")
+    fields: Optional[List[str]] = Field(None, description="Dotted paths to return from each workflow (e.g., id, name, active, tags.name).")
+
+class N8nScanWorkflowsSchema(BaseModel):
+    """Schema for listing workflows across pages."""
+    model_config = ConfigDict(extra='forbid')
+    
+    active: Optional[bool] = Field(None, description="Filter by active state.")
+    tags: Optional[str] = Field(None, description="Filter by comma-separated tag names.")
+    max_items: int = Field(default=1000, ge=1, le=100000, description="Stop after this many workflows.")
+    page_size: int = Field(default=100, ge=1, le=250, description="Workflows per API page.")
+    cursor: Optional[str] = Field(None, description="Resume from a next_cursor returned by a previous scan (returned when max_items is a multiple of page_size).")
+    fields: Optional[List[str]] = Field(None, description="Dotted paths to return from each workflow (e.g., id, name, active).")
+
+class N8nSearchWorkflowsSchema(BaseModel):
+    """Schema for searching workflows in the local index."""
+    model_config = ConfigDict(extra='forbid')
+    
+    query: Optional[str] = Field(None, description="Words that must all prefix-match words of the workflow name.")
+    node_type: Optional[str] = Field(None, description="Node type, full (n8n-nodes-base.httpRequest) or short (httpRequest).")
+    credential: Optional[str] = Field(None, description="Credential id, name or type used by any node.")
+    tag: Optional[str] = Field(None, description="Tag name or id.")
+    active: Optional[bool] = Field(None, description="Filter by active state.")
+    limit: int = Field(default=50, ge=1, le=1000, description="Number of workflows to return.")
+    max_staleness_seconds: int = Field(default=300, ge=0, le=86400, description="Rebuild the index from a full listing if it is older than this.")
 
 class N8nGetWorkflowSchema(BaseModel):
     """Schema for getting a specific workflow."""
     model_config = ConfigDict(extra='forbid')
     
     workflow_id: str = Field(..., description="Workflow ID.")
+    fields: Optional[List[str]] = Field(None, description="Dotted paths to return (e.g., name, nodes.name, nodes.type, nodes.parameters.url).")
+
+class N8nRefreshWorkflowCacheSchema(BaseModel):
+    """Schema for revalidating the workflow cache."""
+    model_config = ConfigDict(extra='forbid')
+    
+    # No params needed
+    pass
 
 class N8nCreateWorkflowSchema(BaseModel):
     """Schema for creating a workflow."""
@@ -32,9 +64,54 @@ class N8nUpdateWorkflowSchema(BaseModel):
     
     workflow_id: str = Field(..., description="Workflow ID.")
     name: Optional[str] = Field(None, description="New workflow name.")
-    nodes: Optional[List[Dict(str, Any]]] = Field(None, description="Updated nodes.")
+    nodes: Optional[List[Dict[str, Any]]] = Field(None, description="Updated nodes.")
     connections: Optional[Dict[str, Any]] = Field(None, description="Updated connections.")
 
+class N8nWorkflowPatchOp(BaseModel):
+    """A single structural edit to a workflow."""
+    model_config = ConfigDict(extra='forbid')
+    
+    op: str = Field(..., pattern="^(add_node|update_node|rename_node|remove_node|connect|disconnect|set_name|update_settings)$", description="Operation: add_node, update_node, rename_node, remove_node, connect, disconnect, set_name, update_settings.")
+    name: Optional[str] = Field(None, description="Target node name (update_node, rename_node, remove_node).")
+    new_name: Optional[str] = Field(None, description="New node name (rename_node).")
+    node: Optional[Dict[str, Any]] = Field(None, description="Full node definition (add_node).")
+    changes: Optional[Dict[str, Any]] = Field(None, description="Deep-merged into the node or settings; null values delete keys (update_node, update_settings).")
+    source: Optional[str] = Field(None, description="Source node name (connect, disconnect).")
+    target: Optional[str] = Field(None, description="Target node name (connect, disconnect).")
+    output_type: str = Field(default="main", description="Connection type (connect, disconnect).")
+    output_index: int = Field(default=0, ge=0, description="Source output index (connect, disconnect).")
+    input_index: int = Field(default=0, ge=0, description="Target input index (connect, disconnect).")
+    value: Optional[str] = Field(None, description="New workflow name (set_name).")
+
+class N8nPatchWorkflowSchema(BaseModel):
+    """Schema for applying node-level patches to a workflow."""
+    model_config = ConfigDict(extra='forbid')
+    
+    workflow_id: str = Field(..., description="Workflow ID.")
+    operations: List[N8nWorkflowPatchOp] = Field(..., min_length=1, description="Edits applied in order.")
+    dry_run: bool = Field(default=False, description="Validate and report the diff without saving.")
+    expected_updated_at: Optional[str] = Field(None, description="Fail with a conflict unless the workflow's current updatedAt equals this (the version the patch was written against).")
+
+class N8nExportWorkflowsSchema(BaseModel):
+    """Schema for exporting workflows to an archive."""
+    model_config = ConfigDict(extra='forbid')
+    
+    path: str = Field(..., description="Directory, or .ndjson/.jsonl file, to write.")
+    format: Optional[str] = Field(None, pattern="^(directory|ndjson)$", description="Archive format: directory or ndjson. Inferred from path if omitted.")
+    active: Optional[bool] = Field(None, description="Only export workflows with this active state.")
+    tags: Optional[str] = Field(None, description="Only export workflows with these comma-separated tag names.")
+    include_tags: bool = Field(default=True, description="Also export all tags.")
+    concurrency: int = Field(default=8, ge=1, le=32, description="Workflow definitions fetched at once when a listing omits them.")
+
+class N8nImportWorkflowsSchema(BaseModel):
+    """Schema for importing workflows from an archive."""
+    model_config = ConfigDict(extra='forbid')
+    
+    path: str = Field(..., description="Directory, or .ndjson/.jsonl file, written by n8n_export_workflows.")
+    format: Optional[str] = Field(None, pattern="^(directory|ndjson)$", description="Archive format: directory or ndjson. Inferred from path if omitted.")
+    activate: bool = Field(default=False, description="Activate imported workflows that were active in the archive.")
+    concurrency: int = Field(default=4, ge=1, le=32, description="Workflows created at once.")
+
 class N8nDeleteWorkflowSchema(BaseModel):
     """Schema for deleting a workflow."""
     model_config = ConfigDict(extra='forbid')
@@ -59,12 +136,26 @@ class N8nListExecutionsSchema(BaseModel):
     workflow_id: Optional[str] = Field(None, description="Filter by workflow ID.")
     limit: int = Field(default=20, ge=1, le=100, description="Number of executions to return.")
     status: Optional[str] = Field(None, description="Filter by status: success, error, waiting.")
+    fields: Optional[List[str]] = Field(None, description="Dotted paths to return from each execution (e.g., id, status, startedAt, stoppedAt).")
+
+class N8nScanExecutionsSchema(BaseModel):
+    """Schema for listing executions across pages."""
+    model_config = ConfigDict(extra='forbid')
+    
+    workflow_id: Optional[str] = Field(None, description="Filter by workflow ID.")
+    status: Optional[str] = Field(None, description="Filter by status: success, error, waiting.")
+    max_items: int = Field(default=1000, ge=1, le=100000, description="Stop after this many executions.")
+    page_size: int = Field(default=100, ge=1, le=250, description="Executions per API page.")
+    cursor: Optional[str] = Field(None, description="Resume from a next_cursor returned by a previous scan (returned when max_items is a multiple of page_size).")
+    fields: Optional[List[str]] = Field(None, description="Dotted paths to return from each execution (e.g., id, status, startedAt).")
 
 class N8nGetExecutionSchema(BaseModel):
     """Schema for getting execution details."""
     model_config = ConfigDict(extra='forbid')
     
     execution_id: str = Field(..., description="Execution ID.")
+    fields: Optional[List[str]] = Field(None, description="Dotted paths to return (e.g., status, data.resultData.error.message, data.resultData.runData.*.executionTime). Paths under data fetch run data, parsed incrementally so only the selected parts are kept.")
+    nodes: Optional[List[str]] = Field(None, description="Return run data for only these node names, plus status and the execution error.")
 
 class N8nDeleteExecutionSchema(BaseModel):
     """Schema for deleting an execution."""
@@ -72,6 +163,18 @@ class N8nDeleteExecutionSchema(BaseModel):
     
     execution_id: str = Field(..., description="Execution ID to delete.")
 
+class N8nPruneExecutionsSchema(BaseModel):
+    """Schema for bulk-deleting executions that match a filter."""
+    model_config = ConfigDict(extra='forbid')
+    
+    workflow_id: Optional[str] = Field(None, description="Only prune executions of this workflow.")
+    status: Optional[str] = Field(None, description="Only prune executions with this status: success, error, waiting.")
+    older_than_days: Optional[float] = Field(None, gt=0, description="Only prune executions started more than this many days ago.")
+    max_deletes: int = Field(default=10000, ge=1, le=100000, description="Stop after deleting this many executions; continue with the returned cursor.")
+    concurrency: int = Field(default=8, ge=1, le=32, description="Deletes in flight at once.")
+    dry_run: bool = Field(default=False, description="Only count matching executions.")
+    cursor: Optional[str] = Field(None, description="Resume from the cursor returned by an interrupted or capped run.")
+
 class N8nRetryExecutionSchema(BaseModel):
     """Schema for retrying a failed execution."""
     model_config = ConfigDict(extra='forbid')
@@ -84,6 +187,24 @@ class N8nExecuteWorkflowSchema(BaseModel):
     
     workflow_id: str = Field(..., description="Workflow ID to execute.")
     data: Optional[Dict[str, Any]] = Field(None, description="Input data for the workflow.")
+    wait: bool = Field(default=False, description="Wait for the execution to finish and return its result.")
+    timeout_seconds: float = Field(default=60, gt=0, le=900, description="How long to wait before returning a handle for n8n_wait_execution.")
+
+class N8nWaitExecutionSchema(BaseModel):
+    """Schema for waiting on an execution to finish."""
+    model_config = ConfigDict(extra='forbid')
+    
+    execution_id: str = Field(..., description="Execution ID to wait for.")
+    timeout_seconds: float = Field(default=60, gt=0, le=900, description="How long to wait before returning with done=false.")
+
+class N8nExecutionStatsSchema(BaseModel):
+    """Schema for per-workflow execution statistics."""
+    model_config = ConfigDict(extra='forbid')
+    
+    workflow_id: Optional[str] = Field(None, description="Only return stats for this workflow.")
+    sort_by: str = Field(default="failures", pattern="^(failures|failure_rate|p95|total)$", description="Order workflows by failures, failure_rate, p95 duration or total executions.")
+    limit: int = Field(default=20, ge=1, le=1000, description="Number of workflows to return.")
+    max_staleness_seconds: int = Field(default=60, ge=0, le=86400, description="Answer from the local store without syncing new executions if it synced within this many seconds.")
 
 # ============================================================================
 # TAG MODELS
@@ -1,10 +1,13 @@
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
 from dotenv import load_dotenv
+import asyncio
 import json
 import sys
 import os
-import requests
-from typing import Dict, Any
+import time
+import httpx
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 
 # Handle both script and module execution
 if __name__ == "__main__":
@@ -15,8 +18,18 @@ if __name__ == "__main__":
         N8nListExecutionsSchema, N8nGetExecutionSchema, N8nDeleteExecutionSchema,
         N8nRetryExecutionSchema, N8nExecuteWorkflowSchema, N8nListTagsSchema,
         N8nCreateTagSchema, N8nUpdateWorkflowTagsSchema, N8nListCredentialsSchema,
-        N8nGetCredentialSchema
+        N8nGetCredentialSchema, N8nScanWorkflowsSchema, N8nScanExecutionsSchema,
+        N8nWaitExecutionSchema, N8nRefreshWorkflowCacheSchema,
+        N8nPatchWorkflowSchema, N8nPruneExecutionsSchema, N8nExportWorkflowsSchema,
+        N8nImportWorkflowsSchema, N8nExecutionStatsSchema, N8nSearchWorkflowsSchema
     )
+    from src.servers.n8n.analytics import ExecutionAnalytics, sync_executions
+    from src.servers.n8n.archive import ArchiveWriter, Checkpoint, archive_format, create_payload, read_archive
+    from src.servers.n8n.cache import WorkflowCache
+    from src.servers.n8n.diff import WorkflowPatchError, apply_patches, diff_workflows, update_payload
+    from src.servers.n8n.index import WorkflowIndex
+    from src.servers.n8n.streaming import extract
+    from src.servers.projection import field_tree, project
 else:
     from .models import (
         N8nListWorkflowsSchema, N8nGetWorkflowSchema, N8nCreateWorkflowSchema,
@@ -24,8 +37,18 @@ else:
         N8nListExecutionsSchema, N8nGetExecutionSchema, N8nDeleteExecutionSchema,
         N8nRetryExecutionSchema, N8nExecuteWorkflowSchema, N8nListTagsSchema,
         N8nCreateTagSchema, N8nUpdateWorkflowTagsSchema, N8nListCredentialsSchema,
-        N8nGetCredentialSchema
+        N8nGetCredentialSchema, N8nScanWorkflowsSchema, N8nScanExecutionsSchema,
+        N8nWaitExecutionSchema, N8nRefreshWorkflowCacheSchema,
+        N8nPatchWorkflowSchema, N8nPruneExecutionsSchema, N8nExportWorkflowsSchema,
+        N8nImportWorkflowsSchema, N8nExecutionStatsSchema, N8nSearchWorkflowsSchema
     )
+    from .analytics import ExecutionAnalytics, sync_executions
+    from .archive import ArchiveWriter, Checkpoint, archive_format, create_payload, read_archive
+    from .cache import WorkflowCache
+    from .diff import WorkflowPatchError, apply_patches, diff_workflows, update_payload
+    from .index import WorkflowIndex
+    from .streaming import extract
+    from ..projection import field_tree, project
 
 # Load environment variables
 load_dotenv()
@@ -39,29 +62,272 @@ if not N8N_API_URL:
 if not N8N_API_KEY:
     raise ValueError("N8N_API_KEY not found in .env")
 
+# HTTP connection pool settings
+N8N_HTTP_TIMEOUT = float(os.getenv("N8N_HTTP_TIMEOUT", "30"))
+N8N_HTTP_MAX_CONNECTIONS = int(os.getenv("N8N_HTTP_MAX_CONNECTIONS", "20"))
+N8N_HTTP_MAX_KEEPALIVE = int(os.getenv("N8N_HTTP_MAX_KEEPALIVE", "10"))
+
+# Execution completion polling
+N8N_POLL_INITIAL_SECONDS = float(os.getenv("N8N_POLL_INITIAL_SECONDS", "0.25"))
+N8N_POLL_MAX_SECONDS = float(os.getenv("N8N_POLL_MAX_SECONDS", "5"))
+N8N_EXECUTION_WATCH_SECONDS = float(os.getenv("N8N_EXECUTION_WATCH_SECONDS", "3600"))
+
+# Workflow definition cache
+N8N_WORKFLOW_CACHE_TTL = float(os.getenv("N8N_WORKFLOW_CACHE_TTL", "60"))
+N8N_WORKFLOW_CACHE_SIZE = int(os.getenv("N8N_WORKFLOW_CACHE_SIZE", "500"))
+
+# Execution analytics store
+N8N_ANALYTICS_PATH = os.getenv(
+    "N8N_ANALYTICS_PATH",
+    os.path.join(os.path.expanduser("~"), ".symone", "n8n_analytics.db")
+)
+N8N_ANALYTICS_BACKFILL = int(os.getenv("N8N_ANALYTICS_BACKFILL", "5000"))
+
 # Initialize MCP Server
 mcp = FastMCP("Symone n8n Server - Comprehensive Edition")
 
+class N8nApiError(Exception):
+    """Raised by client helpers that cannot return a result dict mid-stream."""
+
 class N8nClient:
-    """n8n REST API Client"""
-    def __init__(self, base_url: str, api_key: str):
+    """n8n REST API Client backed by a pooled, keep-alive async HTTP client."""
+    def __init__(self, base_url: str, api_key: str, timeout: float = 30.0,
+                 max_connections: int = 20, max_keepalive: int = 10):
         self.base_url = base_url.rstrip('/')
         self.headers = {
             "X-N8N-API-KEY": api_key,
             "Content-Type": "application/json"
         }
+        self.http = httpx.AsyncClient(
+            base_url=f"{self.base_url}/api/v1/",
+            headers=self.headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive)
+        )
     
-    def request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make HTTP request to n8n API."""
-        url = f"{self.base_url}/api/v1/{endpoint.lstrip('/')}"
+    async def request(self, method: str, endpoint: str, timeout: Optional[float] = None, **kwargs) -> Dict[str, Any]:
+        """Make HTTP request to n8n API. timeout overrides the client default for this call."""
+        if timeout is not None:
+            kwargs["timeout"] = timeout
         try:
-            response = requests.request(method, url, headers=self.headers, **kwargs)
+            response = await self.http.request(method, endpoint.lstrip('/'), **kwargs)
             response.raise_for_status()
             return {"success": True, "data": response.json() if response.content else None}
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             return {"success": False, "error": str(e)}
 
-n8n_client = N8nClient(N8N_API_URL, N8N_API_KEY)
+    async def select(self, endpoint: str, tree: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """GETs a JSON endpoint, parsing the body as it streams and keeping only the paths in tree."""
+        try:
+            async with self.http.stream("GET", endpoint.lstrip('/'), **kwargs) as response:
+                response.raise_for_status()
+                result = await extract(response.aiter_bytes(), tree)
+            return {"success": True, **result}
+        except httpx.HTTPError as e:
+            return {"success": False, "error": str(e)}
+        except ValueError as e:
+            return {"success": False, "error": f"Invalid JSON from n8n: {e}"}
+
+    async def paginate(self, endpoint: str, params: Optional[Dict[str, Any]] = None, page_size: int = 100,
+                       cursor: Optional[str] = None) -> AsyncIterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """Yields (items, next_cursor) for each page of a cursor-paginated list endpoint.
+
+        The next page is requested as soon as a page arrives, so its network
+        round trip overlaps with the caller's processing of the current one.
+        """
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+
+        def fetch(page_cursor):
+            query = {**params, "limit": page_size}
+            if page_cursor:
+                query["cursor"] = page_cursor
+            return asyncio.ensure_future(self.request("GET", endpoint, params=query))
+
+        pending = fetch(cursor)
+        try:
+            while pending is not None:
+                result = await pending
+                pending = None
+                if not result["success"]:
+                    raise N8nApiError(result["error"])
+                page = result["data"] or {}
+                next_cursor = page.get("nextCursor")
+                if next_cursor:
+                    pending = fetch(next_cursor)
+                yield page.get("data", []), next_cursor
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+n8n_client = N8nClient(
+    N8N_API_URL, N8N_API_KEY,
+    timeout=N8N_HTTP_TIMEOUT,
+    max_connections=N8N_HTTP_MAX_CONNECTIONS,
+    max_keepalive=N8N_HTTP_MAX_KEEPALIVE
+)
+
+workflow_cache = WorkflowCache(N8N_WORKFLOW_CACHE_TTL, N8N_WORKFLOW_CACHE_SIZE)
+workflow_index = WorkflowIndex()
+
+def observe_workflows(workflows: List[Dict[str, Any]]) -> int:
+    """Feeds listed workflows to the cache and the search index. Returns cache entries replaced."""
+    workflow_index.update(workflows)
+    return workflow_cache.revalidate(workflows)
+
+async def fetch_workflow(workflow_id: str, fresh: bool = False) -> Dict[str, Any]:
+    """Gets a workflow definition, served from the cache while it is fresh unless fresh is set."""
+    cached = None if fresh else workflow_cache.get(workflow_id)
+    if cached is not None:
+        return {"success": True, "data": cached, "cached": True}
+    result = await n8n_client.request("GET", f"workflows/{workflow_id}")
+    if result["success"] and result["data"]:
+        workflow_cache.put(result["data"])
+        workflow_index.add(result["data"])
+    return {**result, "cached": False}
+
+async def reindex_workflow(workflow_id: str, workflow: Any = None) -> None:
+    """Re-indexes a workflow after a change that may not move its updatedAt (tags, activation).
+
+    Uses the returned definition when it is complete, otherwise re-reads it.
+    """
+    workflow_index.remove(workflow_id)
+    if isinstance(workflow, dict) and "nodes" in workflow:
+        workflow_cache.put(workflow)
+        workflow_index.add(workflow)
+    else:
+        await fetch_workflow(workflow_id, fresh=True)
+
+async def refresh_workflows() -> Dict[str, int]:
+    """Revalidates the cache and the index against one full paginated listing.
+
+    Raises N8nApiError if the listing fails part way.
+    """
+    replaced = 0
+    seen = set()
+    async for page, _ in n8n_client.paginate("workflows", page_size=250):
+        replaced += observe_workflows(page)
+        seen.update(str(w["id"]) for w in page)
+    removed = [wid for wid in list(workflow_cache.entries) if wid not in seen]
+    for wid in removed:
+        workflow_cache.invalidate(wid)
+    workflow_index.retain(seen)
+    return {"replaced": replaced, "removed": len(removed)}
+
+TERMINAL_STATUSES = {"success", "error", "crashed", "canceled"}
+ACTIVE_STATUSES = {"new", "running"}
+
+execution_analytics = ExecutionAnalytics(N8N_ANALYTICS_PATH)
+# One sync at a time, so concurrent callers can't count the same executions twice
+analytics_lock = asyncio.Lock()
+
+class ExecutionWatcher:
+    """Polls executions until they finish, sharing one poller per execution id.
+
+    Polls back off exponentially from initial to max_interval seconds. A
+    poller outlives the callers that started it (so an execution can be
+    awaited again later) until the execution finishes or watch_seconds pass.
+    """
+    def __init__(self, client: N8nClient, initial: float, max_interval: float, watch_seconds: float):
+        self.client = client
+        self.initial = initial
+        self.max_interval = max_interval
+        self.watch_seconds = watch_seconds
+        self.pollers: Dict[str, asyncio.Task] = {}
+
+    async def _poll(self, execution_id: str) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.watch_seconds
+        interval = self.initial
+        try:
+            while True:
+                result = await self.client.request("GET", f"executions/{execution_id}")
+                if not result["success"]:
+                    return result
+                execution = result["data"] or {}
+                if execution.get("finished") or execution.get("status") in TERMINAL_STATUSES:
+                    # Only the final read carries the (possibly large) run data
+                    return await self.client.request("GET", f"executions/{execution_id}", params={"includeData": "true"})
+                if loop.time() + interval > deadline:
+                    return {"success": False, "error": f"Execution {execution_id} still {execution.get('status')} after {self.watch_seconds}s"}
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, self.max_interval)
+        finally:
+            self.pollers.pop(execution_id, None)
+
+    async def wait(self, execution_id: str, timeout: float) -> Tuple[bool, Dict[str, Any]]:
+        """Waits up to timeout seconds. Returns (done, result)."""
+        poller = self.pollers.get(execution_id)
+        if poller is None:
+            poller = asyncio.ensure_future(self._poll(execution_id))
+            self.pollers[execution_id] = poller
+        try:
+            return True, await asyncio.wait_for(asyncio.shield(poller), timeout)
+        except asyncio.TimeoutError:
+            return False, {"success": True, "data": None}
+
+execution_watcher = ExecutionWatcher(n8n_client, N8N_POLL_INITIAL_SECONDS, N8N_POLL_MAX_SECONDS,
+                                     N8N_EXECUTION_WATCH_SECONDS)
+
+async def _wait_result(execution_id: str, timeout: float) -> Dict[str, Any]:
+    done, result = await execution_watcher.wait(execution_id, timeout)
+    if not result["success"]:
+        return {**result, "execution_id": execution_id}
+    execution = result["data"] or {}
+    return {
+        "success": True,
+        "execution_id": execution_id,
+        "done": done,
+        "status": execution.get("status") if done else "running",
+        "data": execution if done else None
+    }
+
+async def _bounded(items, worker, concurrency: int) -> None:
+    """Runs worker over items with at most concurrency calls in flight, pulling items lazily."""
+    pending = set()
+    try:
+        for item in items:
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            pending.add(asyncio.ensure_future(worker(item)))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def _scan(ctx: Context, endpoint: str, filters: Dict[str, Any], max_items: int, page_size: int,
+                cursor: Optional[str], fields: Optional[List[str]], on_page=None) -> Dict[str, Any]:
+    """Follows nextCursor up to max_items, reporting progress after each page."""
+    items: List[Dict[str, Any]] = []
+    pages = 0
+    # A failure before the first page leaves the caller where it started
+    next_cursor = cursor
+    has_more = False
+    try:
+        async for page, next_cursor in n8n_client.paginate(endpoint, filters, page_size, cursor):
+            pages += 1
+            if on_page:
+                on_page(page)
+            remaining = max_items - len(items)
+            items.extend(project(page[:remaining], fields))
+            await ctx.report_progress(len(items), max_items)
+            if len(items) >= max_items:
+                has_more = len(page) > remaining or next_cursor is not None
+                # n8n cursors point at page boundaries, so a page cut short can't be resumed
+                if len(page) > remaining:
+                    next_cursor = None
+                break
+    except N8nApiError as e:
+        return {"success": False, "error": str(e), "data": items, "count": len(items), "next_cursor": next_cursor}
+    return {"success": True, "data": items, "count": len(items), "pages": pages,
+            "has_more": has_more, "next_cursor": next_cursor}
 
 # ============================================================================
 # WORKFLOW TOOLS
@@ -77,9 +343,30 @@ n8n_client = N8nClient(N8N_API_URL, N8N_API_KEY)
         "openWorldHint": True,
     }
 )
-def list_workflows(params: N8nListWorkflowsSchema) -> str:
+async def list_workflows(params: N8nListWorkflowsSchema) -> str:
     """Lists workflows."""
-    result = n8n_client.request("GET", f"workflows?limit={params.limit}")
+    result = await n8n_client.request("GET", f"workflows?limit={params.limit}")
+    if result["success"]:
+        observe_workflows(result["data"]["data"])
+    if result["success"] and params.fields:
+        result["data"]["data"] = project(result["data"]["data"], params.fields)
+    return json.dumps(result)
+
+@mcp.tool(
+    name="n8n_scan_workflows",
+    description="List workflows across all pages by following n8n's cursor, up to max_items",
+    annotations={
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def scan_workflows(params: N8nScanWorkflowsSchema, ctx: Context) -> str:
+    """Scans workflows page by page."""
+    filters = {"active": str(params.active).lower() if params.active is not None else None, "tags": params.tags}
+    result = await _scan(ctx, "workflows", filters, params.max_items, params.page_size, params.cursor, params.fields,
+                         on_page=observe_workflows)
     return json.dumps(result)
 
 @mcp.tool(
@@ -92,11 +379,59 @@ def list_workflows(params: N8nListWorkflowsSchema) -> str:
         "openWorldHint": True,
     }
 )
-def get_workflow(params: N8nGetWorkflowSchema) -> str:
+async def get_workflow(params: N8nGetWorkflowSchema) -> str:
     """Gets workflow details."""
-    result = n8n_client.request("GET", f"workflows/{params.workflow_id}")
+    result = await fetch_workflow(params.workflow_id)
+    if result["success"] and params.fields:
+        result["data"] = project(result["data"], params.fields)
     return json.dumps(result)
 
+@mcp.tool(
+    name="n8n_refresh_workflow_cache",
+    description="Revalidate all cached workflow definitions with one paginated list scan; returns cache stats",
+    annotations={
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def refresh_workflow_cache(params: N8nRefreshWorkflowCacheSchema) -> str:
+    """Revalidates the workflow cache against a full listing."""
+    try:
+        counts = await refresh_workflows()
+    except N8nApiError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    return json.dumps({"success": True, **counts, "cache": workflow_cache.stats()})
+
+@mcp.tool(
+    name="n8n_search_workflows",
+    description="Find workflows by name words, node type, credential or tag using a local index",
+    annotations={
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def search_workflows(params: N8nSearchWorkflowsSchema) -> str:
+    """Searches the workflow index, rebuilding it from a listing first if it is stale."""
+    refreshed = False
+    if workflow_index.refreshed_at is None or time.time() - workflow_index.refreshed_at >= params.max_staleness_seconds:
+        try:
+            await refresh_workflows()
+        except N8nApiError as e:
+            return json.dumps({"success": False, "error": str(e)})
+        refreshed = True
+    results = workflow_index.search(params.query, params.node_type, params.credential, params.tag, params.active)
+    return json.dumps({
+        "success": True,
+        "data": results[:params.limit],
+        "count": len(results),
+        "indexed": len(workflow_index.meta),
+        "refreshed": refreshed
+    })
+
 @mcp.tool(
     name="n8n_create_workflow",
     description="Create a new workflow",
@@ -107,7 +442,7 @@ def get_workflow(params: N8nGetWorkflowSchema) -> str:
         "openWorldHint": True,
     }
 )
-def create_workflow(params: N8nCreateWorkflowSchema) -> str:
+async def create_workflow(params: N8nCreateWorkflowSchema) -> str:
     """Creates a new workflow."""
     payload = {
         "name": params.name,
@@ -115,7 +450,7 @@ def create_workflow(params: N8nCreateWorkflowSchema) -> str:
         "connections": params.connections,
         "settings": params.settings or {}
     }
-    result = n8n_client.request("POST", "workflows", json=payload)
+    result = await n8n_client.request("POST", "workflows", json=payload)
     return json.dumps(result)
 
 @mcp.tool(
@@ -128,7 +463,7 @@ def create_workflow(params: N8nCreateWorkflowSchema) -> str:
         "openWorldHint": True,
     }
 )
-def update_workflow(params: N8nUpdateWorkflowSchema) -> str:
+async def update_workflow(params: N8nUpdateWorkflowSchema) -> str:
     """Updates a workflow."""
     payload = {}
     if params.name:
@@ -138,9 +473,205 @@ def update_workflow(params: N8nUpdateWorkflowSchema) -> str:
     if params.connections:
         payload["connections"] = params.connections
     
-    result = n8n_client.request("PATCH", f"workflows/{params.workflow_id}", json=payload)
+    workflow_cache.invalidate(params.workflow_id)
+    result = await n8n_client.request("PATCH", f"workflows/{params.workflow_id}", json=payload)
+    if result["success"] and isinstance(result["data"], dict) and "nodes" in result["data"]:
+        workflow_index.add(result["data"])
     return json.dumps(result)
 
+@mcp.tool(
+    name="n8n_patch_workflow",
+    description="Apply node-level edits (add/update/rename/remove node, connect/disconnect) and send only what changed",
+    annotations={
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": True,
+    }
+)
+async def patch_workflow(params: N8nPatchWorkflowSchema) -> str:
+    """Patches a workflow and reports the diff.
+
+    The patch is applied to a fresh read (a dry run may use the cache), so
+    edits made elsewhere since the cache was filled are not overwritten.
+    With expected_updated_at, a workflow changed since that version is
+    reported as a conflict instead of patched.
+    """
+    current = await fetch_workflow(params.workflow_id, fresh=not params.dry_run)
+    if not current["success"]:
+        return json.dumps(current)
+    updated_at = current["data"].get("updatedAt")
+    if params.expected_updated_at and updated_at != params.expected_updated_at:
+        return json.dumps({"success": False, "conflict": True, "updatedAt": updated_at,
+                           "error": f"Workflow changed since {params.expected_updated_at}; re-read it and retry"})
+    try:
+        patched = apply_patches(current["data"], [op.model_dump() for op in params.operations])
+    except WorkflowPatchError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    diff = diff_workflows(current["data"], patched)
+    payload = update_payload(current["data"], patched)
+    if params.dry_run or not payload:
+        return json.dumps({"success": True, "dry_run": params.dry_run, "sent_fields": list(payload), "diff": diff})
+
+    workflow_cache.invalidate(params.workflow_id)
+    result = await n8n_client.request("PATCH", f"workflows/{params.workflow_id}", json=payload)
+    if not result["success"]:
+        return json.dumps(result)
+    if isinstance(result["data"], dict) and "nodes" in result["data"]:
+        workflow_cache.put(result["data"])
+        workflow_index.add(result["data"])
+    return json.dumps({"success": True, "sent_fields": list(payload), "diff": diff})
+
+@mcp.tool(
+    name="n8n_export_workflows",
+    description="Export all workflows (and tags) to a directory or NDJSON archive; resumes from its checkpoint",
+    annotations={
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def export_workflows(params: N8nExportWorkflowsSchema, ctx: Context) -> str:
+    """Streams workflows page by page into an archive.
+
+    Progress is logged to <path>.checkpoint after each page; a rerun after an
+    interruption continues from the last completed page.
+    """
+    fmt = archive_format(params.path, params.format)
+    checkpoint = Checkpoint(params.path.rstrip('/') + ".checkpoint")
+    done_ids = {e["id"] for e in checkpoint.entries if "id" in e}
+    cursors = [e["cursor"] for e in checkpoint.entries if "cursor" in e]
+    tags_done = any("tags" in e for e in checkpoint.entries)
+    writer = ArchiveWriter(params.path, fmt, append=bool(checkpoint.entries))
+    semaphore = asyncio.Semaphore(params.concurrency)
+    exported = 0
+
+    async def complete(workflow: Dict[str, Any]) -> Dict[str, Any]:
+        if "nodes" in workflow and "connections" in workflow:
+            return workflow
+        async with semaphore:
+            result = await fetch_workflow(str(workflow["id"]))
+        if not result["success"]:
+            raise N8nApiError(result["error"])
+        return result["data"]
+
+    try:
+        if params.include_tags and not tags_done:
+            tags = []
+            async for page, _ in n8n_client.paginate("tags", page_size=250):
+                tags.extend(page)
+            writer.write_tags(tags)
+            writer.flush()
+            checkpoint.record(tags=len(tags))
+        filters = {"active": str(params.active).lower() if params.active is not None else None, "tags": params.tags}
+        async for page, next_cursor in n8n_client.paginate("workflows", filters, 250, cursors[-1] if cursors else None):
+            observe_workflows(page)
+            todo = [w for w in page if str(w["id"]) not in done_ids]
+            for workflow in await asyncio.gather(*(complete(w) for w in todo)):
+                writer.write_workflow(workflow)
+            writer.flush()
+            for workflow in todo:
+                checkpoint.record(id=str(workflow["id"]))
+            checkpoint.record(cursor=next_cursor)
+            exported += len(todo)
+            await ctx.report_progress(len(done_ids) + exported)
+    except (N8nApiError, OSError) as e:
+        writer.close()
+        checkpoint.close()
+        return json.dumps({"success": False, "error": str(e), "exported": exported, "checkpoint": checkpoint.path})
+    writer.close()
+    checkpoint.close(completed=True)
+    return json.dumps({"success": True, "path": params.path, "format": fmt, "exported": exported,
+                       "resumed_after": len(done_ids)})
+
+@mcp.tool(
+    name="n8n_import_workflows",
+    description="Create workflows from an export archive in parallel, remapping tags by name; resumes from its checkpoint",
+    annotations={
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": True,
+    }
+)
+async def import_workflows(params: N8nImportWorkflowsSchema, ctx: Context) -> str:
+    """Imports an archive written by n8n_export_workflows.
+
+    Tags are matched to the target's tags by name and created when missing,
+    so source tag ids are remapped. Each created workflow is logged to
+    <path>.import-checkpoint; a rerun skips workflows already imported.
+    """
+    fmt = archive_format(params.path, params.format)
+    if not os.path.exists(params.path):
+        return json.dumps({"success": False, "error": f"Archive not found: {params.path}"})
+    checkpoint = Checkpoint(params.path.rstrip('/') + ".import-checkpoint")
+    imported = {e["source_id"]: e["id"] for e in checkpoint.entries if "source_id" in e}
+    tag_ids: Dict[str, str] = {}
+    tag_map: Dict[str, str] = {}
+    tag_lock = asyncio.Lock()
+    errors: List[Dict[str, Any]] = []
+    created = skipped = 0
+
+    async def ensure_tag(tag: Dict[str, Any]) -> Optional[str]:
+        async with tag_lock:
+            if tag["name"] not in tag_ids:
+                result = await n8n_client.request("POST", "tags", json={"name": tag["name"]})
+                if not result["success"]:
+                    errors.append({"tag": tag["name"], "error": result["error"]})
+                    return None
+                tag_ids[tag["name"]] = str(result["data"]["id"])
+            if "id" in tag:
+                tag_map[str(tag["id"])] = tag_ids[tag["name"]]
+            return tag_ids[tag["name"]]
+
+    async def worker(record) -> None:
+        nonlocal created, skipped
+        kind, data = record
+        if kind == "tag":
+            await ensure_tag(data)
+            return
+        source_id = str(data.get("id"))
+        if source_id in imported:
+            skipped += 1
+            return
+        result = await n8n_client.request("POST", "workflows", json=create_payload(data))
+        if not result["success"]:
+            errors.append({"source_id": source_id, "name": data.get("name"), "error": result["error"]})
+            return
+        new_id = str(result["data"]["id"])
+        tags = [t for t in [await ensure_tag(t) for t in data.get("tags") or []] if t]
+        if tags:
+            result = await n8n_client.request("PUT", f"workflows/{new_id}/tags", json=[{"id": t} for t in tags])
+            if not result["success"]:
+                errors.append({"source_id": source_id, "id": new_id, "error": f"Tagging failed: {result['error']}"})
+        if params.activate and data.get("active"):
+            result = await n8n_client.request("POST", f"workflows/{new_id}/activate")
+            if not result["success"]:
+                errors.append({"source_id": source_id, "id": new_id, "error": f"Activation failed: {result['error']}"})
+        checkpoint.record(source_id=source_id, id=new_id)
+        imported[source_id] = new_id
+        created += 1
+        await ctx.report_progress(created + skipped)
+
+    try:
+        async for page, _ in n8n_client.paginate("tags", page_size=250):
+            tag_ids.update({t["name"]: str(t["id"]) for t in page})
+        await _bounded(read_archive(params.path, fmt), worker, params.concurrency)
+    except (N8nApiError, OSError, ValueError, KeyError) as e:
+        checkpoint.close()
+        return json.dumps({"success": False, "error": str(e), "created": created, "errors": errors[:20],
+                           "checkpoint": checkpoint.path})
+    checkpoint.close(completed=not errors)
+    return json.dumps({
+        "success": not errors,
+        "created": created,
+        "skipped": skipped,
+        "tag_map": tag_map,
+        "errors": errors[:20],
+        "workflow_map": imported
+    })
+
 @mcp.tool(
     name="n8n_delete_workflow",
     description="Delete a workflow",
@@ -151,9 +682,11 @@ def update_workflow(params: N8nUpdateWorkflowSchema) -> str:
         "openWorldHint": True,
     }
 )
-def delete_workflow(params: N8nDeleteWorkflowSchema) -> str:
+async def delete_workflow(params: N8nDeleteWorkflowSchema) -> str:
     """Deletes a workflow."""
-    result = n8n_client.request("DELETE", f"workflows/{params.workflow_id}")
+    workflow_cache.invalidate(params.workflow_id)
+    workflow_index.remove(params.workflow_id)
+    result = await n8n_client.request("DELETE", f"workflows/{params.workflow_id}")
     return json.dumps(result)
 
 @mcp.tool(
@@ -166,10 +699,13 @@ def delete_workflow(params: N8nDeleteWorkflowSchema) -> str:
         "openWorldHint": True,
     }
 )
-def activate_workflow(params: N8nActivateWorkflowSchema) -> str:
+async def activate_workflow(params: N8nActivateWorkflowSchema) -> str:
     """Activates or deactivates a workflow."""
     endpoint = f"workflows/{params.workflow_id}/{'activate' if params.activate else 'deactivate'}"
-    result = n8n_client.request("POST", endpoint)
+    workflow_cache.invalidate(params.workflow_id)
+    result = await n8n_client.request("POST", endpoint)
+    if result["success"]:
+        await reindex_workflow(params.workflow_id, result["data"])
     return json.dumps(result)
 
 # ============================================================================
@@ -186,7 +722,7 @@ def activate_workflow(params: N8nActivateWorkflowSchema) -> str:
         "openWorldHint": True,
     }
 )
-def list_executions(params: N8nListExecutionsSchema) -> str:
+async def list_executions(params: N8nListExecutionsSchema) -> str:
     """Lists executions."""
     query_params = [f"limit={params.limit}"]
     if params.workflow_id:
@@ -195,7 +731,25 @@ def list_executions(params: N8nListExecutionsSchema) -> str:
         query_params.append(f"status={params.status}")
     
     endpoint = f"executions?{'&'.join(query_params)}"
-    result = n8n_client.request("GET", endpoint)
+    result = await n8n_client.request("GET", endpoint)
+    if result["success"] and params.fields:
+        result["data"]["data"] = project(result["data"]["data"], params.fields)
+    return json.dumps(result)
+
+@mcp.tool(
+    name="n8n_scan_executions",
+    description="List executions across all pages by following n8n's cursor, up to max_items",
+    annotations={
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def scan_executions(params: N8nScanExecutionsSchema, ctx: Context) -> str:
+    """Scans executions page by page."""
+    filters = {"workflowId": params.workflow_id, "status": params.status}
+    result = await _scan(ctx, "executions", filters, params.max_items, params.page_size, params.cursor, params.fields)
     return json.dumps(result)
 
 @mcp.tool(
@@ -208,9 +762,32 @@ def list_executions(params: N8nListExecutionsSchema) -> str:
         "openWorldHint": True,
     }
 )
-def get_execution(params: N8nGetExecutionSchema) -> str:
-    """Gets execution details."""
-    result = n8n_client.request("GET", f"executions/{params.execution_id}")
+async def get_execution(params: N8nGetExecutionSchema) -> str:
+    """Gets execution details.
+
+    Requests that need run data stream the body and keep only what was asked
+    for, instead of loading the whole (possibly very large) record.
+    """
+    endpoint = f"executions/{params.execution_id}"
+    fields = params.fields or []
+    if not params.nodes and not any(f.split('.', 1)[0] == "data" for f in fields):
+        result = await n8n_client.request("GET", endpoint)
+        if result["success"] and params.fields:
+            result["data"] = project(result["data"], params.fields)
+        return json.dumps(result)
+
+    if params.nodes:
+        fields = fields + ["id", "status", "data.resultData.error", "data.resultData.lastNodeExecuted"]
+    tree = field_tree(fields)
+    if params.nodes:
+        # Node names may contain dots, so they go into the tree directly. An
+        # empty dict already selects the whole subtree.
+        result_data = tree["data"].get("resultData") if tree["data"] else None
+        if result_data and result_data.get("runData") != {}:
+            run_data = result_data.setdefault("runData", {})
+            for node in params.nodes:
+                run_data[node] = {}
+    result = await n8n_client.select(endpoint, tree, params={"includeData": "true"})
     return json.dumps(result)
 
 @mcp.tool(
@@ -223,11 +800,142 @@ def get_execution(params: N8nGetExecutionSchema) -> str:
         "openWorldHint": True,
     }
 )
-def delete_execution(params: N8nDeleteExecutionSchema) -> str:
+async def delete_execution(params: N8nDeleteExecutionSchema) -> str:
     """Deletes an execution."""
-    result = n8n_client.request("DELETE", f"executions/{params.execution_id}")
+    result = await n8n_client.request("DELETE", f"executions/{params.execution_id}")
     return json.dumps(result)
 
+def _started_before(execution: Dict[str, Any], cutoff: Optional[datetime]) -> bool:
+    if cutoff is None:
+        return True
+    started = execution.get("startedAt")
+    if not started:
+        return False
+    return datetime.fromisoformat(started.replace("Z", "+00:00")) < cutoff
+
+@mcp.tool(
+    name="n8n_execution_stats",
+    description="Per-workflow execution counts by status, failure rate and duration percentiles from the local analytics store",
+    annotations={
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def execution_stats(params: N8nExecutionStatsSchema) -> str:
+    """Answers from the analytics store, first adding executions newer than its watermark if it is stale."""
+    added = 0
+    async with analytics_lock:
+        _, _, synced_at = execution_analytics.state()
+        if synced_at is None or time.time() - synced_at >= params.max_staleness_seconds:
+            try:
+                added = await sync_executions(
+                    execution_analytics,
+                    n8n_client.paginate("executions", page_size=250),
+                    ACTIVE_STATUSES,
+                    N8N_ANALYTICS_BACKFILL,
+                    max_pin_seconds=N8N_EXECUTION_WATCH_SECONDS
+                )
+            except N8nApiError as e:
+                return json.dumps({"success": False, "error": str(e)})
+            synced_at = time.time()
+
+    keys = {
+        "failures": lambda s: s["failures"],
+        "failure_rate": lambda s: s["failure_rate"] or 0,
+        "p95": lambda s: s["duration_ms"]["p95"] or 0,
+        "total": lambda s: s["total"]
+    }
+    summaries = sorted(execution_analytics.summaries(params.workflow_id), key=keys[params.sort_by], reverse=True)
+    watermark, _, _ = execution_analytics.state()
+    return json.dumps({
+        "success": True,
+        "workflows": summaries[:params.limit],
+        "workflow_count": len(summaries),
+        "added": added,
+        "watermark": watermark,
+        "synced_seconds_ago": round(time.time() - synced_at, 1)
+    })
+
+@mcp.tool(
+    name="n8n_prune_executions",
+    description="Bulk-delete executions by workflow, status and age with bounded concurrency; supports dry-run and resume",
+    annotations={
+        "readOnlyHint": False,
+        "destructiveHint": True,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def prune_executions(params: N8nPruneExecutionsSchema, ctx: Context) -> str:
+    """Walks matching executions page by page and deletes them concurrently.
+
+    The returned cursor points past the last fully processed page, so an
+    interrupted or capped run can be resumed without rescanning. A capped
+    dry run deletes nothing, so it resumes after the cut page and reports
+    the matches on it that were left uncounted.
+    """
+    cutoff = None
+    if params.older_than_days is not None:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=params.older_than_days)
+    filters = {"workflowId": params.workflow_id, "status": params.status}
+    semaphore = asyncio.Semaphore(params.concurrency)
+    matched = deleted = scanned = uncounted = 0
+    errors: List[Dict[str, Any]] = []
+    cursor = params.cursor
+    has_more = False
+
+    async def delete(execution_id: str) -> None:
+        nonlocal deleted
+        async with semaphore:
+            result = await n8n_client.request("DELETE", f"executions/{execution_id}")
+        if result["success"]:
+            deleted += 1
+        elif len(errors) < 20:
+            errors.append({"execution_id": execution_id, "error": result["error"]})
+
+    try:
+        async for page, next_cursor in n8n_client.paginate("executions", filters, 250, params.cursor):
+            scanned += len(page)
+            targets = [
+                str(e["id"]) for e in page
+                if e.get("status") not in ACTIVE_STATUSES and _started_before(e, cutoff)
+            ]
+            remaining = params.max_deletes - matched
+            matched += min(len(targets), remaining)
+            if not params.dry_run:
+                await asyncio.gather(*(delete(eid) for eid in targets[:remaining]))
+            await ctx.report_progress(matched, params.max_deletes)
+            if len(targets) >= remaining:
+                cut = len(targets) - remaining
+                if params.dry_run:
+                    # Nothing was deleted, so resuming from this page would count it again
+                    uncounted = cut
+                    has_more = next_cursor is not None
+                    cursor = next_cursor
+                else:
+                    # Resume from this page if it was cut short; already-deleted ids are gone from it
+                    has_more = cut > 0 or next_cursor is not None
+                    cursor = cursor if cut else next_cursor
+                break
+            cursor = next_cursor
+    except N8nApiError as e:
+        return json.dumps({"success": False, "error": str(e), "matched": matched, "deleted": deleted,
+                           "cursor": cursor, "errors": errors})
+    return json.dumps({
+        "success": not errors,
+        "dry_run": params.dry_run,
+        "scanned": scanned,
+        "matched": matched,
+        "deleted": deleted,
+        "failed": matched - deleted if not params.dry_run else 0,
+        "errors": errors,
+        "uncounted": uncounted,
+        "has_more": has_more,
+        "cursor": cursor
+    })
+
 @mcp.tool(
     name="n8n_retry_execution",
     description="Retry a failed execution",
@@ -238,9 +946,9 @@ def delete_execution(params: N8nDeleteExecutionSchema) -> str:
         "openWorldHint": True,
     }
 )
-def retry_execution(params: N8nRetryExecutionSchema) -> str:
+async def retry_execution(params: N8nRetryExecutionSchema) -> str:
     """Retries an execution."""
-    result = n8n_client.request("POST", f"executions/{params.execution_id}/retry")
+    result = await n8n_client.request("POST", f"executions/{params.execution_id}/retry")
     return json.dumps(result)
 
 @mcp.tool(
@@ -253,11 +961,31 @@ def retry_execution(params: N8nRetryExecutionSchema) -> str:
         "openWorldHint": True,
     }
 )
-def execute_workflow(params: N8nExecuteWorkflowSchema) -> str:
-    """Executes a workflow."""
+async def execute_workflow(params: N8nExecuteWorkflowSchema) -> str:
+    """Executes a workflow, optionally waiting for it to finish."""
     payload = {"data": params.data} if params.data else {}
-    result = n8n_client.request("POST", f"workflows/{params.workflow_id}/execute", json=payload)
-    return json.dumps(result)
+    result = await n8n_client.request("POST", f"workflows/{params.workflow_id}/execute", json=payload)
+    if not params.wait or not result["success"]:
+        return json.dumps(result)
+    started = result["data"] or {}
+    execution_id = started.get("executionId") or started.get("id") or (started.get("data") or {}).get("executionId")
+    if not execution_id:
+        return json.dumps({"success": False, "error": "n8n did not return an execution id", "data": started})
+    return json.dumps(await _wait_result(str(execution_id), params.timeout_seconds))
+
+@mcp.tool(
+    name="n8n_wait_execution",
+    description="Wait for an execution to finish, polling with backoff; returns a handle if still running",
+    annotations={
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def wait_execution(params: N8nWaitExecutionSchema) -> str:
+    """Waits for an execution's final result."""
+    return json.dumps(await _wait_result(params.execution_id, params.timeout_seconds))
 
 # ============================================================================
 # TAG TOOLS
@@ -273,9 +1001,9 @@ def execute_workflow(params: N8nExecuteWorkflowSchema) -> str:
         "openWorldHint": True,
     }
 )
-def list_tags(params: N8nListTagsSchema) -> str:
+async def list_tags(params: N8nListTagsSchema) -> str:
     """Lists tags."""
-    result = n8n_client.request("GET", "tags")
+    result = await n8n_client.request("GET", "tags")
     return json.dumps(result)
 
 @mcp.tool(
@@ -288,9 +1016,9 @@ def list_tags(params: N8nListTagsSchema) -> str:
         "openWorldHint": True,
     }
 )
-def create_tag(params: N8nCreateTagSchema) -> str:
+async def create_tag(params: N8nCreateTagSchema) -> str:
     """Creates a tag."""
-    result = n8n_client.request("POST", "tags", json={"name": params.name})
+    result = await n8n_client.request("POST", "tags", json={"name": params.name})
     return json.dumps(result)
 
 @mcp.tool(
@@ -303,13 +1031,16 @@ def create_tag(params: N8nCreateTagSchema) -> str:
         "openWorldHint": True,
     }
 )
-def update_workflow_tags(params: N8nUpdateWorkflowTagsSchema) -> str:
+async def update_workflow_tags(params: N8nUpdateWorkflowTagsSchema) -> str:
     """Updates workflow tags."""
-    result = n8n_client.request(
+    workflow_cache.invalidate(params.workflow_id)
+    result = await n8n_client.request(
         "PUT",
         f"workflows/{params.workflow_id}/tags",
         json={"tags": params.tag_ids}
     )
+    if result["success"]:
+        await reindex_workflow(params.workflow_id)
     return json.dumps(result)
 
 # ============================================================================
@@ -326,9 +1057,9 @@ def update_workflow_tags(params: N8nUpdateWorkflowTagsSchema) -> str:
         "openWorldHint": True,
     }
 )
-def list_credentials(params: N8nListCredentialsSchema) -> str:
+async def list_credentials(params: N8nListCredentialsSchema) -> str:
     """Lists credentials."""
-    result = n8n_client.request("GET", "credentials")
+    result = await n8n_client.request("GET", "credentials")
     return json.dumps(result)
 
 @mcp.tool(
@@ -341,9 +1072,9 @@ def list_credentials(params: N8nListCredentialsSchema) -> str:
         "openWorldHint": True,
     }
 )
-def get_credential(params: N8nGetCredentialSchema) -> str:
+async def get_credential(params: N8nGetCredentialSchema) -> str:
     """Gets credential details."""
-    result = n8n_client.request("GET", f"credentials/{params.credential_id}")
+    result = await n8n_client.request("GET", f"credentials/{params.credential_id}")
     return json.dumps(result)
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import ijson
+
+# Incremental extraction of selected paths from a JSON response body.
+#
+# Selections use the nested trees from projection.field_tree: an empty dict
+# keeps a whole value, "*" matches every key, and lists are selected element
+# by element. Everything else is parsed past without being built, so memory
+# is bounded by the size of the selected values rather than the response.
+
+_SKIP = object()
+
+
+class _ByteReader:
+    """Adapts an async byte iterator to the file-like read() ijson expects."""
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self.chunks = chunks
+        self.bytes_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            # ijson probes with read(0) to tell bytes from str
+            return b""
+        try:
+            chunk = await self.chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def _merge(a: Optional[Dict[str, Any]], b: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if a is None or b is None:
+        return a if b is None else b
+    if a == {} or b == {}:
+        return {}
+    merged = dict(a)
+    for key, subtree in b.items():
+        merged[key] = _merge(merged.get(key), subtree)
+    return merged
+
+
+class _Extractor:
+    def __init__(self, events):
+        self.events = events
+
+    async def next(self) -> Tuple[str, Any]:
+        return await self.events.__anext__()
+
+    async def build(self, event: str, value: Any) -> Any:
+        """Builds the whole value starting at event."""
+        if event == "start_map":
+            result = {}
+            while True:
+                event, key = await self.next()
+                if event == "end_map":
+                    return result
+                result[key] = await self.build(*await self.next())
+        if event == "start_array":
+            result = []
+            while True:
+                event, value = await self.next()
+                if event == "end_array":
+                    return result
+                result.append(await self.build(event, value))
+        return value
+
+    async def skip(self, event: str) -> None:
+        if event not in ("start_map", "start_array"):
+            return
+        depth = 1
+        while depth:
+            event, _ = await self.next()
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+
+    async def select(self, event: str, value: Any, tree: Optional[Dict[str, Any]], final: bool) -> Any:
+        """Returns the selected part of the value starting at event, or _SKIP.
+
+        When final is set nothing after this value is needed, so a map stops
+        reading as soon as every key it selects by name has been seen.
+        """
+        if tree is None:
+            await self.skip(event)
+            return _SKIP
+        if tree == {}:
+            return await self.build(event, value)
+        if event == "start_array":
+            result = []
+            while True:
+                event, value = await self.next()
+                if event == "end_array":
+                    return result
+                item = await self.select(event, value, tree, False)
+                if item is not _SKIP:
+                    result.append(item)
+        if event != "start_map":
+            return value
+
+        result = {}
+        wanted = set(tree) - {"*"}
+        while True:
+            event, key = await self.next()
+            if event == "end_map":
+                return result
+            wanted.discard(key)
+            done = final and not wanted and "*" not in tree
+            item = await self.select(*await self.next(), _merge(tree.get(key), tree.get("*")), done)
+            if item is not _SKIP:
+                result[key] = item
+            if done:
+                return result
+
+
+async def extract(chunks: AsyncIterator[bytes], tree: Dict[str, Any]) -> Dict[str, Any]:
+    """Parses a JSON body incrementally, keeping only the paths selected by tree.
+
+    Reading stops as soon as every path selected by name has been parsed.
+    Returns the data, the bytes read and whether the body was read to the end.
+    """
+    reader = _ByteReader(chunks)
+    events = ijson.basic_parse_async(reader, use_float=True)
+    extractor = _Extractor(events)
+    event, value = await extractor.next()
+    data = await extractor.select(event, value, tree, True)
+    try:
+        await extractor.next()
+        complete = False
+    except StopAsyncIteration:
+        complete = True
+    return {"data": None if data is _SKIP else data, "bytes_read": reader.bytes_read, "complete": complete}
@@ -0,0 +1,54 @@
+from typing import Any, Dict, List, Optional
+
+# Field projection shared by the MCP servers.
+#
+# Fields are dotted paths such as "id", "nodes.type" or
+# "data.resultData.runData.*.executionTime". Lists are projected element by
+# element, and "*" matches every key of an object.
+
+
+def field_tree(fields: List[str]) -> Dict[str, Any]:
+    """Turns dotted paths into a nested selection tree; an empty dict selects a whole value."""
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        node = tree
+        parts = [p for p in field.split('.') if p]
+        for i, part in enumerate(parts):
+            if i == len(parts) - 1:
+                # A shorter path selects the whole subtree, overriding deeper ones
+                node[part] = {}
+            else:
+                child = node.get(part)
+                if child == {} and part in node:
+                    break
+                node = node.setdefault(part, {})
+    return tree
+
+
+def _apply(value: Any, tree: Dict[str, Any]) -> Any:
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_apply(v, tree) for v in value]
+    if not isinstance(value, dict):
+        return value
+    result = {}
+    if '*' in tree:
+        for key, item in value.items():
+            result[key] = _apply(item, tree['*'])
+    for key, subtree in tree.items():
+        if key != '*' and key in value:
+            result[key] = _apply(value[key], subtree)
+    return result
+
+
+def project(data: Any, fields: Optional[List[str]]) -> Any:
+    """Keeps only the requested dotted field paths of a dict, or of each item of a list."""
+    if not fields:
+        return data
+    return _apply(data, field_tree(fields))
+
+
+def top_level_fields(fields: List[str]) -> List[str]:
+    """Returns the distinct first path segments, e.g. for pushing a projection into a SELECT."""
+    return list(dict.fromkeys(f.split('.', 1)[0] for f in fields if f))
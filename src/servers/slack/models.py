@@ -1,7 +1,13 @@
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List
 
-class SlackMessageSchema(BaseModel):
+class SlackTenantSchema(BaseModel):
+    """Base schema for tools that act on a Slack workspace."""
+    model_config = ConfigDict(extra='forbid')
+    
+    server_id: Optional[str] = Field(None, description="Symone server ID whose vaulted Slack tokens to use (default: the tokens this server was started with).")
+
+class SlackMessageSchema(SlackTenantSchema):
     """Schema for posting a message to Slack."""
     model_config = ConfigDict(extra='forbid')
     
@@ -9,13 +15,30 @@ class SlackMessageSchema(BaseModel):
     text: str = Field(..., description="The message text to post.")
     thread_ts: Optional[str] = Field(None, description="Thread timestamp to reply to.")
 
-class SlackListChannelsSchema(BaseModel):
+class SlackBulkMessageItem(BaseModel):
+    """A single message in a bulk post."""
+    model_config = ConfigDict(extra='forbid')
+    
+    channel_id: str = Field(..., description="The ID of the channel to post to.")
+    text: str = Field(..., description="The message text to post.")
+    thread_ts: Optional[str] = Field(None, description="Thread timestamp to reply to.")
+
+class SlackPostMessagesBulkSchema(SlackTenantSchema):
+    """Schema for posting many messages in one call."""
+    model_config = ConfigDict(extra='forbid')
+    
+    messages: List[SlackBulkMessageItem] = Field(..., min_length=1, max_length=1000, description="Messages to post.")
+    max_concurrency: int = Field(default=8, ge=1, le=32, description="Maximum messages in flight at once.")
+    max_retries: int = Field(default=3, ge=0, le=10, description="Retries per message on rate limits and transient errors.")
+
+class SlackListChannelsSchema(SlackTenantSchema):
     """Schema for listing public channels."""
     model_config = ConfigDict(extra='forbid')
     
     limit: int = Field(default=20, ge=1, le=100, description="Maximum number of channels to return.")
+    fields: Optional[List[str]] = Field(None, description="Dotted paths to return from each raw Slack channel object (e.g., id, name, num_members); omit for the default summary.")
 
-class SlackAddReactionSchema(BaseModel):
+class SlackAddReactionSchema(SlackTenantSchema):
     """Schema for adding a reaction to a message."""
     model_config = ConfigDict(extra='forbid')
     
@@ -23,7 +46,7 @@ class SlackAddReactionSchema(BaseModel):
     timestamp: str = Field(..., description="Timestamp of the message.")
     reaction: str = Field(..., description="Emoji name (without colons, e.g., 'thumbsup').")
 
-class SlackUploadFileSchema(BaseModel):
+class SlackUploadFileSchema(SlackTenantSchema):
     """Schema for uploading a file."""
     model_config = ConfigDict(extra='forbid')
     
@@ -32,20 +55,42 @@ class SlackUploadFileSchema(BaseModel):
     title: Optional[str] = Field(None, description="File title.")
     initial_comment: Optional[str] = Field(None, description="Comment to add with the upload.")
 
-class SlackGetUserSchema(BaseModel):
+class SlackUploadFileItem(BaseModel):
+    """A single file in a multi-file upload."""
+    model_config = ConfigDict(extra='forbid')
+    
+    channel_id: str = Field(..., description="Channel to upload to.")
+    file_path: str = Field(..., description="Absolute path to the file.")
+    title: Optional[str] = Field(None, description="File title.")
+    initial_comment: Optional[str] = Field(None, description="Comment to add with the upload.")
+
+class SlackUploadFilesSchema(SlackTenantSchema):
+    """Schema for uploading several files concurrently."""
+    model_config = ConfigDict(extra='forbid')
+    
+    files: List[SlackUploadFileItem] = Field(..., min_length=1, max_length=100, description="Files to upload.")
+    max_concurrency: int = Field(default=4, ge=1, le=16, description="Maximum uploads in flight at once.")
+
+class SlackGetUserSchema(SlackTenantSchema):
     """Schema for getting user info."""
     model_config = ConfigDict(extra='forbid')
     
     user_id: str = Field(..., description="User ID (e.g., U12345678).")
+    fields: Optional[List[str]] = Field(None, description="Dotted paths to return from each raw Slack user object (e.g., id, profile.email); omit for the default summary.")
 
-class SlackSearchMessagesSchema(BaseModel):
+class SlackSearchMessagesSchema(SlackTenantSchema):
     """Schema for searching messages."""
     model_config = ConfigDict(extra='forbid')
     
     query: str = Field(..., description="Search query.")
     count: int = Field(default=20, ge=1, le=100, description="Number of results to return.")
+    channel_ids: Optional[List[str]] = Field(None, description="Only match messages in these channels.")
+    user_ids: Optional[List[str]] = Field(None, description="Only match messages from these users.")
+    after: Optional[str] = Field(None, pattern=r"^\d+(\.\d+)?$", description="Only match messages at or after this timestamp (e.g., 1700000000.000000).")
+    before: Optional[str] = Field(None, pattern=r"^\d+(\.\d+)?$", description="Only match messages before this timestamp.")
+    source: str = Field(default="auto", pattern="^(auto|local|slack)$", description="auto: local index for synced channels, Slack search for the rest; local: local index only; slack: Slack search only.")
 
-class SlackUpdateMessageSchema(BaseModel):
+class SlackUpdateMessageSchema(SlackTenantSchema):
     """Schema for updating a message."""
     model_config = ConfigDict(extra='forbid')
     
@@ -53,78 +98,109 @@ class SlackUpdateMessageSchema(BaseModel):
     timestamp: str = Field(..., description="Timestamp of the message to update.")
     text: str = Field(..., description="New message text.")
 
-class SlackDeleteMessageSchema(BaseModel):
+class SlackDeleteMessageSchema(SlackTenantSchema):
     """Schema for deleting a message."""
     model_config = ConfigDict(extra='forbid')
     
     channel_id: str = Field(..., description="Channel containing the message.")
     timestamp: str = Field(..., description="Timestamp of the message to delete.")
 
-class SlackCreateChannelSchema(BaseModel):
+class SlackCreateChannelSchema(SlackTenantSchema):
     """Schema for creating a channel."""
     model_config = ConfigDict(extra='forbid')
     
     name: str = Field(..., description="Channel name (lowercase, no spaces).")
     is_private: bool = Field(default=False, description="Create as private channel.")
 
-class SlackInviteToChannelSchema(BaseModel):
+class SlackInviteToChannelSchema(SlackTenantSchema):
     """Schema for inviting users to a channel."""
     model_config = ConfigDict(extra='forbid')
     
     channel_id: str = Field(..., description="Channel ID.")
     user_ids: List[str] = Field(..., description="List of user IDs to invite.")
 
-class SlackGetChannelHistorySchema(BaseModel):
+class SlackBulkInviteSchema(SlackTenantSchema):
+    """Schema for inviting many users into many channels."""
+    model_config = ConfigDict(extra='forbid')
+    
+    channel_ids: List[str] = Field(..., min_length=1, max_length=500, description="Channel IDs to invite users into.")
+    user_ids: List[str] = Field(..., min_length=1, description="User IDs to invite into every channel.")
+    chunk_size: int = Field(default=1000, ge=1, le=1000, description="Users per conversations.invite call (Slack max: 1000).")
+    max_concurrency: int = Field(default=4, ge=1, le=16, description="Maximum invite calls in flight at once.")
+    skip_existing_members: bool = Field(default=True, description="Look up current members and only invite users not already in the channel.")
+
+class SlackGetChannelHistorySchema(SlackTenantSchema):
     """Schema for getting channel message history."""
     model_config = ConfigDict(extra='forbid')
     
     channel_id: str = Field(..., description="Channel ID.")
     limit: int = Field(default=10, ge=1, le=100, description="Number of messages.")
+    max_staleness_seconds: int = Field(default=0, ge=0, le=3600, description="Serve from the local store without asking Slack for new messages if it synced within this many seconds.")
+    revalidate_seconds: int = Field(default=300, ge=0, le=86400, description="Re-read the served messages to pick up edits and deletions when last re-read more than this many seconds ago; otherwise only newer messages are fetched.")
 
-class SlackSetChannelTopicSchema(BaseModel):
+class SlackSetChannelTopicSchema(SlackTenantSchema):
     """Schema for setting channel topic."""
     model_config = ConfigDict(extra='forbid')
     
     channel_id: str = Field(..., description="Channel ID.")
     topic: str = Field(..., description="New topic text.")
 
-class SlackGetThreadRepliesSchema(BaseModel):
+class SlackGetThreadRepliesSchema(SlackTenantSchema):
     """Schema for getting thread replies."""
     model_config = ConfigDict(extra='forbid')
     
     channel_id: str = Field(..., description="Channel ID.")
     thread_ts: str = Field(..., description="Thread parent message timestamp.")
+    max_staleness_seconds: int = Field(default=0, ge=0, le=3600, description="Serve from the local store without asking Slack for new replies if it synced within this many seconds.")
+    revalidate_seconds: int = Field(default=300, ge=0, le=86400, description="Re-read the thread to pick up edits and deletions when last re-read more than this many seconds ago; otherwise only newer replies are fetched.")
+
+class SlackThreadRef(BaseModel):
+    """Identifies a thread by channel and parent timestamp."""
+    model_config = ConfigDict(extra='forbid')
+    
+    channel_id: str = Field(..., description="Channel ID.")
+    thread_ts: str = Field(..., description="Thread parent message timestamp.")
+
+class SlackGetThreadsBulkSchema(SlackTenantSchema):
+    """Schema for fetching replies of many threads at once."""
+    model_config = ConfigDict(extra='forbid')
+    
+    threads: List[SlackThreadRef] = Field(..., min_length=1, max_length=200, description="Threads to fetch.")
+    max_concurrency: int = Field(default=8, ge=1, le=16, description="Maximum threads fetched at once.")
+    max_staleness_seconds: int = Field(default=0, ge=0, le=3600, description="Serve threads synced within this many seconds from the local store without asking Slack.")
+    revalidate_seconds: int = Field(default=300, ge=0, le=86400, description="Re-read the threads to pick up edits and deletions when last re-read more than this many seconds ago; otherwise only newer replies are fetched.")
 
 # ============================================================================
 # ADMIN USER TOOLS (Require User Token + Admin)
 # ============================================================================
 
-class SlackListWorkspaceUsersSchema(BaseModel):
+class SlackListWorkspaceUsersSchema(SlackTenantSchema):
     """Schema for listing all workspace users (admin)."""
     model_config = ConfigDict(extra='forbid')
     
     limit: int = Field(default=100, ge=1, le=200, description="Number of users to return.")
+    fields: Optional[List[str]] = Field(None, description="Dotted paths to return from each raw Slack user object (e.g., id, profile.email); omit for the default summary.")
 
-class SlackSetUserAdminSchema(BaseModel):
+class SlackSetUserAdminSchema(SlackTenantSchema):
     """Schema for promoting/demoting workspace admins."""
     model_config = ConfigDict(extra='forbid')
     
     user_id: str = Field(..., description="User ID to modify.")
     is_admin: bool = Field(..., description="Set as admin (True) or regular user (False).")
 
-class SlackDeactivateUserSchema(BaseModel):
+class SlackDeactivateUserSchema(SlackTenantSchema):
     """Schema for deactivating a user (admin)."""
     model_config = ConfigDict(extra='forbid')
     
     user_id: str = Field(..., description="User ID to deactivate.")
 
-class SlackArchiveChannelSchema(BaseModel):
+class SlackArchiveChannelSchema(SlackTenantSchema):
     """Schema for archiving a channel (admin)."""
     model_config = ConfigDict(extra='forbid')
     
     channel_id: str = Field(..., description="Channel ID to archive.")
 
-class SlackGetWorkspaceInfoSchema(BaseModel):
+class SlackGetWorkspaceInfoSchema(SlackTenantSchema):
     """Schema for getting workspace info."""
     model_config = ConfigDict(extra='forbid')
     
@@ -0,0 +1,111 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from slack_sdk.errors import SlackApiError
+
+# Slack Web API rate-limit tiers, in requests per minute per workspace.
+# https://api.slack.com/docs/rate-limits
+TIER_PER_MINUTE = {
+    1: 1,
+    2: 20,
+    3: 50,
+    4: 100,
+}
+
+# chat.postMessage is a "special" tier: roughly one message per second per
+# channel, with a workspace-wide ceiling of several hundred per minute.
+POST_MESSAGE_PER_MINUTE = 300
+POST_MESSAGE_PER_CHANNEL_INTERVAL = 1.0
+
+# Errors worth retrying; everything else is reported back to the caller.
+RETRYABLE_ERRORS = {"ratelimited", "internal_error", "fatal_error", "service_unavailable", "request_timeout"}
+
+
+class RateLimiter:
+    """Thread-safe token bucket."""
+    def __init__(self, per_minute: float, burst: Optional[int] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst if burst is not None else max(1, int(per_minute // 10)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class KeyedInterval:
+    """Enforces a minimum interval between calls sharing the same key."""
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.next_slot: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, key: str) -> None:
+        """Reserve the next slot for key and sleep until it arrives."""
+        with self.lock:
+            now = time.monotonic()
+            if len(self.next_slot) > 10000:
+                self.next_slot = {k: v for k, v in self.next_slot.items() if v > now}
+            slot = max(now, self.next_slot.get(key, now))
+            self.next_slot[key] = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(method: str, per_minute: float, scope: str = "default") -> RateLimiter:
+    """Returns the shared limiter for a Web API method, creating it on first use."""
+    key = (scope, method)
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter(per_minute)
+        return _limiters[key]
+
+
+def drop_limiters(scope: str) -> None:
+    """Forgets every limiter for a scope, e.g. when its workspace is evicted."""
+    with _limiters_lock:
+        for key in [k for k in _limiters if k[0] == scope]:
+            del _limiters[key]
+
+
+def call_with_retry(call: Callable[[], Any], limiter: Optional[RateLimiter] = None, max_retries: int = 3) -> Any:
+    """Runs a Slack API call under a limiter, honouring Retry-After on transient errors."""
+    attempt = 0
+    while True:
+        if limiter:
+            limiter.acquire()
+        try:
+            return call()
+        except SlackApiError as e:
+            error = e.response.get('error') if e.response is not None else None
+            if attempt >= max_retries or error not in RETRYABLE_ERRORS:
+                raise
+            retry_after = e.response.headers.get('Retry-After') if e.response is not None else None
+            time.sleep(float(retry_after) if retry_after else min(2 ** attempt, 30))
+            attempt += 1
+
+
+def run_concurrently(worker: Callable[[Any], Dict[str, Any]], items: List[Any], max_workers: int) -> List[Dict[str, Any]]:
+    """Maps worker over items on a thread pool, preserving input order."""
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(worker, items))
@@ -1,7 +1,12 @@
-from mcp.server.fastmcp import FastMCP
-from slack_sdk import WebClient
+from mcp.server.fastmcp import FastMCP, Context
+from mcp.server.lowlevel.server import request_ctx
 from slack_sdk.errors import SlackApiError
 from dotenv import load_dotenv
+from datetime import datetime, timedelta, timezone
+from itertools import chain, zip_longest
+import asyncio
+import hmac
+import httpx
 import json
 import sys
 import os
@@ -16,8 +21,18 @@ if __name__ == "__main__":
         SlackUpdateMessageSchema, SlackDeleteMessageSchema, SlackCreateChannelSchema,
         SlackInviteToChannelSchema, SlackGetChannelHistorySchema, SlackSetChannelTopicSchema,
         SlackGetThreadRepliesSchema, SlackListWorkspaceUsersSchema, SlackSetUserAdminSchema,
-        SlackDeactivateUserSchema, SlackArchiveChannelSchema, SlackGetWorkspaceInfoSchema
+        SlackDeactivateUserSchema, SlackArchiveChannelSchema, SlackGetWorkspaceInfoSchema,
+        SlackPostMessagesBulkSchema, SlackBulkInviteSchema, SlackUploadFilesSchema,
+        SlackGetThreadsBulkSchema
     )
+    from src.servers.slack.ratelimit import (
+        KeyedInterval, limiter_for, drop_limiters, call_with_retry, run_concurrently,
+        POST_MESSAGE_PER_MINUTE, POST_MESSAGE_PER_CHANNEL_INTERVAL, TIER_PER_MINUTE
+    )
+    from src.servers.slack.store import MessageStore, sync_channel_history, sync_thread
+    from src.servers.slack.uploads import UploadProgress, stream_upload
+    from src.servers.slack.tenants import SecretsVault, SlackClientPool, SlackTenant, TenantError
+    from src.servers.projection import project
 else:
     from .models import (
         SlackMessageSchema, SlackListChannelsSchema, SlackAddReactionSchema,
@@ -25,8 +40,18 @@ else:
         SlackUpdateMessageSchema, SlackDeleteMessageSchema, SlackCreateChannelSchema,
         SlackInviteToChannelSchema, SlackGetChannelHistorySchema, SlackSetChannelTopicSchema,
         SlackGetThreadRepliesSchema, SlackListWorkspaceUsersSchema, SlackSetUserAdminSchema,
-        SlackDeactivateUserSchema, SlackArchiveChannelSchema, SlackGetWorkspaceInfoSchema
+        SlackDeactivateUserSchema, SlackArchiveChannelSchema, SlackGetWorkspaceInfoSchema,
+        SlackPostMessagesBulkSchema, SlackBulkInviteSchema, SlackUploadFilesSchema,
+        SlackGetThreadsBulkSchema
+    )
+    from .ratelimit import (
+        KeyedInterval, limiter_for, drop_limiters, call_with_retry, run_concurrently,
+        POST_MESSAGE_PER_MINUTE, POST_MESSAGE_PER_CHANNEL_INTERVAL, TIER_PER_MINUTE
     )
+    from .store import MessageStore, sync_channel_history, sync_thread
+    from .uploads import UploadProgress, stream_upload
+    from .tenants import SecretsVault, SlackClientPool, SlackTenant, TenantError
+    from ..projection import project
 
 # Load environment variables
 load_dotenv()
@@ -34,16 +59,58 @@ load_dotenv()
 # Initialize Slack Client
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
 SLACK_USER_TOKEN = os.getenv("SLACK_USER_TOKEN")
+SLACK_MESSAGE_STORE_PATH = os.getenv(
+    "SLACK_MESSAGE_STORE_PATH",
+    os.path.join(os.path.expanduser("~"), ".symone", "slack_messages.db")
+)
+
+# Secrets vault (per-server tokens for multi-tenant use)
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+SYMONE_SECRETS_KEY = os.getenv("SYMONE_SECRETS_KEY")
+SLACK_CLIENT_POOL_SIZE = int(os.getenv("SLACK_CLIENT_POOL_SIZE", "256"))
+SLACK_CLIENT_IDLE_SECONDS = int(os.getenv("SLACK_CLIENT_IDLE_SECONDS", "900"))
+
+# Caller identity for server_id: the gateway authenticates the API key and
+# forwards the team in X-Symone-Team alongside X-Symone-Gateway-Key; a
+# single-team deployment (e.g. stdio) can pin the team with SYMONE_TEAM_ID
+SYMONE_GATEWAY_KEY = os.getenv("SYMONE_GATEWAY_KEY")
+SYMONE_TEAM_ID = os.getenv("SYMONE_TEAM_ID")
 
-if not SLACK_BOT_TOKEN:
-    raise ValueError("SLACK_BOT_TOKEN not found in .env")
+vault = None
+if SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY and SYMONE_SECRETS_KEY:
+    vault = SecretsVault(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, SYMONE_SECRETS_KEY)
+
+if not SLACK_BOT_TOKEN and not vault:
+    raise ValueError("SLACK_BOT_TOKEN not found in .env (or configure the secrets vault)")
+
+def caller_team():
+    """Returns the team the current MCP request is authenticated as, if any."""
+    try:
+        request = request_ctx.get().request
+    except LookupError:
+        request = None
+    headers = getattr(request, "headers", None)
+    if headers is not None and SYMONE_GATEWAY_KEY and headers.get("x-symone-team"):
+        if hmac.compare_digest(headers.get("x-symone-gateway-key", ""), SYMONE_GATEWAY_KEY):
+            return headers["x-symone-team"]
+        return None
+    return SYMONE_TEAM_ID
+
+client_pool = SlackClientPool(
+    vault,
+    max_size=SLACK_CLIENT_POOL_SIZE,
+    idle_seconds=SLACK_CLIENT_IDLE_SECONDS,
+    on_evict=drop_limiters,
+    caller_team=caller_team
+)
 
-slack_client = WebClient(token=SLACK_BOT_TOKEN)
+# Default tenant from environment tokens (user token enables admin operations)
+if SLACK_BOT_TOKEN:
+    client_pool.default = SlackTenant("default", SLACK_BOT_TOKEN, SLACK_USER_TOKEN, client_pool.ssl_context)
 
-# User token client (for admin operations)
-user_client = None
-if SLACK_USER_TOKEN:
-    user_client = WebClient(token=SLACK_USER_TOKEN)
+# Local message store for incremental history/thread sync
+message_store = MessageStore(SLACK_MESSAGE_STORE_PATH)
 
 # Initialize MCP Server
 mcp = FastMCP("Symone Slack Server - Comprehensive Edition")
@@ -65,7 +132,8 @@ mcp = FastMCP("Symone Slack Server - Comprehensive Edition")
 def post_message(params: SlackMessageSchema) -> str:
     """Posts a message to the specified Slack channel."""
     try:
-        response = slack_client.chat_postMessage(
+        tenant = client_pool.get(params.server_id)
+        response = tenant.bot.chat_postMessage(
             channel=params.channel_id,
             text=params.text,
             thread_ts=params.thread_ts
@@ -73,6 +141,57 @@ def post_message(params: SlackMessageSchema) -> str:
         return json.dumps({"success": True, "ts": response['ts'], "channel": response['channel']})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
+
+# Shared across bulk calls so concurrent tool invocations respect one budget
+channel_post_interval = KeyedInterval(POST_MESSAGE_PER_CHANNEL_INTERVAL)
+
+@mcp.tool(
+    name="slack_post_messages_bulk",
+    description="Post many messages concurrently within Slack rate limits; failed items are returned for retry",
+    annotations={
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": True,
+    }
+)
+async def post_messages_bulk(params: SlackPostMessagesBulkSchema) -> str:
+    """Posts a batch of messages, fanning out under the chat.postMessage rate limit."""
+    try:
+        tenant = client_pool.get(params.server_id)
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    limiter = limiter_for("chat.postMessage", POST_MESSAGE_PER_MINUTE, scope=tenant.key)
+
+    def post(indexed):
+        index, item = indexed
+        channel_post_interval.acquire(f"{tenant.key}:{item.channel_id}")
+        try:
+            response = call_with_retry(
+                lambda: tenant.bot.chat_postMessage(
+                    channel=item.channel_id,
+                    text=item.text,
+                    thread_ts=item.thread_ts
+                ),
+                limiter=limiter,
+                max_retries=params.max_retries
+            )
+            return {"index": index, "success": True, "ts": response['ts'], "channel": response['channel']}
+        except SlackApiError as e:
+            return {"index": index, "success": False, "channel": item.channel_id, "error": e.response['error']}
+
+    # Rate-limit waits block, so the fan-out runs off the event loop
+    results = await asyncio.to_thread(run_concurrently, post, list(enumerate(params.messages)), params.max_concurrency)
+    failed = [params.messages[r['index']].model_dump() for r in results if not r['success']]
+    return json.dumps({
+        "success": not failed,
+        "sent": len(results) - len(failed),
+        "failed": len(failed),
+        "results": results,
+        "failed_messages": failed
+    })
 
 @mcp.tool(
     name="slack_update_message",
@@ -87,7 +206,8 @@ def post_message(params: SlackMessageSchema) -> str:
 def update_message(params: SlackUpdateMessageSchema) -> str:
     """Updates an existing message."""
     try:
-        response = slack_client.chat_update(
+        tenant = client_pool.get(params.server_id)
+        response = tenant.bot.chat_update(
             channel=params.channel_id,
             ts=params.timestamp,
             text=params.text
@@ -95,6 +215,8 @@ def update_message(params: SlackUpdateMessageSchema) -> str:
         return json.dumps({"success": True, "ts": response['ts']})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
 
 @mcp.tool(
     name="slack_delete_message",
@@ -109,13 +231,16 @@ def update_message(params: SlackUpdateMessageSchema) -> str:
 def delete_message(params: SlackDeleteMessageSchema) -> str:
     """Deletes a message."""
     try:
-        slack_client.chat_delete(
+        tenant = client_pool.get(params.server_id)
+        tenant.bot.chat_delete(
             channel=params.channel_id,
             ts=params.timestamp
         )
         return json.dumps({"success": True})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
 
 # ============================================================================
 # CHANNEL TOOLS
@@ -134,15 +259,21 @@ def delete_message(params: SlackDeleteMessageSchema) -> str:
 def list_channels(params: SlackListChannelsSchema) -> str:
     """Lists public channels in the workspace."""
     try:
-        response = slack_client.conversations_list(
+        tenant = client_pool.get(params.server_id)
+        response = tenant.bot.conversations_list(
             limit=params.limit,
             types="public_channel"
         )
-        channels = [{"id": c['id'], "name": c['name'], "topic": c.get('topic', {}).get('value', '')} 
-                   for c in response["channels"]]
+        if params.fields:
+            channels = project(response["channels"], params.fields)
+        else:
+            channels = [{"id": c['id'], "name": c['name'], "topic": c.get('topic', {}).get('value', '')} 
+                       for c in response["channels"]]
         return json.dumps({"success": True, "channels": channels})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
 
 @mcp.tool(
     name="slack_create_channel",
@@ -157,13 +288,16 @@ def list_channels(params: SlackListChannelsSchema) -> str:
 def create_channel(params: SlackCreateChannelSchema) -> str:
     """Creates a new channel."""
     try:
-        response = slack_client.conversations_create(
+        tenant = client_pool.get(params.server_id)
+        response = tenant.bot.conversations_create(
             name=params.name,
             is_private=params.is_private
         )
         return json.dumps({"success": True, "channel_id": response['channel']['id']})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
 
 @mcp.tool(
     name="slack_invite_to_channel",
@@ -178,13 +312,100 @@ def create_channel(params: SlackCreateChannelSchema) -> str:
 def invite_to_channel(params: SlackInviteToChannelSchema) -> str:
     """Invites users to a channel."""
     try:
-        response = slack_client.conversations_invite(
+        tenant = client_pool.get(params.server_id)
+        response = tenant.bot.conversations_invite(
             channel=params.channel_id,
             users=",".join(params.user_ids)
         )
         return json.dumps({"success": True})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
+
+def _channel_members(tenant: SlackTenant, channel_id: str) -> set:
+    """Returns every member ID of a channel, following pagination."""
+    limiter = limiter_for("conversations.members", TIER_PER_MINUTE[4], scope=tenant.key)
+    members, cursor = set(), None
+    while True:
+        response = call_with_retry(
+            lambda: tenant.bot.conversations_members(channel=channel_id, limit=1000, cursor=cursor),
+            limiter=limiter
+        )
+        members.update(response['members'])
+        cursor = response.get('response_metadata', {}).get('next_cursor')
+        if not cursor:
+            return members
+
+@mcp.tool(
+    name="slack_invite_to_channels_bulk",
+    description="Invite many users into many channels, chunked to Slack's per-call limit and run in parallel",
+    annotations={
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def invite_to_channels_bulk(params: SlackBulkInviteSchema) -> str:
+    """Invites users across channels, skipping existing members, and aggregates a report."""
+    try:
+        tenant = client_pool.get(params.server_id)
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    user_ids = list(dict.fromkeys(params.user_ids))
+    report = {channel_id: {"channel_id": channel_id, "invited": 0, "skipped": 0, "errors": []}
+              for channel_id in dict.fromkeys(params.channel_ids)}
+
+    def pending_users(channel_id):
+        if not params.skip_existing_members:
+            return channel_id, user_ids, None
+        try:
+            members = _channel_members(tenant, channel_id)
+        except SlackApiError as e:
+            return channel_id, [], e.response['error']
+        return channel_id, [u for u in user_ids if u not in members], None
+
+    # Rate-limit waits block, so both fan-outs run off the event loop
+    chunks = []
+    members = await asyncio.to_thread(run_concurrently, pending_users, list(report), params.max_concurrency)
+    for channel_id, pending, error in members:
+        entry = report[channel_id]
+        if error:
+            entry["errors"].append({"users": user_ids, "error": error})
+            continue
+        entry["skipped"] = len(user_ids) - len(pending)
+        chunks.extend((channel_id, pending[i:i + params.chunk_size])
+                      for i in range(0, len(pending), params.chunk_size))
+
+    limiter = limiter_for("conversations.invite", TIER_PER_MINUTE[3], scope=tenant.key)
+
+    def invite(chunk):
+        channel_id, users = chunk
+        try:
+            call_with_retry(
+                lambda: tenant.bot.conversations_invite(channel=channel_id, users=",".join(users), force=True),
+                limiter=limiter
+            )
+            return {"channel_id": channel_id, "users": users, "error": None}
+        except SlackApiError as e:
+            return {"channel_id": channel_id, "users": users, "error": e.response['error']}
+
+    for result in await asyncio.to_thread(run_concurrently, invite, chunks, params.max_concurrency):
+        entry = report[result["channel_id"]]
+        if result["error"]:
+            entry["errors"].append({"users": result["users"], "error": result["error"]})
+        else:
+            entry["invited"] += len(result["users"])
+
+    channels = list(report.values())
+    return json.dumps({
+        "success": not any(c["errors"] for c in channels),
+        "invited": sum(c["invited"] for c in channels),
+        "skipped": sum(c["skipped"] for c in channels),
+        "failed_channels": sum(1 for c in channels if c["errors"]),
+        "channels": channels
+    })
 
 @mcp.tool(
     name="slack_get_channel_history",
@@ -197,17 +418,19 @@ def invite_to_channel(params: SlackInviteToChannelSchema) -> str:
     }
 )
 def get_channel_history(params: SlackGetChannelHistorySchema) -> str:
-    """Gets channel message history."""
+    """Gets channel message history from the local store, fetching only new messages from Slack."""
     try:
-        response = slack_client.conversations_history(
-            channel=params.channel_id,
-            limit=params.limit
-        )
+        tenant = client_pool.get(params.server_id)
+        team_id = tenant.team_id
+        fetched = sync_channel_history(message_store, tenant.bot, team_id, params.channel_id,
+                                       params.limit, params.max_staleness_seconds, params.revalidate_seconds)
         messages = [{"user": m.get('user'), "text": m.get('text'), "ts": m['ts']} 
-                   for m in response['messages']]
-        return json.dumps({"success": True, "messages": messages})
+                   for m in message_store.history(team_id, params.channel_id, params.limit)]
+        return json.dumps({"success": True, "messages": messages, "fetched": fetched})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
 
 @mcp.tool(
     name="slack_set_channel_topic",
@@ -222,13 +445,16 @@ def get_channel_history(params: SlackGetChannelHistorySchema) -> str:
 def set_channel_topic(params: SlackSetChannelTopicSchema) -> str:
     """Sets channel topic."""
     try:
-        response = slack_client.conversations_setTopic(
+        tenant = client_pool.get(params.server_id)
+        response = tenant.bot.conversations_setTopic(
             channel=params.channel_id,
             topic=params.topic
         )
         return json.dumps({"success": True})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
 
 # ============================================================================
 # REACTION TOOLS
@@ -247,7 +473,8 @@ def set_channel_topic(params: SlackSetChannelTopicSchema) -> str:
 def add_reaction(params: SlackAddReactionSchema) -> str:
     """Adds a reaction to a message."""
     try:
-        slack_client.reactions_add(
+        tenant = client_pool.get(params.server_id)
+        tenant.bot.reactions_add(
             channel=params.channel_id,
             timestamp=params.timestamp,
             name=params.reaction
@@ -255,6 +482,8 @@ def add_reaction(params: SlackAddReactionSchema) -> str:
         return json.dumps({"success": True})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
 
 # ============================================================================
 # FILE TOOLS
@@ -273,7 +502,8 @@ def add_reaction(params: SlackAddReactionSchema) -> str:
 def upload_file(params: SlackUploadFileSchema) -> str:
     """Uploads a file to Slack."""
     try:
-        response = slack_client.files_upload_v2(
+        tenant = client_pool.get(params.server_id)
+        response = tenant.bot.files_upload_v2(
             channel=params.channel_id,
             file=params.file_path,
             title=params.title,
@@ -282,6 +512,65 @@ def upload_file(params: SlackUploadFileSchema) -> str:
         return json.dumps({"success": True, "file_id": response['file']['id']})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
+
+# Pooled HTTP client for streaming bodies to Slack's external upload URLs
+upload_http = httpx.Client(timeout=httpx.Timeout(60.0, connect=10.0))
+
+@mcp.tool(
+    name="slack_upload_files",
+    description="Upload several files concurrently, streaming each from disk, with per-file throughput",
+    annotations={
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": True,
+    }
+)
+async def upload_files(params: SlackUploadFilesSchema, ctx: Context) -> str:
+    """Uploads files in parallel without loading them into memory, reporting byte progress."""
+    try:
+        tenant = client_pool.get(params.server_id)
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    limiter = limiter_for("files.uploadExternal", TIER_PER_MINUTE[4], scope=tenant.key)
+    progress = UploadProgress()
+    semaphore = asyncio.Semaphore(params.max_concurrency)
+
+    def upload(index, item):
+        progress.start(index, os.path.getsize(item.file_path))
+        return stream_upload(
+            tenant.bot, upload_http, item.file_path, item.channel_id,
+            title=item.title, initial_comment=item.initial_comment,
+            on_chunk=lambda n: progress.advance(index, n),
+            call=lambda fn: call_with_retry(fn, limiter=limiter)
+        )
+
+    async def run(index, item):
+        async with semaphore:
+            try:
+                result = await asyncio.to_thread(upload, index, item)
+                return {"index": index, "success": True, "file_path": item.file_path, **result}
+            except SlackApiError as e:
+                return {"index": index, "success": False, "file_path": item.file_path, "error": e.response['error']}
+            except (OSError, httpx.HTTPError) as e:
+                return {"index": index, "success": False, "file_path": item.file_path, "error": str(e)}
+
+    tasks = asyncio.gather(*(run(i, item) for i, item in enumerate(params.files)))
+    while not tasks.done():
+        await asyncio.wait([tasks], timeout=0.5)
+        snapshot = progress.snapshot()
+        await ctx.report_progress(snapshot["sent"], snapshot["total"] or None)
+    results = tasks.result()
+    failed = sum(1 for r in results if not r['success'])
+    return json.dumps({
+        "success": not failed,
+        "uploaded": len(results) - failed,
+        "failed": failed,
+        "bytes": sum(r.get('bytes', 0) for r in results),
+        "results": results
+    })
 
 # ============================================================================
 # USER TOOLS
@@ -300,8 +589,11 @@ def upload_file(params: SlackUploadFileSchema) -> str:
 def get_user(params: SlackGetUserSchema) -> str:
     """Gets user information."""
     try:
-        response = slack_client.users_info(user=params.user_id)
+        tenant = client_pool.get(params.server_id)
+        response = tenant.bot.users_info(user=params.user_id)
         user = response['user']
+        if params.fields:
+            return json.dumps({"success": True, "user": project(user, params.fields)})
         return json.dumps({
             "success": True,
             "user": {
@@ -314,6 +606,8 @@ def get_user(params: SlackGetUserSchema) -> str:
         })
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
 
 # ============================================================================
 # SEARCH TOOLS
@@ -330,17 +624,83 @@ def get_user(params: SlackGetUserSchema) -> str:
     }
 )
 def search_messages(params: SlackSearchMessagesSchema) -> str:
-    """Searches messages."""
+    """Searches messages in the local index where channels are synced, falling back to Slack search."""
     try:
-        response = slack_client.search_messages(
-            query=params.query,
-            count=params.count
-        )
-        matches = [{"text": m['text'], "user": m.get('user'), "ts": m['ts']} 
-                  for m in response['messages']['matches']]
-        return json.dumps({"success": True, "matches": matches})
+        tenant = client_pool.get(params.server_id)
+        team_id = tenant.team_id
+        # Slack search covers the explicit channels not synced locally, or the
+        # whole workspace minus synced channels when none are given
+        local_channels, remote_channels, excluded = [], params.channel_ids, []
+        remote = params.source != "local"
+        if params.source != "slack" and message_store.fts_enabled:
+            synced = set(message_store.synced_channels(team_id))
+            if params.channel_ids:
+                local_channels = [c for c in params.channel_ids if c in synced]
+                remote_channels = [c for c in params.channel_ids if c not in synced]
+                remote = remote and bool(remote_channels)
+            else:
+                local_channels = excluded = sorted(synced)
+
+        local_matches, remote_matches = [], []
+        if local_channels:
+            local_matches = message_store.search(team_id, params.query, params.count, local_channels,
+                                                 params.user_ids, params.after, params.before)
+        if remote:
+            remote_matches = _search_slack(tenant, params, remote_channels, excluded)
+        # Ranks from the two indexes are not comparable, so take the best of
+        # each in turn; either side fills the budget the other leaves unused
+        matches = [m for m in chain.from_iterable(zip_longest(local_matches, remote_matches)) if m]
+        return json.dumps({
+            "success": True,
+            "matches": matches[:params.count],
+            "local_channels": local_channels,
+            "slack_search": remote,
+            "remote_channels": (remote_channels or []) if remote else [],
+            "excluded_channels": excluded if remote else []
+        })
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
+
+def _search_slack(tenant: SlackTenant, params: SlackSearchMessagesSchema,
+                  channel_ids=None, exclude_channel_ids=None) -> list:
+    """Runs one search.messages call limited to channel_ids (all channels if empty) minus exclude_channel_ids.
+
+    Channel, user and time filters become query modifiers and are also
+    applied to the results, since Slack's modifiers are not a guarantee and
+    after:/before: only take whole days.
+    """
+    modifiers = ([f"in:<#{c}>" for c in channel_ids or []]
+                 + [f"-in:<#{c}>" for c in exclude_channel_ids or []]
+                 + [f"from:<@{u}>" for u in params.user_ids or []])
+    # after:/before: exclude the named day and follow the user's time zone, so
+    # leave a day's margin on each side
+    if params.after:
+        modifiers.append(f"after:{_slack_date(params.after, -2)}")
+    if params.before:
+        modifiers.append(f"before:{_slack_date(params.before, 2)}")
+    query = " ".join([params.query] + modifiers)
+    response = (tenant.user or tenant.bot).search_messages(query=query, count=params.count)
+    matches = []
+    for m in response['messages']['matches']:
+        channel_id = m.get('channel', {}).get('id')
+        if channel_ids and channel_id not in channel_ids:
+            continue
+        if exclude_channel_ids and channel_id in exclude_channel_ids:
+            continue
+        if params.user_ids and m.get('user') not in params.user_ids:
+            continue
+        if params.after and float(m['ts']) < float(params.after):
+            continue
+        if params.before and float(m['ts']) >= float(params.before):
+            continue
+        matches.append({"text": m['text'], "user": m.get('user'), "ts": m['ts'], "channel": channel_id})
+    return matches
+
+def _slack_date(ts: str, days: int) -> str:
+    """Formats a message timestamp's UTC date, shifted by days, for after:/before: modifiers."""
+    return (datetime.fromtimestamp(float(ts), timezone.utc) + timedelta(days=days)).strftime("%Y-%m-%d")
 
 # ============================================================================
 # THREAD TOOLS
@@ -357,17 +717,60 @@ def search_messages(params: SlackSearchMessagesSchema) -> str:
     }
 )
 def get_thread_replies(params: SlackGetThreadRepliesSchema) -> str:
-    """Gets thread replies."""
+    """Gets thread replies from the local store, fetching only new replies from Slack."""
     try:
-        response = slack_client.conversations_replies(
-            channel=params.channel_id,
-            ts=params.thread_ts
-        )
+        tenant = client_pool.get(params.server_id)
+        team_id = tenant.team_id
+        fetched = sync_thread(message_store, tenant.bot, team_id, params.channel_id,
+                              params.thread_ts, params.max_staleness_seconds, params.revalidate_seconds)
         replies = [{"user": m.get('user'), "text": m.get('text'), "ts": m['ts']} 
-                  for m in response['messages']]
-        return json.dumps({"success": True, "replies": replies})
+                  for m in message_store.thread(team_id, params.channel_id, params.thread_ts)]
+        return json.dumps({"success": True, "replies": replies, "fetched": fetched})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
+
+@mcp.tool(
+    name="slack_get_threads_bulk",
+    description="Get replies for many threads in one call, fetched concurrently and deduplicated",
+    annotations={
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def get_threads_bulk(params: SlackGetThreadsBulkSchema) -> str:
+    """Gets replies for a list of threads, keyed by "channel_id:thread_ts"."""
+    try:
+        tenant = client_pool.get(params.server_id)
+        team_id = tenant.team_id
+    except SlackApiError as e:
+        return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    limiter = limiter_for("conversations.replies", TIER_PER_MINUTE[3], scope=tenant.key)
+    threads = list(dict.fromkeys((t.channel_id, t.thread_ts) for t in params.threads))
+
+    def fetch(thread):
+        channel_id, thread_ts = thread
+        try:
+            fetched = sync_thread(message_store, tenant.bot, team_id, channel_id, thread_ts,
+                                  params.max_staleness_seconds, params.revalidate_seconds,
+                                  call=lambda fn: call_with_retry(fn, limiter=limiter))
+            replies = [{"user": m.get('user'), "text": m.get('text'), "ts": m['ts']}
+                      for m in message_store.thread(team_id, channel_id, thread_ts)]
+            return {"success": True, "replies": replies, "fetched": fetched}
+        except SlackApiError as e:
+            return {"success": False, "error": e.response['error']}
+
+    # Rate-limit waits block, so the fan-out runs off the event loop
+    results = await asyncio.to_thread(run_concurrently, fetch, threads, params.max_concurrency)
+    return json.dumps({
+        "success": all(r["success"] for r in results),
+        "threads": {f"{c}:{ts}": r for (c, ts), r in zip(threads, results)}
+    })
 
 # ============================================================================
 # ADMIN TOOLS (User Token Required)
@@ -385,16 +788,22 @@ def get_thread_replies(params: SlackGetThreadRepliesSchema) -> str:
 )
 def list_workspace_users(params: SlackListWorkspaceUsersSchema) -> str:
     """Lists all workspace users (requires user token + admin)."""
-    if not user_client:
-        return json.dumps({"success": False, "error": "SLACK_USER_TOKEN not configured"})
     try:
-        response = user_client.users_list(limit=params.limit)
-        users = [{"id": u['id'], "name": u['name'], "real_name": u.get('real_name'), 
-                 "is_admin": u.get('is_admin', False), "is_bot": u.get('is_bot', False)} 
-                for u in response['members']]
+        tenant = client_pool.get(params.server_id)
+        if not tenant.user:
+            return json.dumps({"success": False, "error": "SLACK_USER_TOKEN not configured"})
+        response = tenant.user.users_list(limit=params.limit)
+        if params.fields:
+            users = project(response['members'], params.fields)
+        else:
+            users = [{"id": u['id'], "name": u['name'], "real_name": u.get('real_name'), 
+                     "is_admin": u.get('is_admin', False), "is_bot": u.get('is_bot', False)} 
+                    for u in response['members']]
         return json.dumps({"success": True, "users": users})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
 
 @mcp.tool(
     name="slack_set_user_admin",
@@ -408,22 +817,25 @@ def list_workspace_users(params: SlackListWorkspaceUsersSchema) -> str:
 )
 def set_user_admin(params: SlackSetUserAdminSchema) -> str:
     """Sets user admin status (requires user token + admin)."""
-    if not user_client:
-        return json.dumps({"success": False, "error": "SLACK_USER_TOKEN not configured"})
     try:
+        tenant = client_pool.get(params.server_id)
+        if not tenant.user:
+            return json.dumps({"success": False, "error": "SLACK_USER_TOKEN not configured"})
         if params.is_admin:
-            response = user_client.admin_users_setAdmin(
-                team_id=user_client.auth_test()['team_id'],
+            response = tenant.user.admin_users_setAdmin(
+                team_id=tenant.user.auth_test()['team_id'],
                 user_id=params.user_id
             )
         else:
-            response = user_client.admin_users_setRegular(
-                team_id=user_client.auth_test()['team_id'],
+            response = tenant.user.admin_users_setRegular(
+                team_id=tenant.user.auth_test()['team_id'],
                 user_id=params.user_id
             )
         return json.dumps({"success": True})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
 
 @mcp.tool(
     name="slack_deactivate_user",
@@ -437,17 +849,20 @@ def set_user_admin(params: SlackSetUserAdminSchema) -> str:
 )
 def deactivate_user(params: SlackDeactivateUserSchema) -> str:
     """Deactivates a user (requires user token + admin)."""
-    if not user_client:
-        return json.dumps({"success": False, "error": "SLACK_USER_TOKEN not configured"})
     try:
-        team_id = user_client.auth_test()['team_id']
-        response = user_client.admin_users_remove(
+        tenant = client_pool.get(params.server_id)
+        if not tenant.user:
+            return json.dumps({"success": False, "error": "SLACK_USER_TOKEN not configured"})
+        team_id = tenant.user.auth_test()['team_id']
+        response = tenant.user.admin_users_remove(
             team_id=team_id,
             user_id=params.user_id
         )
         return json.dumps({"success": True})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
 
 @mcp.tool(
     name="slack_archive_channel",
@@ -461,15 +876,18 @@ def deactivate_user(params: SlackDeactivateUserSchema) -> str:
 )
 def archive_channel(params: SlackArchiveChannelSchema) -> str:
     """Archives a channel (requires user token + admin)."""
-    if not user_client:
-        return json.dumps({"success": False, "error": "SLACK_USER_TOKEN not configured"})
     try:
-        response = user_client.admin_conversations_archive(
+        tenant = client_pool.get(params.server_id)
+        if not tenant.user:
+            return json.dumps({"success": False, "error": "SLACK_USER_TOKEN not configured"})
+        response = tenant.user.admin_conversations_archive(
             channel_id=params.channel_id
         )
         return json.dumps({"success": True})
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
 
 @mcp.tool(
     name="slack_get_workspace_info",
@@ -483,10 +901,11 @@ def archive_channel(params: SlackArchiveChannelSchema) -> str:
 )
 def get_workspace_info(params: SlackGetWorkspaceInfoSchema) -> str:
     """Gets workspace info."""
-    if not user_client:
-        return json.dumps({"success": False, "error": "SLACK_USER_TOKEN not configured"})
     try:
-        response = user_client.team_info()
+        tenant = client_pool.get(params.server_id)
+        if not tenant.user:
+            return json.dumps({"success": False, "error": "SLACK_USER_TOKEN not configured"})
+        response = tenant.user.team_info()
         team = response['team']
         return json.dumps({
             "success": True,
@@ -499,6 +918,8 @@ def get_workspace_info(params: SlackGetWorkspaceInfoSchema) -> str:
         })
     except SlackApiError as e:
         return json.dumps({"success": False, "error": e.response['error']})
+    except TenantError as e:
+        return json.dumps({"success": False, "error": str(e)})
 
 if __name__ == "__main__":
     mcp.run()
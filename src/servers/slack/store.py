@@ -0,0 +1,368 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS messages (
+    team_id TEXT NOT NULL,
+    channel_id TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    thread_ts TEXT,
+    user TEXT,
+    text TEXT,
+    raw TEXT NOT NULL,
+    PRIMARY KEY (team_id, channel_id, ts)
+);
+
+CREATE INDEX IF NOT EXISTS idx_messages_thread ON messages(team_id, channel_id, thread_ts, ts);
+
+-- Contiguous range of top-level history synced per channel
+CREATE TABLE IF NOT EXISTS channel_sync (
+    team_id TEXT NOT NULL,
+    channel_id TEXT NOT NULL,
+    oldest_ts TEXT NOT NULL,
+    latest_ts TEXT NOT NULL,
+    complete INTEGER NOT NULL DEFAULT 0,
+    synced_at REAL NOT NULL,
+    revalidated_at REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (team_id, channel_id)
+);
+
+CREATE TABLE IF NOT EXISTS thread_sync (
+    team_id TEXT NOT NULL,
+    channel_id TEXT NOT NULL,
+    thread_ts TEXT NOT NULL,
+    latest_ts TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    revalidated_at REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (team_id, channel_id, thread_ts)
+);
+"""
+
+
+# External-content FTS5 index over messages.text, kept in step by triggers
+FTS_SCHEMA_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    text, content='messages', content_rowid='rowid', tokenize='unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, text) VALUES (new.rowid, new.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+    INSERT INTO messages_fts(rowid, text) VALUES (new.rowid, new.text);
+END;
+"""
+
+# Rows conversations.history returns: top-level messages, thread parents and
+# replies also sent to the channel
+TOP_LEVEL_SQL = "(thread_ts IS NULL OR thread_ts = ts OR json_extract(raw, '$.subtype') = 'thread_broadcast')"
+
+_FTS_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def fts_query(query: str) -> str:
+    """Translates a user query into safe FTS5 syntax.
+
+    "quoted text" becomes a phrase, a trailing * makes a prefix term, and
+    everything else is matched as a literal term (all terms ANDed).
+    """
+    terms = []
+    for phrase, word in _FTS_TOKEN.findall(query):
+        if phrase:
+            terms.append('"' + phrase.replace('"', '') + '"')
+        elif word.endswith('*') and len(word) > 1:
+            terms.append('"' + word[:-1].replace('"', '') + '"*')
+        else:
+            terms.append('"' + word.replace('"', '') + '"')
+    return " ".join(t for t in terms if t not in ('""', '""*'))
+
+
+def _ts_key(ts: str) -> float:
+    return float(ts)
+
+
+class MessageStore:
+    """SQLite-backed cache of Slack messages, synced incrementally by ts watermarks."""
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA_SQL)
+            for table in ("channel_sync", "thread_sync"):
+                self._add_column(table, "revalidated_at REAL NOT NULL DEFAULT 0")
+            self.fts_enabled = self._init_fts()
+
+    def _add_column(self, table: str, definition: str) -> None:
+        """Adds a column to a table created by an older version of the schema."""
+        column = definition.split()[0]
+        if column not in [r['name'] for r in self.conn.execute(f"PRAGMA table_info({table})")]:
+            self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {definition}")
+
+    def _init_fts(self) -> bool:
+        """Creates the full-text index if this SQLite build has FTS5, backfilling existing rows."""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'messages_fts'"
+        ).fetchone()
+        try:
+            self.conn.executescript(FTS_SCHEMA_SQL)
+        except sqlite3.OperationalError:
+            return False
+        if not exists:
+            with self.conn:
+                self.conn.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+        return True
+
+    def save_messages(self, team_id: str, channel_id: str, messages: List[Dict[str, Any]]) -> None:
+        """Upserts raw Slack message objects."""
+        with self.lock, self.conn:
+            self._upsert(team_id, channel_id, messages)
+
+    def replace_history(self, team_id: str, channel_id: str, oldest_ts: str,
+                        messages: List[Dict[str, Any]]) -> int:
+        """Replaces stored channel-level messages from oldest_ts on with a fresh listing.
+
+        Stored messages in that range that Slack no longer returns were
+        deleted and are dropped. Returns how many were dropped.
+        """
+        fetched = {m['ts'] for m in messages}
+        with self.lock, self.conn:
+            stale = [r['ts'] for r in self.conn.execute(
+                f"SELECT ts FROM messages WHERE team_id = ? AND channel_id = ? AND {TOP_LEVEL_SQL} "
+                "AND CAST(ts AS REAL) >= ?",
+                (team_id, channel_id, _ts_key(oldest_ts))
+            ) if r['ts'] not in fetched]
+            self.conn.executemany(
+                "DELETE FROM messages WHERE team_id = ? AND channel_id = ? AND ts = ?",
+                [(team_id, channel_id, ts) for ts in stale]
+            )
+            self._upsert(team_id, channel_id, messages)
+        return len(stale)
+
+    def replace_thread(self, team_id: str, channel_id: str, thread_ts: str,
+                       messages: List[Dict[str, Any]]) -> int:
+        """Replaces a thread's stored messages with a fresh listing, dropping deleted ones.
+
+        Returns how many were dropped.
+        """
+        fetched = {m['ts'] for m in messages}
+        with self.lock, self.conn:
+            stale = [r['ts'] for r in self.conn.execute(
+                "SELECT ts FROM messages WHERE team_id = ? AND channel_id = ? AND (ts = ? OR thread_ts = ?)",
+                (team_id, channel_id, thread_ts, thread_ts)
+            ) if r['ts'] not in fetched]
+            self.conn.executemany(
+                "DELETE FROM messages WHERE team_id = ? AND channel_id = ? AND ts = ?",
+                [(team_id, channel_id, ts) for ts in stale]
+            )
+            self._upsert(team_id, channel_id, messages)
+        return len(stale)
+
+    def _upsert(self, team_id: str, channel_id: str, messages: List[Dict[str, Any]]) -> None:
+        rows = [(team_id, channel_id, m['ts'], m.get('thread_ts'), m.get('user'), m.get('text'), json.dumps(m))
+                for m in messages]
+        self.conn.executemany(
+                "INSERT INTO messages (team_id, channel_id, ts, thread_ts, user, text, raw) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (team_id, channel_id, ts) DO UPDATE SET "
+                "thread_ts = excluded.thread_ts, user = excluded.user, text = excluded.text, raw = excluded.raw",
+                rows
+            )
+
+    def history(self, team_id: str, channel_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Returns the newest channel-level messages (including thread parents and broadcast replies), newest first."""
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT raw FROM messages WHERE team_id = ? AND channel_id = ? AND {TOP_LEVEL_SQL} "
+                "ORDER BY CAST(ts AS REAL) DESC LIMIT ?",
+                (team_id, channel_id, limit)
+            ).fetchall()
+        return [json.loads(r['raw']) for r in rows]
+
+    def thread(self, team_id: str, channel_id: str, thread_ts: str) -> List[Dict[str, Any]]:
+        """Returns a thread's parent and replies, oldest first."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT raw FROM messages WHERE team_id = ? AND channel_id = ? "
+                "AND (ts = ? OR thread_ts = ?) ORDER BY CAST(ts AS REAL)",
+                (team_id, channel_id, thread_ts, thread_ts)
+            ).fetchall()
+        return [json.loads(r['raw']) for r in rows]
+
+    def synced_channels(self, team_id: str) -> List[str]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT channel_id FROM channel_sync WHERE team_id = ?", (team_id,)
+            ).fetchall()
+        return [r['channel_id'] for r in rows]
+
+    def search(self, team_id: str, query: str, limit: int, channel_ids: Optional[List[str]] = None,
+               user_ids: Optional[List[str]] = None, after: Optional[str] = None,
+               before: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Full-text search over stored messages, best matches first."""
+        match = fts_query(query)
+        if not match:
+            return []
+        sql = ("SELECT m.channel_id, m.ts, m.user, m.text FROM messages_fts "
+               "JOIN messages m ON m.rowid = messages_fts.rowid "
+               "WHERE messages_fts MATCH ? AND m.team_id = ?")
+        args: List[Any] = [match, team_id]
+        if channel_ids:
+            sql += " AND m.channel_id IN (%s)" % ",".join("?" * len(channel_ids))
+            args.extend(channel_ids)
+        if user_ids:
+            sql += " AND m.user IN (%s)" % ",".join("?" * len(user_ids))
+            args.extend(user_ids)
+        if after:
+            sql += " AND CAST(m.ts AS REAL) >= ?"
+            args.append(float(after))
+        if before:
+            sql += " AND CAST(m.ts AS REAL) < ?"
+            args.append(float(before))
+        sql += " ORDER BY messages_fts.rank LIMIT ?"
+        args.append(limit)
+        with self.lock:
+            rows = self.conn.execute(sql, args).fetchall()
+        return [{"text": r['text'], "user": r['user'], "ts": r['ts'], "channel": r['channel_id']} for r in rows]
+
+    def channel_state(self, team_id: str, channel_id: str) -> Optional[sqlite3.Row]:
+        with self.lock:
+            return self.conn.execute(
+                "SELECT * FROM channel_sync WHERE team_id = ? AND channel_id = ?",
+                (team_id, channel_id)
+            ).fetchone()
+
+    def set_channel_state(self, team_id: str, channel_id: str, oldest_ts: str, latest_ts: str, complete: bool,
+                          revalidated_at: float) -> None:
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO channel_sync "
+                "(team_id, channel_id, oldest_ts, latest_ts, complete, synced_at, revalidated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (team_id, channel_id, oldest_ts, latest_ts, int(complete), time.time(), revalidated_at)
+            )
+
+    def thread_state(self, team_id: str, channel_id: str, thread_ts: str) -> Optional[sqlite3.Row]:
+        with self.lock:
+            return self.conn.execute(
+                "SELECT * FROM thread_sync WHERE team_id = ? AND channel_id = ? AND thread_ts = ?",
+                (team_id, channel_id, thread_ts)
+            ).fetchone()
+
+    def set_thread_state(self, team_id: str, channel_id: str, thread_ts: str, latest_ts: str,
+                         revalidated_at: float) -> None:
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO thread_sync "
+                "(team_id, channel_id, thread_ts, latest_ts, synced_at, revalidated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (team_id, channel_id, thread_ts, latest_ts, time.time(), revalidated_at)
+            )
+
+
+def _fetch_pages(method, call=lambda fn: fn(), **kwargs) -> List[Dict[str, Any]]:
+    """Follows next_cursor until Slack reports no more results."""
+    messages, cursor = [], None
+    while True:
+        response = call(lambda: method(cursor=cursor, **kwargs))
+        messages.extend(response['messages'])
+        cursor = response.get('response_metadata', {}).get('next_cursor')
+        if not response.get('has_more') or not cursor:
+            return messages
+
+
+def sync_channel_history(store: MessageStore, client, team_id: str, channel_id: str, limit: int,
+                         max_staleness_seconds: int = 0, revalidate_seconds: int = 300) -> int:
+    """Brings a channel's stored history up to date and deep enough to serve limit messages.
+
+    A refresh fetches only messages newer than the latest stored one. At
+    most every revalidate_seconds it instead re-reads the window that will
+    be served (the newest limit stored messages plus anything newer), so
+    edits, deletions, reply counts and reactions there are picked up.
+    Returns the number of messages fetched from Slack.
+    """
+    now = time.time()
+    state = store.channel_state(team_id, channel_id)
+    if state is None:
+        response = client.conversations_history(channel=channel_id, limit=limit)
+        messages = response['messages']
+        store.save_messages(team_id, channel_id, messages)
+        if messages:
+            store.set_channel_state(team_id, channel_id, messages[-1]['ts'], messages[0]['ts'],
+                                    complete=not response.get('has_more'), revalidated_at=now)
+        else:
+            store.set_channel_state(team_id, channel_id, "0", "0", complete=True, revalidated_at=now)
+        return len(messages)
+
+    fetched = 0
+    oldest_ts, latest_ts, complete = state['oldest_ts'], state['latest_ts'], bool(state['complete'])
+    revalidated_at = state['revalidated_at']
+    if now - state['synced_at'] >= max_staleness_seconds:
+        if now - revalidated_at >= revalidate_seconds:
+            served = store.history(team_id, channel_id, limit)
+            window_ts = served[-1]['ts'] if served else latest_ts
+            recent = _fetch_pages(client.conversations_history, channel=channel_id, oldest=window_ts,
+                                  inclusive=True, limit=200)
+            store.replace_history(team_id, channel_id, window_ts, recent)
+            revalidated_at = now
+        else:
+            recent = _fetch_pages(client.conversations_history, channel=channel_id, oldest=latest_ts,
+                                  inclusive=False, limit=200)
+            store.save_messages(team_id, channel_id, recent)
+        fetched += len(recent)
+        if recent:
+            latest_ts = max([latest_ts] + [m['ts'] for m in recent], key=_ts_key)
+
+    if not complete and len(store.history(team_id, channel_id, limit)) < limit:
+        response = client.conversations_history(channel=channel_id, latest=oldest_ts, inclusive=False,
+                                                limit=limit)
+        older = response['messages']
+        store.save_messages(team_id, channel_id, older)
+        fetched += len(older)
+        if older:
+            oldest_ts = min((m['ts'] for m in older), key=_ts_key)
+        complete = not response.get('has_more')
+
+    store.set_channel_state(team_id, channel_id, oldest_ts, latest_ts, complete, revalidated_at)
+    return fetched
+
+
+def sync_thread(store: MessageStore, client, team_id: str, channel_id: str, thread_ts: str,
+                max_staleness_seconds: int = 0, revalidate_seconds: int = 300, call=lambda fn: fn()) -> int:
+    """Brings a thread's stored replies up to date. Returns the number fetched.
+
+    A refresh fetches only replies newer than the thread's watermark. At
+    most every revalidate_seconds it instead re-reads the whole thread, so
+    edits and deletions are picked up. `call` wraps each Slack API call
+    (e.g. with a rate limiter).
+    """
+    now = time.time()
+    state = store.thread_state(team_id, channel_id, thread_ts)
+    if state is not None and now - state['synced_at'] < max_staleness_seconds:
+        return 0
+    revalidate = state is None or now - state['revalidated_at'] >= revalidate_seconds
+    kwargs = {} if revalidate else {"oldest": state['latest_ts'], "inclusive": False}
+    messages = _fetch_pages(client.conversations_replies, call, channel=channel_id, ts=thread_ts,
+                            limit=200, **kwargs)
+    if revalidate:
+        store.replace_thread(team_id, channel_id, thread_ts, messages)
+    else:
+        store.save_messages(team_id, channel_id, messages)
+    latest = max([m['ts'] for m in messages] + ([state['latest_ts']] if state else [thread_ts]), key=_ts_key)
+    store.set_thread_state(team_id, channel_id, thread_ts, latest,
+                           now if revalidate else state['revalidated_at'])
+    return len(messages)
@@ -0,0 +1,207 @@
+import base64
+import os
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from slack_sdk import WebClient
+
+# Key names expected in the secrets table for a Slack server
+BOT_TOKEN_KEY = "SLACK_BOT_TOKEN"
+USER_TOKEN_KEY = "SLACK_USER_TOKEN"
+
+
+class TenantError(Exception):
+    """Raised when a server's Slack credentials cannot be resolved."""
+
+
+def encrypt_secret(value: str, key: bytes) -> str:
+    """Encrypts a vault value as base64(nonce[12] || AES-256-GCM ciphertext)."""
+    nonce = os.urandom(12)
+    return base64.b64encode(nonce + AESGCM(key).encrypt(nonce, value.encode(), None)).decode()
+
+
+def decrypt_secret(encrypted_value: str, key: bytes) -> str:
+    """Decrypts a vault value written by encrypt_secret."""
+    raw = base64.b64decode(encrypted_value)
+    return AESGCM(key).decrypt(raw[:12], raw[12:], None).decode()
+
+
+class SlackTenant:
+    """Bot and optional user clients for one workspace."""
+    def __init__(self, key: str, bot_token: str, user_token: Optional[str] = None,
+                 ssl_context: Optional[ssl.SSLContext] = None, owner: Optional[str] = None):
+        self.key = key
+        # Symone team that owns the server these tokens belong to
+        self.owner = owner
+        self.bot = WebClient(token=bot_token, ssl=ssl_context)
+        self.user = WebClient(token=user_token, ssl=ssl_context) if user_token else None
+        self.last_used = time.monotonic()
+        self._team_id = None
+
+    @property
+    def team_id(self) -> str:
+        """The workspace ID, looked up once."""
+        if self._team_id is None:
+            self._team_id = self.bot.auth_test()['team_id']
+        return self._team_id
+
+
+class SecretsVault:
+    """Reads and writes a server's encrypted tokens in the Supabase `secrets` table."""
+    def __init__(self, supabase_url: str, service_role_key: str, encryption_key: str):
+        from supabase import create_client
+        self.supabase = create_client(supabase_url, service_role_key)
+        self.key = base64.b64decode(encryption_key)
+
+    def owns(self, team_id: str, server_id: str) -> bool:
+        result = self.supabase.table('servers')\
+            .select("id")\
+            .eq('id', server_id)\
+            .eq('team_id', team_id)\
+            .eq('type', 'slack')\
+            .execute()
+        return bool(result.data)
+
+    def store(self, server_id: str, key_name: str, value: str) -> None:
+        self.supabase.table('secrets').upsert({
+            "server_id": server_id,
+            "key_name": key_name,
+            "encrypted_value": encrypt_secret(value, self.key)
+        }, on_conflict="server_id,key_name").execute()
+
+    def load(self, server_id: str) -> Dict[str, str]:
+        result = self.supabase.table('secrets')\
+            .select("key_name, encrypted_value")\
+            .eq('server_id', server_id)\
+            .in_('key_name', [BOT_TOKEN_KEY, USER_TOKEN_KEY])\
+            .execute()
+        return {row['key_name']: decrypt_secret(row['encrypted_value'], self.key) for row in result.data}
+
+
+class SlackClientPool:
+    """LRU pool of per-server Slack clients, loaded lazily from the secrets vault.
+
+    Requests without a server_id use the default tenant built from environment
+    tokens. A server_id is only honoured for the team caller_team() returns
+    (the authenticated caller), and only if that team owns the server; this
+    is checked before any secret is decrypted and again on every cache hit.
+    Tenants idle longer than idle_seconds, or beyond max_size, are evicted;
+    on_evict receives the evicted tenant's key.
+    """
+    def __init__(self, vault: Optional[SecretsVault], default: Optional[SlackTenant] = None,
+                 max_size: int = 256, idle_seconds: float = 900,
+                 on_evict: Callable[[str], None] = lambda key: None,
+                 caller_team: Callable[[], Optional[str]] = lambda: None):
+        self.vault = vault
+        self.caller_team = caller_team
+        self.default = default
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self.on_evict = on_evict
+        # One SSL context shared by every client instead of loading CA certs per tenant
+        self.ssl_context = ssl.create_default_context()
+        self.tenants: "OrderedDict[str, SlackTenant]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, server_id: Optional[str] = None) -> SlackTenant:
+        if not server_id:
+            if self.default is None:
+                raise TenantError("SLACK_BOT_TOKEN not configured and no server_id given")
+            return self.default
+
+        team_id = self.caller_team()
+        if not team_id:
+            raise TenantError("server_id requires an authenticated team")
+        with self.lock:
+            tenant = self.tenants.get(server_id)
+            if tenant is not None:
+                if tenant.owner != team_id:
+                    raise TenantError(f"Server {server_id} not found")
+                self.tenants.move_to_end(server_id)
+                tenant.last_used = time.monotonic()
+                return tenant
+
+        tenant = self._load(server_id, team_id)
+        with self.lock:
+            existing = self.tenants.get(server_id)
+            if existing is not None and existing.owner == team_id:
+                tenant = existing
+            self.tenants[server_id] = tenant
+            self.tenants.move_to_end(server_id)
+            tenant.last_used = time.monotonic()
+            evicted = self._evict()
+        for key in evicted:
+            self.on_evict(key)
+        return tenant
+
+    def _load(self, server_id: str, team_id: str) -> SlackTenant:
+        if self.vault is None:
+            raise TenantError("Secrets vault not configured; server_id requires SUPABASE_URL, "
+                              "SUPABASE_SERVICE_ROLE_KEY and SYMONE_SECRETS_KEY")
+        try:
+            owned = self.vault.owns(team_id, server_id)
+        except Exception as e:
+            raise TenantError(f"Failed to look up server {server_id}: {e}")
+        if not owned:
+            raise TenantError(f"Server {server_id} not found")
+        try:
+            secrets = self.vault.load(server_id)
+        except Exception as e:
+            raise TenantError(f"Failed to load secrets for server {server_id}: {e}")
+        if BOT_TOKEN_KEY not in secrets:
+            raise TenantError(f"{BOT_TOKEN_KEY} not found in secrets for server {server_id}")
+        return SlackTenant(server_id, secrets[BOT_TOKEN_KEY], secrets.get(USER_TOKEN_KEY), self.ssl_context,
+                           owner=team_id)
+
+    def _evict(self) -> list:
+        """Drops idle and least-recently-used tenants. Caller holds the lock."""
+        now = time.monotonic()
+        evicted = [key for key, t in self.tenants.items() if now - t.last_used > self.idle_seconds]
+        for key in evicted:
+            del self.tenants[key]
+        while len(self.tenants) > self.max_size:
+            key, _ = self.tenants.popitem(last=False)
+            evicted.append(key)
+        return evicted
+
+    def invalidate(self, server_id: str) -> None:
+        """Forgets a tenant, e.g. after its tokens were rotated."""
+        with self.lock:
+            removed = self.tenants.pop(server_id, None)
+        if removed is not None:
+            self.on_evict(server_id)
+
+
+if __name__ == "__main__":
+    # Provisioning: python src/servers/slack/tenants.py generate-key
+    #               python src/servers/slack/tenants.py store <server_id> SLACK_BOT_TOKEN   (value read from stdin)
+    import argparse
+    import getpass
+    import sys
+
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Manage vaulted Slack tokens")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("generate-key", help="Print a new base64 SYMONE_SECRETS_KEY")
+    store = commands.add_parser("store", help="Encrypt a token and upsert it into the secrets table")
+    store.add_argument("server_id")
+    store.add_argument("key_name", choices=[BOT_TOKEN_KEY, USER_TOKEN_KEY])
+    args = parser.parse_args()
+
+    if args.command == "generate-key":
+        print(base64.b64encode(AESGCM.generate_key(bit_length=256)).decode())
+        sys.exit(0)
+
+    load_dotenv()
+    missing = [v for v in ("SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY", "SYMONE_SECRETS_KEY") if not os.getenv(v)]
+    if missing:
+        sys.exit(f"Set {', '.join(missing)}")
+    value = getpass.getpass(f"{args.key_name}: ") if sys.stdin.isatty() else sys.stdin.read().strip()
+    vault = SecretsVault(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_ROLE_KEY"), os.getenv("SYMONE_SECRETS_KEY"))
+    vault.store(args.server_id, args.key_name, value)
+    print(f"Stored {args.key_name} for server {args.server_id}")
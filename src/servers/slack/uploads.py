@@ -0,0 +1,74 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import httpx
+
+# Bytes read from disk per chunk; only one chunk per upload is held in memory.
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadProgress:
+    """Thread-safe byte counters for a batch of uploads."""
+    def __init__(self):
+        self.sent: Dict[int, int] = {}
+        self.total: Dict[int, int] = {}
+        self.lock = threading.Lock()
+
+    def start(self, index: int, size: int) -> None:
+        with self.lock:
+            self.sent[index] = 0
+            self.total[index] = size
+
+    def advance(self, index: int, nbytes: int) -> None:
+        with self.lock:
+            self.sent[index] += nbytes
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            return {"sent": sum(self.sent.values()), "total": sum(self.total.values())}
+
+
+def _read_chunks(path: str, on_chunk: Callable[[int], None], chunk_size: int = UPLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            on_chunk(len(chunk))
+            yield chunk
+
+
+def stream_upload(client, http: httpx.Client, path: str, channel_id: str, title: Optional[str] = None,
+                  initial_comment: Optional[str] = None, on_chunk: Callable[[int], None] = lambda n: None,
+                  call: Callable[[Callable[[], Any]], Any] = lambda fn: fn()) -> Dict[str, Any]:
+    """Uploads one file via the external upload flow, streaming the body from disk.
+
+    files_upload_v2 reads the whole file into memory; this performs the same
+    getUploadURLExternal -> POST -> completeUploadExternal sequence but sends
+    the body in UPLOAD_CHUNK_SIZE pieces. `call` wraps Slack API calls (e.g.
+    with a rate limiter).
+    """
+    size = os.path.getsize(path)
+    filename = os.path.basename(path)
+    started = time.monotonic()
+    ticket = call(lambda: client.files_getUploadURLExternal(filename=filename, length=size))
+    response = http.post(
+        ticket['upload_url'],
+        content=_read_chunks(path, on_chunk),
+        headers={"Content-Length": str(size), "Content-Type": "application/octet-stream"}
+    )
+    response.raise_for_status()
+    call(lambda: client.files_completeUploadExternal(
+        files=[{"id": ticket['file_id'], "title": title or filename}],
+        channel_id=channel_id,
+        initial_comment=initial_comment
+    ))
+    elapsed = time.monotonic() - started
+    return {
+        "file_id": ticket['file_id'],
+        "bytes": size,
+        "seconds": round(elapsed, 3),
+        "throughput_mib_s": round(size / (1024 * 1024) / elapsed, 2) if elapsed > 0 else None
+    }
@@ -0,0 +1,98 @@
+import csv
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from postgrest.types import ReturnMethod
+
+
+def file_format(path: str, fmt: Optional[str] = None) -> str:
+    """Resolves ndjson or csv, inferring it from the file extension when not given."""
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def read_rows(path: str, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Yields rows from an NDJSON or CSV file one at a time.
+
+    CSV values are passed as text for PostgREST to cast to the column types;
+    empty cells become NULL.
+    """
+    with open(path, newline="" if fmt == "csv" else None, encoding="utf-8") as f:
+        if fmt == "csv":
+            for row in csv.DictReader(f):
+                yield {k: (v if v != "" else None) for k, v in row.items()}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bulk_write(client, table: str, rows: Iterable[Dict[str, Any]], chunk_size: int = 500,
+               on_conflict: Optional[str] = None, ignore_duplicates: bool = False,
+               concurrency: int = 4) -> Dict[str, Any]:
+    """Writes rows as multi-row INSERTs (or upserts when on_conflict is set).
+
+    Chunks are sent by up to `concurrency` workers. Rows are pulled from the
+    iterable only as workers free up, so at most 2 * concurrency chunks are
+    held in memory. A failed chunk is reported and the rest carry on.
+    """
+    def send(chunk: List[Dict[str, Any]]) -> None:
+        query = client.table(table)
+        if on_conflict:
+            query = query.upsert(chunk, on_conflict=on_conflict, ignore_duplicates=ignore_duplicates,
+                                 returning=ReturnMethod.minimal)
+        else:
+            query = query.insert(chunk, returning=ReturnMethod.minimal)
+        query.execute()
+
+    written = 0
+    sent_chunks = 0
+    errors = []
+    started = time.monotonic()
+    offset = 0
+    pending = {}
+
+    def collect(done) -> None:
+        nonlocal written
+        for future in done:
+            index, first_row, size = pending.pop(future)
+            try:
+                future.result()
+                written += size
+            except Exception as e:
+                errors.append({"chunk": index, "first_row": first_row, "rows": size, "error": str(e)})
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for chunk in chunks(rows, chunk_size):
+            if len(pending) >= concurrency * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[executor.submit(send, chunk)] = (sent_chunks, offset, len(chunk))
+            sent_chunks += 1
+            offset += len(chunk)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    elapsed = time.monotonic() - started
+    return {
+        "rows": offset,
+        "rows_written": written,
+        "chunks": sent_chunks,
+        "failed_chunks": sorted(errors, key=lambda e: e["chunk"]),
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(written / elapsed, 1) if elapsed > 0 else None
+    }
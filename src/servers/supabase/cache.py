@@ -0,0 +1,123 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Raw SQL that may change table contents (or shape)
+WRITE_PATTERN = re.compile(
+    r"\b(insert|update|delete|merge|truncate|copy|call|do|create|alter|drop|rename)\b", re.IGNORECASE
+)
+
+
+def might_write(query: str) -> bool:
+    return WRITE_PATTERN.search(query) is not None
+
+
+def parse_table_ttls(spec: Optional[str]) -> Dict[str, float]:
+    """Parses "table=seconds,table=seconds" into a dict."""
+    ttls = {}
+    for item in (spec or "").split(","):
+        if "=" in item:
+            table, seconds = item.split("=", 1)
+            ttls[table.strip()] = float(seconds)
+    return ttls
+
+
+class SelectCache:
+    """LRU cache of select results, bounded by the size of the cached JSON.
+
+    Entries live for their table's TTL and are dropped as soon as a write to
+    that table goes through the server. Each table has a generation number
+    that writes bump, so a select that was already in flight during a write
+    does not store its (possibly stale) result.
+    """
+    def __init__(self, ttl: float = 30, max_bytes: int = 32 * 1024 * 1024,
+                 table_ttls: Optional[Dict[str, float]] = None):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.table_ttls = table_ttls or {}
+        self.entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self.generations: Dict[str, int] = {}
+        self.epoch = 0
+        self.table_stats: Dict[str, Dict[str, int]] = {}
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(table: str, columns: Optional[str], filters: Optional[Dict[str, Any]], limit: int) -> Tuple:
+        return (table, columns or "*", json.dumps(filters or {}, sort_keys=True, default=str), limit)
+
+    def generation(self, table: str) -> int:
+        return self.epoch + self.generations.get(table, 0)
+
+    def _count(self, table: str, outcome: str) -> None:
+        stats = self.table_stats.setdefault(table, {"hits": 0, "misses": 0})
+        stats[outcome] += 1
+
+    def _drop(self, key: Tuple) -> None:
+        self.bytes -= self.entries.pop(key)["size"]
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        table = key[0]
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry["stored_at"] > self.table_ttls.get(table, self.ttl):
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self._count(table, "misses")
+                return None
+            self.entries.move_to_end(key)
+            self._count(table, "hits")
+            return entry["data"]
+
+    def put(self, key: Tuple, data: Any, generation: int) -> bool:
+        """Stores a result read at `generation`. Returns False if a write has happened since."""
+        size = len(json.dumps(data, default=str))
+        with self.lock:
+            if generation != self.generation(key[0]) or size > self.max_bytes:
+                return False
+            if key in self.entries:
+                self._drop(key)
+            self.entries[key] = {"data": data, "size": size, "stored_at": time.monotonic()}
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+            return True
+
+    def invalidate(self, table: Optional[str] = None) -> int:
+        """Drops a table's entries, or everything. Returns how many were dropped."""
+        with self.lock:
+            if table is None:
+                self.epoch += 1
+                stale = list(self.entries)
+            else:
+                self.generations[table] = self.generations.get(table, 0) + 1
+                stale = [k for k in self.entries if k[0] == table]
+            for key in stale:
+                self._drop(key)
+            return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        def ratio(hits, misses):
+            return round(hits / (hits + misses), 3) if hits + misses else None
+
+        with self.lock:
+            hits = sum(s["hits"] for s in self.table_stats.values())
+            misses = sum(s["misses"] for s in self.table_stats.values())
+            return {
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": ratio(hits, misses),
+                "tables": {
+                    table: {**s, "hit_ratio": ratio(s["hits"], s["misses"]),
+                            "ttl": self.table_ttls.get(table, self.ttl),
+                            "entries": sum(1 for k in self.entries if k[0] == table)}
+                    for table, s in sorted(self.table_stats.items())
+                }
+            }
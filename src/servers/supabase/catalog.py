@@ -0,0 +1,97 @@
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# One pass over pg_catalog per schema: a row per table, view or foreign
+# table with its columns, primary key, indexes and RLS state nested as JSON
+CATALOG_SQL = """
+SELECT
+    c.relname AS name,
+    CASE c.relkind WHEN 'r' THEN 'table' WHEN 'p' THEN 'partitioned table' WHEN 'v' THEN 'view'
+        WHEN 'm' THEN 'materialized view' WHEN 'f' THEN 'foreign table' END AS kind,
+    c.relrowsecurity AS rls_enabled,
+    c.relforcerowsecurity AS rls_forced,
+    GREATEST(c.reltuples, 0)::bigint AS estimated_rows,
+    obj_description(c.oid, 'pg_class') AS comment,
+    (SELECT json_agg(json_build_object(
+                'name', a.attname,
+                'type', format_type(a.atttypid, a.atttypmod),
+                'nullable', NOT a.attnotnull,
+                'default', pg_get_expr(d.adbin, d.adrelid),
+                'comment', col_description(c.oid, a.attnum)
+            ) ORDER BY a.attnum)
+     FROM pg_attribute a
+     LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+     WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped) AS columns,
+    (SELECT json_agg(a.attname ORDER BY k.ord)
+     FROM pg_constraint p
+     CROSS JOIN LATERAL unnest(p.conkey) WITH ORDINALITY AS k(attnum, ord)
+     JOIN pg_attribute a ON a.attrelid = p.conrelid AND a.attnum = k.attnum
+     WHERE p.conrelid = c.oid AND p.contype = 'p') AS primary_key,
+    (SELECT json_agg(json_build_object(
+                'name', i.relname,
+                'unique', x.indisunique,
+                'primary', x.indisprimary,
+                'definition', pg_get_indexdef(x.indexrelid)
+            ) ORDER BY i.relname)
+     FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+     WHERE x.indrelid = c.oid) AS indexes,
+    (SELECT json_agg(json_build_object(
+                'name', pol.polname,
+                'command', CASE pol.polcmd WHEN 'r' THEN 'SELECT' WHEN 'a' THEN 'INSERT'
+                    WHEN 'w' THEN 'UPDATE' WHEN 'd' THEN 'DELETE' ELSE 'ALL' END,
+                'using', pg_get_expr(pol.polqual, pol.polrelid),
+                'check', pg_get_expr(pol.polwithcheck, pol.polrelid)
+            ) ORDER BY pol.polname)
+     FROM pg_policy pol WHERE pol.polrelid = c.oid) AS policies
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = '{schema}' AND c.relkind IN ('r', 'p', 'v', 'm', 'f')
+ORDER BY c.relname
+"""
+
+# Statements that can change what the catalog describes
+DDL_PATTERN = re.compile(r"\b(create|alter|drop|rename|comment\s+on)\b", re.IGNORECASE)
+
+
+def is_ddl(query: str) -> bool:
+    return DDL_PATTERN.search(query) is not None
+
+
+class SchemaCatalog:
+    """In-memory catalog of each schema's tables, loaded with one query per schema.
+
+    A schema is loaded on first use and served from memory until invalidate()
+    is called (after DDL run through the server) or it is older than the
+    caller's max_staleness_seconds (to pick up changes made elsewhere).
+    """
+    def __init__(self, run_sql: Callable[[str], List[Dict[str, Any]]]):
+        self.run_sql = run_sql
+        self.schemas: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+    def tables(self, schema: str, max_staleness_seconds: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            entry = self.schemas.get(schema)
+            if entry is None or (max_staleness_seconds is not None
+                                 and time.time() - entry["loaded_at"] > max_staleness_seconds):
+                rows = self.run_sql(CATALOG_SQL.format(schema=schema.replace("'", "''")))
+                entry = {"tables": {}, "loaded_at": time.time()}
+                for row in rows or []:
+                    for key in ("columns", "primary_key", "indexes", "policies"):
+                        row[key] = row.get(key) or []
+                    entry["tables"][row["name"]] = row
+                self.schemas[schema] = entry
+            return entry["tables"]
+
+    def loaded_at(self, schema: str) -> Optional[float]:
+        entry = self.schemas.get(schema)
+        return entry["loaded_at"] if entry else None
+
+    def invalidate(self, schema: Optional[str] = None) -> None:
+        with self.lock:
+            if schema is None:
+                self.schemas.clear()
+            else:
+                self.schemas.pop(schema, None)
@@ -0,0 +1,45 @@
+from typing import Any, Dict, Iterator, List
+
+import psycopg
+from psycopg.rows import dict_row
+
+
+class QueryStream:
+    """Reads a query's rows in batches from a server-side cursor.
+
+    The query runs in a read-only transaction over a direct Postgres
+    connection and rows are fetched batch_size at a time, so Postgres never
+    materializes the whole result and a caller that writes each batch out
+    holds only one batch in memory. timeout_ms is applied as
+    statement_timeout to each fetch. Reading stops after max_rows rows;
+    `truncated` then tells whether the query had more.
+    """
+    def __init__(self, dsn: str, query: str, batch_size: int = 1000, max_rows: int = 10000,
+                 timeout_ms: int = 60000):
+        self.dsn = dsn
+        self.query = query.strip().rstrip(";")
+        self.batch_size = batch_size
+        self.max_rows = max_rows
+        self.timeout_ms = timeout_ms
+        self.count = 0
+        self.columns: List[str] = []
+        self.truncated = False
+
+    def __iter__(self) -> Iterator[List[Dict[str, Any]]]:
+        with psycopg.connect(self.dsn) as conn:
+            conn.read_only = True
+            try:
+                conn.execute("SELECT set_config('statement_timeout', %s, true)", (str(self.timeout_ms),))
+                with conn.cursor(name="mcp_stream", row_factory=dict_row) as cur:
+                    cur.execute(self.query)
+                    while self.count < self.max_rows:
+                        rows = cur.fetchmany(min(self.batch_size, self.max_rows - self.count))
+                        if not self.columns and cur.description:
+                            self.columns = [c.name for c in cur.description]
+                        if not rows:
+                            return
+                        self.count += len(rows)
+                        yield rows
+                    self.truncated = cur.fetchone() is not None
+            finally:
+                conn.rollback()
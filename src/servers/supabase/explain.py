@@ -0,0 +1,115 @@
+import json
+from typing import Any, Dict, List, Optional
+
+# Condenses EXPLAIN (FORMAT JSON) output into the parts worth reading first.
+
+
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def quote_literal(value: Any) -> str:
+    text = value if isinstance(value, str) else json.dumps(value)
+    return "'" + text.replace("'", "''") + "'"
+
+
+def select_sql(table: str, columns: Optional[str] = "*", filters: Optional[Dict[str, Any]] = None,
+               limit: Optional[int] = None, schema: str = "public") -> str:
+    """Builds the SQL that supabase_select runs for the same arguments."""
+    if columns in (None, "", "*"):
+        column_sql = "*"
+    else:
+        column_sql = ", ".join(quote_ident(c.strip()) for c in columns.split(","))
+    sql = f"SELECT {column_sql} FROM {quote_ident(schema)}.{quote_ident(table)}"
+    conditions = [f"{quote_ident(k)} IS NULL" if v is None else f"{quote_ident(k)} = {quote_literal(v)}"
+                  for k, v in (filters or {}).items()]
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    return sql
+
+
+def _nodes(plan: Dict[str, Any], depth: int = 0) -> List[Dict[str, Any]]:
+    """Flattens a plan tree, working out each node's own (exclusive) time and cost."""
+    children = plan.get("Plans") or []
+    analyzed = "Actual Total Time" in plan
+    # 0 for nodes that never executed
+    loops = plan.get("Actual Loops", 1)
+    node = {
+        "node": plan["Node Type"],
+        "depth": depth,
+        "relation": plan.get("Relation Name"),
+        "index": plan.get("Index Name"),
+        "filter": plan.get("Filter") or plan.get("Index Cond") or plan.get("Hash Cond") or plan.get("Join Filter"),
+        "total_cost": plan.get("Total Cost"),
+        "estimated_rows": plan.get("Plan Rows"),
+        # EXPLAIN reports per-loop averages; multiply out for whole-query numbers
+        "actual_rows": plan["Actual Rows"] * loops if analyzed else None,
+        "loops": loops if analyzed else None,
+        "total_ms": round(plan["Actual Total Time"] * loops, 3) if analyzed else None,
+        "rows_removed": (plan.get("Rows Removed by Filter") or 0) * loops or None if analyzed else None,
+        "shared_hit": plan.get("Shared Hit Blocks"),
+        "shared_read": plan.get("Shared Read Blocks")
+    }
+    # Parallel workers and InitPlans can make exclusive numbers slightly negative
+    child_cost = sum(c.get("Total Cost") or 0 for c in children)
+    node["self_cost"] = round(max((plan.get("Total Cost") or 0) - child_cost, 0), 2)
+    if analyzed:
+        child_ms = sum((c.get("Actual Total Time") or 0) * c.get("Actual Loops", 1) for c in children)
+        node["self_ms"] = round(max(node["total_ms"] - child_ms, 0), 3)
+    nodes = [node]
+    for child in children:
+        nodes.extend(_nodes(child, depth + 1))
+    return nodes
+
+
+def _compact(node: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in node.items() if v is not None and k != "depth"}
+
+
+def summarize(explain: Any, top_n: int = 5, seq_scan_rows: int = 10000,
+              misestimate_factor: float = 10) -> Dict[str, Any]:
+    """Summarizes an EXPLAIN (FORMAT JSON) result.
+
+    Returns planning/execution time, buffer totals, the top_n nodes by
+    exclusive time (or exclusive cost without ANALYZE), sequential scans that
+    read at least seq_scan_rows rows, and nodes whose row estimate was off
+    by misestimate_factor or more.
+    """
+    root = explain[0] if isinstance(explain, list) else explain
+    plan = root["Plan"]
+    nodes = _nodes(plan)
+    analyzed = "Actual Total Time" in plan
+    weight = "self_ms" if analyzed else "self_cost"
+
+    seq_scans = []
+    misestimates = []
+    for node in nodes:
+        if node["node"] == "Seq Scan":
+            scanned = node["actual_rows"] + (node["rows_removed"] or 0) if analyzed else node["estimated_rows"]
+            if scanned >= seq_scan_rows:
+                seq_scans.append({**_compact(node), "rows_scanned": scanned})
+        if analyzed and node["loops"]:
+            estimated = max(node["estimated_rows"] * node["loops"], 1)
+            actual = max(node["actual_rows"], 1)
+            factor = max(estimated / actual, actual / estimated)
+            if factor >= misestimate_factor:
+                misestimates.append({**_compact(node), "estimated_rows": estimated,
+                                     "off_by": round(factor, 1),
+                                     "direction": "under" if actual > estimated else "over"})
+
+    summary = {
+        "analyzed": analyzed,
+        "total_cost": plan.get("Total Cost"),
+        "planning_ms": root.get("Planning Time"),
+        "execution_ms": root.get("Execution Time"),
+        "rows": nodes[0]["actual_rows"] if analyzed else plan.get("Plan Rows"),
+        "nodes": len(nodes),
+        "costliest": [_compact(n) for n in sorted(nodes, key=lambda n: n[weight], reverse=True)[:top_n]],
+        "seq_scans": sorted(seq_scans, key=lambda n: n["rows_scanned"], reverse=True),
+        "misestimates": sorted(misestimates, key=lambda n: n["off_by"], reverse=True)[:top_n]
+    }
+    if analyzed:
+        summary["buffers"] = {"shared_hit": plan.get("Shared Hit Blocks"), "shared_read": plan.get("Shared Read Blocks")}
+    return summary
@@ -10,6 +10,11 @@ class SupabaseQuerySchema(BaseModel):
     model_config = ConfigDict(extra='forbid')
     
     query: str = Field(..., description="SQL query to execute.")
+    stream: bool = Field(default=False, description="Read a SELECT through a server-side cursor in batches instead of one response (needs SUPABASE_DB_URL).")
+    output_path: Optional[str] = Field(None, description="When streaming, write rows to this NDJSON file instead of returning them.")
+    batch_size: int = Field(default=1000, ge=1, le=50000, description="Rows fetched per batch when streaming.")
+    max_rows: int = Field(default=10000, ge=1, le=1000000, description="Stop streaming after this many rows. Without output_path, rows returned inline are capped (10000 by default).")
+    timeout_ms: int = Field(default=60000, ge=1, description="statement_timeout for each fetch when streaming.")
 
 class SupabaseTableListSchema(BaseModel):
     """Schema for listing tables."""
@@ -17,6 +22,22 @@ class SupabaseTableListSchema(BaseModel):
     
     schema_name: str = Field(default="public", description="Database schema (default: public).")
 
+class SupabaseDescribeTableSchema(BaseModel):
+    """Schema for describing a table from the catalog cache."""
+    model_config = ConfigDict(extra='forbid')
+    
+    table: str = Field(..., description="Table or view name.")
+    schema_name: str = Field(default="public", description="Database schema (default: public).")
+    max_staleness_seconds: int = Field(default=300, ge=0, description="Reload the catalog if it is older than this (0 always reloads).")
+
+class SupabaseDescribeSchemaSchema(BaseModel):
+    """Schema for summarizing every table in a schema."""
+    model_config = ConfigDict(extra='forbid')
+    
+    schema_name: str = Field(default="public", description="Database schema (default: public).")
+    include_columns: bool = Field(default=False, description="Include each table's column names and types.")
+    max_staleness_seconds: int = Field(default=300, ge=0, description="Reload the catalog if it is older than this (0 always reloads).")
+
 class SupabaseSelectSchema(BaseModel):
     """Schema for SELECT queries with filters."""
     model_config = ConfigDict(extra='forbid')
@@ -25,6 +46,47 @@ class SupabaseSelectSchema(BaseModel):
     columns: Optional[str] = Field(default="*", description="Columns to select (default: *).")
     filters: Optional[Dict[str, Any]] = Field(None, description="Filter conditions as key-value pairs.")
     limit: int = Field(default=10, ge=1, le=1000, description="Row limit.")
+    fields: Optional[List[str]] = Field(None, description="Dotted paths to return from each row, including paths into JSON columns (e.g., id, config.region). Top-level names are selected in the database when columns is *.")
+    cache: bool = Field(default=False, description="Serve repeated identical selects from the result cache; writes to the table through this server invalidate it.")
+
+class SupabaseSelectCacheStatsSchema(BaseModel):
+    """Schema for reading select cache statistics."""
+    model_config = ConfigDict(extra='forbid')
+    
+    clear: bool = Field(default=False, description="Drop all cached results after reading the stats.")
+
+class SupabaseExplainSchema(BaseModel):
+    """Schema for profiling a query with EXPLAIN."""
+    model_config = ConfigDict(extra='forbid')
+    
+    query: Optional[str] = Field(None, description="Single SQL statement to profile. Writes are executed and rolled back.")
+    table: Optional[str] = Field(None, description="Profile the supabase_select for this table instead of a query.")
+    columns: Optional[str] = Field(default="*", description="Columns, as for supabase_select.")
+    filters: Optional[Dict[str, Any]] = Field(None, description="Equality filters, as for supabase_select.")
+    limit: Optional[int] = Field(None, ge=1, description="Row limit, as for supabase_select.")
+    schema_name: str = Field(default="public", description="Schema of the table.")
+    analyze: bool = Field(default=True, description="Run the statement (EXPLAIN ANALYZE, BUFFERS) for actual timings; false only plans it.")
+    top_n: int = Field(default=5, ge=1, le=50, description="Number of costliest nodes and worst misestimates to return.")
+    seq_scan_rows: int = Field(default=10000, ge=0, description="Report sequential scans reading at least this many rows.")
+    misestimate_factor: float = Field(default=10, gt=1, description="Report nodes whose row estimate was off by at least this factor.")
+    include_plan: bool = Field(default=False, description="Also return the full JSON plan.")
+
+class SupabaseScanSchema(BaseModel):
+    """Schema for keyset-paginated reads of a whole table."""
+    model_config = ConfigDict(extra='forbid')
+    
+    table: str = Field(..., description="Table name.")
+    order_by: str = Field(default="id", description="Unique, non-null, indexed column to page by (e.g., the primary key). Rows where it is NULL are skipped.")
+    descending: bool = Field(default=False, description="Walk order_by from highest to lowest.")
+    columns: Optional[str] = Field(default="*", description="Columns to select (default: *).")
+    filters: Optional[Dict[str, Any]] = Field(None, description="Equality filters as key-value pairs.")
+    ranges: Optional[Dict[str, Dict[str, Any]]] = Field(None, description="Range filters per column using gt, gte, lt, lte, neq (e.g., created_at: {gte: 2024-01-01}).")
+    in_filters: Optional[Dict[str, List[Any]]] = Field(None, description="IN filters: column to list of allowed values.")
+    page_size: int = Field(default=1000, ge=1, le=1000, description="Rows per request.")
+    max_rows: int = Field(default=10000, ge=1, le=1000000, description="Stop after this many rows.")
+    after: Optional[Any] = Field(None, description="Resume after this order_by value (next_cursor from a previous scan).")
+    output_path: Optional[str] = Field(None, description="Write rows to this local NDJSON file page by page instead of returning them.")
+    fields: Optional[List[str]] = Field(None, description="Dotted paths to return from each row.")
 
 class SupabaseInsertSchema(BaseModel):
     """Schema for INSERT operations."""
@@ -33,6 +95,19 @@ class SupabaseInsertSchema(BaseModel):
     table: str = Field(..., description="Table name.")
     data: Dict[str, Any] = Field(..., description="Row data to insert.")
 
+class SupabaseBulkInsertSchema(BaseModel):
+    """Schema for chunked multi-row INSERT/upsert."""
+    model_config = ConfigDict(extra='forbid')
+    
+    table: str = Field(..., description="Table name.")
+    rows: Optional[List[Dict[str, Any]]] = Field(None, description="Rows to insert. Use file_path instead for large loads.")
+    file_path: Optional[str] = Field(None, description="Local NDJSON or CSV file to read rows from.")
+    file_format: Optional[str] = Field(None, pattern="^(ndjson|csv)$", description="ndjson or csv. Inferred from the file extension if omitted.")
+    chunk_size: int = Field(default=500, ge=1, le=5000, description="Rows per INSERT statement.")
+    on_conflict: Optional[str] = Field(None, description="Comma-separated unique columns; turns the insert into an upsert on them.")
+    ignore_duplicates: bool = Field(default=False, description="With on_conflict, skip conflicting rows instead of updating them.")
+    concurrency: int = Field(default=4, ge=1, le=16, description="Chunks in flight at once.")
+
 class SupabaseUpdateSchema(BaseModel):
     """Schema for UPDATE operations."""
     model_config = ConfigDict(extra='forbid')
@@ -48,6 +123,24 @@ class SupabaseDeleteSchema(BaseModel):
     table: str = Field(..., description="Table name.")
     filters: Dict[str, Any] = Field(..., description="Filter conditions for rows to delete.")
 
+class SupabaseBatchOperation(BaseModel):
+    """A single write inside a batch."""
+    model_config = ConfigDict(extra='forbid')
+    
+    op: str = Field(..., pattern="^(insert|upsert|update|delete)$", description="insert, upsert, update or delete.")
+    table: str = Field(..., description="Table name.")
+    schema_name: str = Field(default="public", description="Schema name.")
+    data: Optional[Any] = Field(None, description="Row, or list of rows, for insert/upsert; column values for update.")
+    filters: Optional[Dict[str, Any]] = Field(None, description="Equality filters for update/delete (required).")
+    on_conflict: Optional[List[str]] = Field(None, description="Unique columns for upsert.")
+    returning: bool = Field(default=True, description="Return the affected rows.")
+
+class SupabaseBatchSchema(BaseModel):
+    """Schema for running several writes in one transaction."""
+    model_config = ConfigDict(extra='forbid')
+    
+    operations: List[SupabaseBatchOperation] = Field(..., min_length=1, max_length=500, description="Writes applied in order; all succeed or none do.")
+
 # ============================================================================
 # STORAGE MODELS
 # ============================================================================
@@ -0,0 +1,51 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Filters and keyset pagination over PostgREST table queries.
+
+RANGE_OPERATORS = ("gt", "gte", "lt", "lte", "neq")
+
+
+def apply_filters(query, filters: Optional[Dict[str, Any]] = None,
+                  ranges: Optional[Dict[str, Dict[str, Any]]] = None,
+                  in_filters: Optional[Dict[str, List[Any]]] = None):
+    """Adds equality, range ({"gte": 1, "lt": 5}) and IN filters to a query builder."""
+    for column, value in (filters or {}).items():
+        query = query.eq(column, value)
+    for column, bounds in (ranges or {}).items():
+        for op, value in bounds.items():
+            if op not in RANGE_OPERATORS:
+                raise ValueError(f"Unsupported range operator '{op}' for {column}; use one of {', '.join(RANGE_OPERATORS)}")
+            query = getattr(query, op)(column, value)
+    for column, values in (in_filters or {}).items():
+        query = query.in_(column, values)
+    return query
+
+
+def keyset_pages(client, table: str, columns: str, order_by: str, page_size: int,
+                 filters: Optional[Dict[str, Any]] = None,
+                 ranges: Optional[Dict[str, Dict[str, Any]]] = None,
+                 in_filters: Optional[Dict[str, List[Any]]] = None,
+                 descending: bool = False, after: Any = None) -> Iterator[Tuple[List[Dict[str, Any]], Any]]:
+    """Yields (rows, last_key) pages ordered by order_by, resuming after a key.
+
+    Each page asks for rows past the previous page's last key instead of
+    using OFFSET, so every request is an index range scan no matter how deep
+    the scan goes. order_by must be unique (e.g. the primary key), or rows
+    that share a key with a page boundary are skipped. Rows where order_by is
+    NULL are left out: they cannot be compared against a key, so a NULL at a
+    page boundary would otherwise restart the scan from the beginning.
+    """
+    if columns.strip() != "*" and order_by not in [c.strip() for c in columns.split(",")]:
+        columns = f"{columns},{order_by}"
+    last_key = after
+    while True:
+        query = apply_filters(client.table(table).select(columns), filters, ranges, in_filters)
+        query = query.not_.is_(order_by, "null")
+        if last_key is not None:
+            query = query.lt(order_by, last_key) if descending else query.gt(order_by, last_key)
+        rows = query.order(order_by, desc=descending).limit(page_size).execute().data
+        if rows:
+            last_key = rows[-1][order_by]
+        yield rows, last_key
+        if len(rows) < page_size:
+            return
@@ -14,8 +14,17 @@ if __name__ == "__main__":
         SupabaseListBucketsSchema, SupabaseCreateBucketSchema, SupabaseListFilesSchema,
         SupabaseUploadFileSchema, SupabaseDeleteFileSchema, SupabaseListUsersSchema,
         SupabaseGetUserSchema, SupabaseCreateUserSchema, SupabaseCreateRLSPolicySchema,
-        SupabaseEnableRLSSchema
+        SupabaseEnableRLSSchema, SupabaseScanSchema, SupabaseBulkInsertSchema,
+        SupabaseBatchSchema, SupabaseDescribeTableSchema, SupabaseDescribeSchemaSchema,
+        SupabaseSelectCacheStatsSchema, SupabaseExplainSchema
     )
+    from src.servers.supabase.cache import SelectCache, might_write, parse_table_ttls
+    from src.servers.supabase.catalog import SchemaCatalog, is_ddl
+    from src.servers.supabase.cursor import QueryStream
+    from src.servers.supabase.explain import select_sql, summarize
+    from src.servers.supabase.bulk import bulk_write, file_format, read_rows
+    from src.servers.supabase.paging import keyset_pages
+    from src.servers.projection import project, top_level_fields
 else:
     from .models import (
         SupabaseQuerySchema, SupabaseTableListSchema, SupabaseSelectSchema,
@@ -23,8 +32,17 @@ else:
         SupabaseListBucketsSchema, SupabaseCreateBucketSchema, SupabaseListFilesSchema,
         SupabaseUploadFileSchema, SupabaseDeleteFileSchema, SupabaseListUsersSchema,
         SupabaseGetUserSchema, SupabaseCreateUserSchema, SupabaseCreateRLSPolicySchema,
-        SupabaseEnableRLSSchema
+        SupabaseEnableRLSSchema, SupabaseScanSchema, SupabaseBulkInsertSchema,
+        SupabaseBatchSchema, SupabaseDescribeTableSchema, SupabaseDescribeSchemaSchema,
+        SupabaseSelectCacheStatsSchema, SupabaseExplainSchema
     )
+    from .cache import SelectCache, might_write, parse_table_ttls
+    from .catalog import SchemaCatalog, is_ddl
+    from .cursor import QueryStream
+    from .explain import select_sql, summarize
+    from .bulk import bulk_write, file_format, read_rows
+    from .paging import keyset_pages
+    from ..projection import project, top_level_fields
 
 # Load environment variables
 load_dotenv()
@@ -37,9 +55,26 @@ if not SUPABASE_URL:
 if not SUPABASE_SERVICE_ROLE_KEY:
     raise ValueError("SUPABASE_SERVICE_ROLE_KEY not found in .env")
 
+# Direct Postgres connection string, only needed for streamed queries
+SUPABASE_DB_URL = os.getenv("SUPABASE_DB_URL")
+# Most rows a streamed query returns inline; larger reads need output_path
+SUPABASE_STREAM_INLINE_MAX_ROWS = int(os.getenv("SUPABASE_STREAM_INLINE_MAX_ROWS", "10000"))
+
+# Opt-in select result cache; per-table TTLs as "table=seconds,table=seconds"
+SUPABASE_SELECT_CACHE_TTL = float(os.getenv("SUPABASE_SELECT_CACHE_TTL", "30"))
+SUPABASE_SELECT_CACHE_TABLE_TTLS = parse_table_ttls(os.getenv("SUPABASE_SELECT_CACHE_TABLE_TTLS"))
+SUPABASE_SELECT_CACHE_MAX_BYTES = int(os.getenv("SUPABASE_SELECT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
 # Initialize Supabase Client
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
 
+# Table/column/index/RLS catalog, cleared whenever DDL runs through this server
+catalog = SchemaCatalog(lambda query: supabase.rpc('exec_sql', {'query': query}).execute().data)
+
+# Select results, dropped per table on every write made through this server
+select_cache = SelectCache(SUPABASE_SELECT_CACHE_TTL, SUPABASE_SELECT_CACHE_MAX_BYTES,
+                           SUPABASE_SELECT_CACHE_TABLE_TTLS)
+
 # Initialize MCP Server
 mcp = FastMCP("Symone Supabase Server - Meta-Tooling Edition")
 
@@ -49,7 +84,7 @@ mcp = FastMCP("Symone Supabase Server - Meta-Tooling Edition")
 
 @mcp.tool(
     name="supabase_run_query",
-    description="Execute a raw SQL query (USE CAREFULLY - has full database access)",
+    description="Execute a raw SQL query (USE CAREFULLY - has full database access). Set stream to read large SELECT results in batches",
     annotations={
         "readOnlyHint": False,
         "destructiveHint": True,
@@ -59,11 +94,84 @@ mcp = FastMCP("Symone Supabase Server - Meta-Tooling Edition")
 )
 def run_query(params: SupabaseQuerySchema) -> str:
     """Executes a raw SQL query."""
+    if params.stream:
+        return stream_query(params)
     try:
         result = supabase.rpc('exec_sql', {'query': params.query}).execute()
+        if is_ddl(params.query):
+            catalog.invalidate()
         return json.dumps({"success": True, "data": result.data})
     except Exception as e:
         return json.dumps({"success": False, "error": str(e)})
+    finally:
+        if might_write(params.query):
+            select_cache.invalidate()
+
+def stream_query(params: SupabaseQuerySchema) -> str:
+    """Streams a read-only query's rows as NDJSON, batch by batch.
+
+    Without output_path the rows are returned in the response, so at most
+    SUPABASE_STREAM_INLINE_MAX_ROWS are read and `truncated` marks the cut.
+    """
+    if not SUPABASE_DB_URL:
+        return json.dumps({"success": False, "error": "Streaming needs SUPABASE_DB_URL (the project's Postgres connection string)"})
+    max_rows = params.max_rows if params.output_path else min(params.max_rows, SUPABASE_STREAM_INLINE_MAX_ROWS)
+    stream = QueryStream(SUPABASE_DB_URL, params.query, batch_size=params.batch_size,
+                         max_rows=max_rows, timeout_ms=params.timeout_ms)
+    chunks = []
+    out = None
+    try:
+        if params.output_path:
+            out = open(params.output_path, "w", encoding="utf-8")
+        for rows in stream:
+            chunk = "".join(json.dumps(row, default=str) + "\n" for row in rows)
+            if out is not None:
+                out.write(chunk)
+            else:
+                chunks.append(chunk)
+    except Exception as e:
+        return json.dumps({"success": False, "error": str(e), "count": stream.count})
+    finally:
+        if out is not None:
+            out.close()
+    result = {"success": True, "count": stream.count, "columns": stream.columns, "truncated": stream.truncated}
+    if params.output_path:
+        result["output_path"] = params.output_path
+    else:
+        result["ndjson"] = "".join(chunks)
+    return json.dumps(result)
+
+@mcp.tool(
+    name="supabase_explain",
+    description="Profile a query (or a supabase_select) with EXPLAIN ANALYZE: timings, costliest plan nodes, large sequential scans and row-estimate misses. Writes are rolled back",
+    annotations={
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+def explain_query(params: SupabaseExplainSchema) -> str:
+    """Profiles a statement via the mcp_explain database function."""
+    if bool(params.query) == bool(params.table):
+        return json.dumps({"success": False, "error": "Provide exactly one of query or table"})
+    if params.query:
+        sql = params.query.strip().rstrip(";")
+    else:
+        sql = select_sql(params.table, params.columns, params.filters, params.limit, params.schema_name)
+    try:
+        result = supabase.rpc('mcp_explain', {'query': sql, 'run_analyze': params.analyze}).execute()
+        plan = result.data
+        response = {"success": True, "query": sql,
+                    "summary": summarize(plan, params.top_n, params.seq_scan_rows, params.misestimate_factor)}
+        if params.include_plan:
+            response["plan"] = plan
+        return json.dumps(response)
+    except Exception as e:
+        error = str(e)
+        if "PGRST202" in error:
+            error = "mcp_explain function not installed; apply the schema from database/create_schema.py"
+        return json.dumps({"success": False, "query": sql, "error": error})
 
 @mcp.tool(
     name="supabase_list_tables",
@@ -78,14 +186,63 @@ def run_query(params: SupabaseQuerySchema) -> str:
 def list_tables(params: SupabaseTableListSchema) -> str:
     """Lists database tables."""
     try:
-        query = f"""
-        SELECT table_name 
-        FROM information_schema.tables 
-        WHERE table_schema = '{params.schema_name}'
-        ORDER BY table_name;
-        """
-        result = supabase.rpc('exec_sql', {'query': query}).execute()
-        return json.dumps({"success": True, "tables": result.data})
+        tables = catalog.tables(params.schema_name, max_staleness_seconds=300)
+        return json.dumps({"success": True, "tables": [{"table_name": name} for name in tables]})
+    except Exception as e:
+        return json.dumps({"success": False, "error": str(e)})
+
+@mcp.tool(
+    name="supabase_describe_table",
+    description="Describe a table's columns, types, primary key, indexes and RLS policies (served from a cached catalog)",
+    annotations={
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+def describe_table(params: SupabaseDescribeTableSchema) -> str:
+    """Describes one table from the schema catalog."""
+    try:
+        tables = catalog.tables(params.schema_name, max_staleness_seconds=params.max_staleness_seconds)
+        table = tables.get(params.table)
+        if table is None:
+            return json.dumps({"success": False, "error": f"Table '{params.table}' not found in schema '{params.schema_name}'"})
+        return json.dumps({"success": True, "schema": params.schema_name, "table": table,
+                           "catalog_loaded_at": catalog.loaded_at(params.schema_name)})
+    except Exception as e:
+        return json.dumps({"success": False, "error": str(e)})
+
+@mcp.tool(
+    name="supabase_describe_schema",
+    description="Summarize every table in a schema: kind, RLS status, primary key, estimated rows and optionally columns (served from a cached catalog)",
+    annotations={
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+def describe_schema(params: SupabaseDescribeSchemaSchema) -> str:
+    """Summarizes a schema's tables from the schema catalog."""
+    try:
+        tables = catalog.tables(params.schema_name, max_staleness_seconds=params.max_staleness_seconds)
+        summaries = []
+        for table in tables.values():
+            summary = {
+                "name": table["name"],
+                "kind": table["kind"],
+                "rls_enabled": table["rls_enabled"],
+                "policies": len(table["policies"]),
+                "primary_key": table["primary_key"],
+                "estimated_rows": table["estimated_rows"],
+                "indexes": len(table["indexes"])
+            }
+            if params.include_columns:
+                summary["columns"] = [{"name": c["name"], "type": c["type"]} for c in table["columns"]]
+            summaries.append(summary)
+        return json.dumps({"success": True, "schema": params.schema_name, "count": len(summaries),
+                           "tables": summaries, "catalog_loaded_at": catalog.loaded_at(params.schema_name)})
     except Exception as e:
         return json.dumps({"success": False, "error": str(e)})
 
@@ -102,17 +259,106 @@ def list_tables(params: SupabaseTableListSchema) -> str:
 def select_data(params: SupabaseSelectSchema) -> str:
     """Selects data from a table."""
     try:
-        query = supabase.table(params.table).select(params.columns)
+        columns = params.columns
+        if params.fields and columns in (None, "*"):
+            columns = ",".join(top_level_fields(params.fields))
+        if params.cache:
+            cache_key = select_cache.key(params.table, columns, params.filters, params.limit)
+            rows = select_cache.get(cache_key)
+            if rows is not None:
+                data = project(rows, params.fields)
+                return json.dumps({"success": True, "data": data, "count": len(data), "cached": True})
+            generation = select_cache.generation(params.table)
+        query = supabase.table(params.table).select(columns)
         
         if params.filters:
             for key, value in params.filters.items():
                 query = query.eq(key, value)
         
         result = query.limit(params.limit).execute()
-        return json.dumps({"success": True, "data": result.data, "count": len(result.data)})
+        if params.cache:
+            select_cache.put(cache_key, result.data, generation)
+        data = project(result.data, params.fields)
+        response = {"success": True, "data": data, "count": len(data)}
+        if params.cache:
+            response["cached"] = False
+        return json.dumps(response)
     except Exception as e:
         return json.dumps({"success": False, "error": str(e)})
 
+@mcp.tool(
+    name="supabase_select_cache_stats",
+    description="Show select result cache hit ratios, overall and per table, and optionally clear the cache",
+    annotations={
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    }
+)
+def select_cache_stats(params: SupabaseSelectCacheStatsSchema) -> str:
+    """Reports select cache statistics."""
+    stats = select_cache.stats()
+    if params.clear:
+        stats["cleared"] = select_cache.invalidate()
+    return json.dumps({"success": True, **stats})
+
+@mcp.tool(
+    name="supabase_scan",
+    description="Read a table in keyset-paginated chunks with range/IN filters, up to max_rows; optionally streams to an NDJSON file",
+    annotations={
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+def scan_data(params: SupabaseScanSchema) -> str:
+    """Pages through a table by its order_by key."""
+    rows = []
+    count = 0
+    last_key = params.after
+    has_more = False
+    out = None
+    try:
+        columns = params.columns or "*"
+        if params.fields and columns == "*":
+            columns = ",".join(top_level_fields(params.fields + [params.order_by]))
+        if params.output_path:
+            out = open(params.output_path, "w", encoding="utf-8")
+        page_size = min(params.page_size, params.max_rows)
+        pages = keyset_pages(
+            supabase, params.table, columns, params.order_by, page_size,
+            filters=params.filters, ranges=params.ranges, in_filters=params.in_filters,
+            descending=params.descending, after=params.after
+        )
+        for page, _ in pages:
+            fetched = len(page)
+            page = page[:params.max_rows - count]
+            if page:
+                last_key = page[-1][params.order_by]
+            count += len(page)
+            page = project(page, params.fields)
+            if out is not None:
+                out.writelines(json.dumps(row) + "\n" for row in page)
+            else:
+                rows.extend(page)
+            if count >= params.max_rows:
+                # A cut or full final page means the table may continue past the cap
+                has_more = fetched > len(page) or fetched == page_size
+                break
+    except Exception as e:
+        return json.dumps({"success": False, "error": str(e), "count": count, "next_cursor": last_key})
+    finally:
+        if out is not None:
+            out.close()
+    result = {"success": True, "count": count, "has_more": has_more, "next_cursor": last_key if has_more else None}
+    if params.output_path:
+        result["output_path"] = params.output_path
+    else:
+        result["data"] = rows
+    return json.dumps(result)
+
 @mcp.tool(
     name="supabase_insert",
     description="Insert a row into a table",
@@ -130,6 +376,38 @@ def insert_data(params: SupabaseInsertSchema) -> str:
         return json.dumps({"success": True, "data": result.data})
     except Exception as e:
         return json.dumps({"success": False, "error": str(e)})
+    finally:
+        select_cache.invalidate(params.table)
+
+@mcp.tool(
+    name="supabase_bulk_insert",
+    description="Insert or upsert many rows (list or NDJSON/CSV file) in concurrent multi-row chunks",
+    annotations={
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": True,
+    }
+)
+def bulk_insert_data(params: SupabaseBulkInsertSchema) -> str:
+    """Streams rows into a table in chunks, reporting failed chunks individually."""
+    if (params.rows is None) == (params.file_path is None):
+        return json.dumps({"success": False, "error": "Provide exactly one of rows or file_path"})
+    try:
+        rows = params.rows if params.rows is not None else \
+            read_rows(params.file_path, file_format(params.file_path, params.file_format))
+        result = bulk_write(
+            supabase, params.table, rows,
+            chunk_size=params.chunk_size,
+            on_conflict=params.on_conflict,
+            ignore_duplicates=params.ignore_duplicates,
+            concurrency=params.concurrency
+        )
+        return json.dumps({"success": not result["failed_chunks"], **result})
+    except Exception as e:
+        return json.dumps({"success": False, "error": str(e)})
+    finally:
+        select_cache.invalidate(params.table)
 
 @mcp.tool(
     name="supabase_update",
@@ -153,6 +431,8 @@ def update_data(params: SupabaseUpdateSchema) -> str:
         return json.dumps({"success": True, "data": result.data})
     except Exception as e:
         return json.dumps({"success": False, "error": str(e)})
+    finally:
+        select_cache.invalidate(params.table)
 
 @mcp.tool(
     name="supabase_delete",
@@ -176,6 +456,45 @@ def delete_data(params: SupabaseDeleteSchema) -> str:
         return json.dumps({"success": True, "deleted_count": len(result.data)})
     except Exception as e:
         return json.dumps({"success": False, "error": str(e)})
+    finally:
+        select_cache.invalidate(params.table)
+
+@mcp.tool(
+    name="supabase_batch",
+    description="Run an ordered list of insert/upsert/update/delete operations atomically in one round trip",
+    annotations={
+        "readOnlyHint": False,
+        "destructiveHint": True,
+        "idempotentHint": False,
+        "openWorldHint": True,
+    }
+)
+def batch_data(params: SupabaseBatchSchema) -> str:
+    """Runs writes in a single transaction via the mcp_batch database function."""
+    operations = []
+    for i, op in enumerate(params.operations):
+        if op.op in ("insert", "upsert", "update") and not op.data:
+            return json.dumps({"success": False, "error": f"Operation {i}: {op.op} requires data"})
+        if op.op in ("update", "delete") and not op.filters:
+            return json.dumps({"success": False, "error": f"Operation {i}: {op.op} requires filters"})
+        if op.op == "update" and not isinstance(op.data, dict):
+            return json.dumps({"success": False, "error": f"Operation {i}: update data must be an object"})
+        if op.op == "upsert" and not op.on_conflict:
+            return json.dumps({"success": False, "error": f"Operation {i}: upsert requires on_conflict"})
+        payload = op.model_dump(exclude_none=True, exclude={"schema_name"})
+        payload["schema"] = op.schema_name
+        operations.append(payload)
+    try:
+        result = supabase.rpc('mcp_batch', {'operations': operations}).execute()
+        return json.dumps({"success": True, "results": result.data})
+    except Exception as e:
+        error = str(e)
+        if "PGRST202" in error:
+            error = "mcp_batch function not installed; apply the schema from database/create_schema.py"
+        return json.dumps({"success": False, "rolled_back": True, "error": error})
+    finally:
+        for table in {op.table for op in params.operations}:
+            select_cache.invalidate(table)
 
 # ============================================================================
 # STORAGE TOOLS
@@ -353,6 +672,7 @@ def enable_rls(params: SupabaseEnableRLSSchema) -> str:
     try:
         query = f"ALTER TABLE {params.schema_name}.{params.table} ENABLE ROW LEVEL SECURITY;"
         result = supabase.rpc('exec_sql', {'query': query}).execute()
+        catalog.invalidate(params.schema_name)
         return json.dumps({"success": True})
     except Exception as e:
         return json.dumps({"success": False, "error": str(e)})
@@ -379,6 +699,7 @@ def create_rls_policy(params: SupabaseCreateRLSPolicySchema) -> str:
         {check_clause};
         """
         result = supabase.rpc('exec_sql', {'query': query}).execute()
+        catalog.invalidate()
         return json.dumps({"success": True, "policy": params.policy_name})
     except Exception as e:
         return json.dumps({"success": False, "error": str(e)})
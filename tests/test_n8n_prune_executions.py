@@ -0,0 +1,48 @@
+import asyncio
+import json
+import os
+
+os.environ.setdefault("N8N_API_URL", "http://n8n.invalid")
+os.environ.setdefault("N8N_API_KEY", "test")
+os.environ.setdefault("N8N_ANALYTICS_PATH", ":memory:")
+
+from src.servers.n8n import server  # noqa: E402
+from src.servers.n8n.models import N8nPruneExecutionsSchema  # noqa: E402
+
+# Three pages of three finished executions: ids 1-9
+PAGES = {None: ([1, 2, 3], "p2"), "p2": ([4, 5, 6], "p3"), "p3": ([7, 8, 9], None)}
+
+
+class Context:
+    async def report_progress(self, progress, total=None):
+        pass
+
+
+def test_capped_dry_run_resumes_without_recounting(monkeypatch):
+    deletes = []
+
+    async def request(method, endpoint, **kwargs):
+        if method == "DELETE":
+            deletes.append(endpoint)
+            return {"success": True, "data": None}
+        ids, next_cursor = PAGES[kwargs["params"].get("cursor")]
+        page = [{"id": i, "status": "success", "startedAt": "2020-01-01T00:00:00.000Z"} for i in ids]
+        return {"success": True, "data": {"data": page, "nextCursor": next_cursor}}
+
+    monkeypatch.setattr(server.n8n_client, "request", request)
+
+    counted = uncounted = 0
+    cursor = None
+    for _ in range(len(PAGES) + 1):
+        params = N8nPruneExecutionsSchema(dry_run=True, max_deletes=4, cursor=cursor)
+        result = json.loads(asyncio.run(server.prune_executions(params, Context())))
+        counted += result["matched"]
+        uncounted += result["uncounted"]
+        cursor = result["cursor"]
+        if not result["has_more"]:
+            break
+
+    assert not result["has_more"]
+    assert counted + uncounted == 9
+    assert counted < 9
+    assert deletes == []